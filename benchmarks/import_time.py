@@ -0,0 +1,64 @@
+# -*- coding: UTF-8 -*-
+"""Time to import `registrant` and the heavy modules imported with it.
+
+`registrant` is imported in a fresh process a number of times and the
+median time of the import is reported along with the modules which
+take long to import (`arcpy`, `ogr`, `numpy`, `bs4`, `pandas`) found
+imported right after it. None of them should be imported before
+a report is created.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 10]
+"""
+from __future__ import print_function
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+HEAVY_MODULES = ('arcpy', 'ogr', 'gdal', 'osgeo', 'numpy', 'bs4', 'pandas')
+
+IMPORT_SCRIPT = """
+import sys
+import json
+import timeit
+start = timeit.default_timer()
+import registrant
+seconds = timeit.default_timer() - start
+print(json.dumps([seconds, [name for name in {modules!r}
+                            if name in sys.modules]]))
+""".format(modules=HEAVY_MODULES)
+
+
+# ----------------------------------------------------------------------
+def run_import():
+    """Import registrant in a fresh process."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))]
+        + [path for path in [env.get('PYTHONPATH')] if path])
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT],
+                                     env=env)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+# ----------------------------------------------------------------------
+def main():
+    """Run the benchmark and print the median time of the import."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    # the first import compiles the modules
+    run_import()
+    results = [run_import() for _ in range(args.repeat)]
+    times = sorted(seconds for seconds, _modules in results)
+    print('import registrant: {0:.1f} ms (median of {1})'.format(
+        times[len(times) // 2] * 1000, args.repeat))
+    print('heavy modules imported: {0}'.format(
+        ', '.join(results[-1][1]) or 'none'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: UTF-8 -*-
+"""Time to read a file geodatabase with every OGR driver available.
+
+For every OGR driver reading file geodatabases (`OpenFileGDB` and
+`FileGDB`), the geodatabase is opened and its catalog and metadata are
+read (what the reporter does for the datasets sections) and all rows of
+all datasets are read (what the profiling and the metrics do); the rows
+are read both with the default GDAL configuration and with the options
+of `GDAL_CONFIG_SCAN`. The median times are reported along with the
+fastest choice for both workloads, which can be passed as `ogr_driver`
+to the `Reporter`.
+
+Requires GDAL; the geodatabase is only read.
+
+Usage:
+    python benchmarks/ogr_drivers.py path/to/data.gdb [--repeat 5]
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+
+from registrant._backends import OgrBackend  # noqa: E402
+from registrant._ogr_drivers import open_data_source, gdal_config  # noqa
+from registrant._lazy import ogr  # noqa: E402
+from registrant._config import (  # noqa: E402
+    OGR_DRIVERS_PREFERENCES,
+    GDAL_CONFIG_SCAN,
+)
+
+
+# ----------------------------------------------------------------------
+def read_catalog(gdb_path, driver_name):
+    """Open geodatabase and read its catalog and metadata."""
+    backend = OgrBackend(gdb_path, driver_name)
+    backend.get_datasets_names()
+    backend.get_release()
+    list(backend.iter_domains())
+
+
+# ----------------------------------------------------------------------
+def read_rows(gdb_path, driver_name):
+    """Open geodatabase and read all rows of all datasets."""
+    ds = open_data_source(gdb_path, driver_name)
+    for index in range(ds.GetLayerCount()):
+        layer = ds.GetLayerByIndex(index)
+        feature = layer.GetNextFeature()
+        while feature is not None:
+            feature.GetGeometryRef()
+            feature = layer.GetNextFeature()
+
+
+# ----------------------------------------------------------------------
+def measure(function, gdb_path, driver_name, options, repeat):
+    """Get median time of function run with GDAL options set.
+
+    The options are set before the geodatabase is opened as some of
+    them are read only when files are opened.
+    """
+    times = []
+    for _ in range(repeat):
+        with gdal_config(options):
+            start = timeit.default_timer()
+            function(gdb_path, driver_name)
+            times.append(timeit.default_timer() - start)
+    return sorted(times)[len(times) // 2]
+
+
+# ----------------------------------------------------------------------
+def main():
+    """Run the benchmark and print the fastest driver and options."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('gdb_path')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    drivers = [
+        name for name in OGR_DRIVERS_PREFERENCES
+        if ogr.GetDriverByName(name) is not None
+    ]
+    for workload, function, profiles in (
+        ('catalog', read_catalog, (('default', {}), )),
+        ('scan', read_rows, (('default', {}), ('scan', GDAL_CONFIG_SCAN))),
+    ):
+        results = []
+        for driver_name in drivers:
+            # the first run warms up the operating system file cache
+            function(args.gdb_path, driver_name)
+            for options_name, options in profiles:
+                seconds = measure(function, args.gdb_path, driver_name,
+                                  options, args.repeat)
+                results.append((seconds, driver_name, options_name))
+                print('{0:8} {1:12} {2:8} options: {3:.1f} ms'.format(
+                    workload, driver_name, options_name, seconds * 1000))
+        seconds, driver_name, options_name = min(results)
+        print('fastest {0}: {1} with {2} options\n'.format(
+            workload, driver_name, options_name))
+
+
+if __name__ == '__main__':
+    main()
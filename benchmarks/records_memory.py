@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+"""Peak memory of a synthetic catalog of fields properties.
+
+The same catalog of fields is built as a list of ordered dicts keyed by
+the report labels (as the fields were returned before) and as a list of
+`FieldRecord` objects. Every variant is built in a fresh process and
+the peak resident set size of the process is reported along with the
+peak of an empty run, so the difference is the memory of the catalog.
+
+Usage:
+    python benchmarks/records_memory.py [--fields 200000]
+"""
+from __future__ import print_function
+import os
+import sys
+import argparse
+import subprocess
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+
+from registrant._records import FieldRecord  # noqa: E402
+from registrant._util_mappings import GDB_TABLE_FIELD_PROPS  # noqa: E402
+
+FIELD_TYPES = ('String', 'Integer', 'Double', 'Date', 'SmallInteger')
+
+
+# ----------------------------------------------------------------------
+def get_field_values(index):
+    """Get properties of a synthetic field by property name."""
+    return {
+        'uiOrder': index % 50 + 1,
+        'name': 'FIELD_{0}'.format(index),
+        'type': FIELD_TYPES[index % len(FIELD_TYPES)],
+        'aliasName': 'Field {0}'.format(index),
+        'baseName': 'FIELD_{0}'.format(index),
+        'defaultValue': None,
+        'length': 50,
+        'domain': '',
+        'editable': True,
+        'isNullable': True,
+        'precision': 0,
+        'required': False,
+        'scale': 0,
+    }
+
+
+# ----------------------------------------------------------------------
+def build_catalog(variant, fields_count):
+    """Build the catalog of fields in the given variant."""
+    labels = FieldRecord.labels
+    catalog = []
+    for index in range(0, fields_count):
+        values = get_field_values(index)
+        if variant == 'ordered_dicts':
+            od = OrderedDict()
+            od['UI order'] = values['uiOrder']
+            for k, v in GDB_TABLE_FIELD_PROPS.items():
+                od[v] = values[k]
+            catalog.append(od)
+        elif variant == 'records':
+            catalog.append(
+                FieldRecord(**{attr: values[attr]
+                               for attr in labels}))
+    return catalog
+
+
+# ----------------------------------------------------------------------
+def get_peak_memory():
+    """Get peak resident set size of the process in kilobytes."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and in kilobytes on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+# ----------------------------------------------------------------------
+def run_variant(variant, fields_count):
+    """Build the catalog in a fresh process and get its peak memory."""
+    output = subprocess.check_output([
+        sys.executable,
+        os.path.abspath(__file__), '--variant', variant, '--fields',
+        str(fields_count)
+    ])
+    return int(output.decode().split()[0])
+
+
+# ----------------------------------------------------------------------
+def main():
+    """Run the benchmark and print the peak memory of every variant."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--fields', type=int, default=200000)
+    parser.add_argument('--variant')
+    args = parser.parse_args()
+
+    if args.variant:
+        catalog = build_catalog(args.variant, args.fields)
+        # the catalog is referenced until the peak memory is read
+        print(get_peak_memory(), len(catalog))
+        return
+
+    baseline = run_variant('none', args.fields)
+    print('Fields: {0}'.format(args.fields))
+    for variant in ('ordered_dicts', 'records'):
+        peak = run_variant(variant, args.fields)
+        print('{0:<14} peak RSS {1:>8} KB, catalog {2:>8} KB'.format(
+            variant, peak, peak - baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: UTF-8 -*-
+"""Time to prepare and render a section of fields as an HTML table.
+
+The fields of a synthetic dataset are mapped (booleans to Yes/No and
+missing default values to empty strings) and exported to an HTML
+table the way the reporter does it for every dataset, once using
+a `pandas` data frame (as the sections were built before) and once
+using a `Section`. The average time per section is reported.
+
+Usage:
+    python benchmarks/sections_render.py [--fields 5] [--repeat 1000]
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+import argparse
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+
+from registrant._lazy import is_module_found  # noqa: E402
+from registrant._sections import Section  # noqa: E402
+from registrant._records import FieldRecord  # noqa: E402
+from registrant._util_mappings import BOOL_TO_YESNO_MAPPER  # noqa: E402
+
+FIELD_TYPES = ('String', 'Integer', 'Double', 'Date', 'SmallInteger')
+HTML_CLASSES = 'table table-striped table-hover'
+
+
+# ----------------------------------------------------------------------
+def get_fields(fields_count):
+    """Get records of synthetic fields."""
+    return [
+        FieldRecord(
+            uiOrder=index + 1,
+            name='FIELD_{0}'.format(index),
+            type=FIELD_TYPES[index % len(FIELD_TYPES)],
+            aliasName='Field {0}'.format(index),
+            baseName='FIELD_{0}'.format(index),
+            defaultValue=None,
+            length=50,
+            domain='',
+            editable=True,
+            isNullable=bool(index % 2),
+            precision=0,
+            required=False,
+            scale=0,
+        ) for index in range(fields_count)
+    ]
+
+
+# ----------------------------------------------------------------------
+def render_data_frame(fields):
+    """Render fields with a data frame."""
+    import pandas as pd
+    df = pd.DataFrame.from_dict(
+        [OrderedDict(field.items()) for field in fields])
+    df = df.replace({
+        col: BOOL_TO_YESNO_MAPPER
+        for col in df.select_dtypes([bool])
+    })
+    df['Default value'].fillna(value='', inplace=True)
+    return df.to_html(index=False, classes=HTML_CLASSES, border=0)
+
+
+# ----------------------------------------------------------------------
+def render_section(fields):
+    """Render fields with a section."""
+    section = Section.from_records(fields).map_booleans().fillna(
+        'Default value', '')
+    return section.to_html(classes=HTML_CLASSES, border=0)
+
+
+# ----------------------------------------------------------------------
+def main():
+    """Run the benchmark and print the time per section of every variant."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--fields', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+
+    fields = get_fields(args.fields)
+    variants = [('section', render_section)]
+    # pandas is imported only by the data frame variant when it is timed
+    if is_module_found('pandas'):
+        variants.append(('data_frame', render_data_frame))
+    else:
+        print('pandas is not installed; only sections are timed')
+
+    print('Fields: {0}, sections: {1}'.format(args.fields, args.repeat))
+    for variant, render in variants:
+        render(fields)
+        seconds = timeit.timeit(lambda: render(fields), number=args.repeat)
+        print('{0:<12} {1:>10.1f} us per section'.format(
+            variant, seconds / args.repeat * 10**6))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,12 @@
 """Initialize modules on import of registrant."""
 __version__ = '0.7'
 from registrant._reporter import Reporter  # noqa: F401
+from registrant._session import ReportSession  # noqa: F401
+from registrant._metrics import Metric, register_metric  # noqa: F401
 from registrant import (  # noqa: F401
     _util_mappings, _geodatabase, _build_html, _data_objects, _config,
+    _profiling, _sketches, _scanner, _metrics, _geometry, _domains,
+    _attachments, _fgdb_storage, _findings, _spatial_index, _snapshot,
+    _history, _records, _sections, _lazy, _backends,
+    _ogr_drivers, _plan, _session,
 )
@@ -0,0 +1,185 @@
+# -*- coding: UTF-8 -*-
+"""Storage used by the attachments of the geodatabase datasets.
+
+Sizes of attachments are taken from the size column of the attachment
+tables; the columns storing the attachments data are never read so the
+blobs are not loaded into memory. Attachment tables are scanned in
+batches of rows like any other dataset.
+"""
+from __future__ import division
+import heapq
+import functools
+from collections import OrderedDict
+
+from registrant._lazy import numpy as np
+
+from registrant._util_mappings import (
+    GDB_TABLE_FIELD_PROPS,
+    GDB_ATTACHMENTS_PROPS,
+)
+from registrant._config import (
+    ATTACHMENT_SIZE_FIELD,
+    ATTACHMENT_NAME_FIELD,
+    ATTACHMENT_KEY_FIELDS,
+    ATTACHMENTS_LARGEST_REPORTED,
+)
+from registrant._scanner import DatasetScanner
+
+
+# ----------------------------------------------------------------------
+def _fill_nulls(values, fill_value):
+    """Get array of values with null values replaced."""
+    if np.ma.isMaskedArray(values):
+        return values.filled(fill_value)
+    if values.dtype == object:
+        return np.where(np.equal(values, None), fill_value, values)
+    return values
+
+
+########################################################################
+class AttachmentsSizes(object):
+    """Count, total size and largest attachments of an attachment table.
+
+    Accumulator updated with batches of rows of the attachment table
+    which can be merged with the sizes computed for other rows.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, size_column, name_column=None, key_column=None):
+        """Initialize `AttachmentsSizes` with the columns to read."""
+        self.size_column = size_column
+        self.name_column = name_column
+        self.key_column = key_column
+        self.count = 0
+        self.totalSize = 0
+        self.maxSize = 0
+        # (size, name, key) of the largest attachments seen so far
+        self.largest = []
+
+    # ----------------------------------------------------------------------
+    def get_columns(self):
+        """Get names of the columns to read."""
+        return [
+            column
+            for column in (self.size_column, self.name_column, self.key_column)
+            if column
+        ]
+
+    # ----------------------------------------------------------------------
+    def update(self, batch):
+        """Update the sizes with a batch of rows."""
+        sizes = _fill_nulls(batch[self.size_column], 0).astype(np.int64)
+        if not sizes.size:
+            return
+        self.count += sizes.size
+        self.totalSize += int(sizes.sum())
+        self.maxSize = max(self.maxSize, int(sizes.max()))
+
+        # only the largest attachments of the batch are materialized
+        k = min(ATTACHMENTS_LARGEST_REPORTED, sizes.size)
+        indexes = np.argpartition(-sizes, k - 1)[:k]
+        self._add_largest(
+            zip(sizes[indexes].tolist(),
+                self._get_values(batch, self.name_column, indexes),
+                self._get_values(batch, self.key_column, indexes)))
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge sizes computed for other rows of the same table."""
+        self.count += other.count
+        self.totalSize += other.totalSize
+        self.maxSize = max(self.maxSize, other.maxSize)
+        self._add_largest(other.largest)
+        return self
+
+    # ----------------------------------------------------------------------
+    def finalize(self, parent_name, table_name):
+        """Get attachments sizes as ordered dict ready to write into report."""
+        od = OrderedDict()
+        for k, v in GDB_ATTACHMENTS_PROPS.items():
+            if k == 'parentName':
+                od[v] = parent_name
+            elif k == 'name':
+                od[v] = table_name
+            elif k != 'count' and not self.size_column:
+                # sizes are unknown when the table has no size column
+                od[v] = ''
+            elif k == 'avgSize':
+                od[v] = (int(round(self.totalSize / self.count))
+                         if self.count else '')
+            elif k == 'largest':
+                od[v] = ', '.join(
+                    self._format_attachment(size, name, key)
+                    for size, name, key in self.largest if size)
+            else:
+                od[v] = getattr(self, k, '')
+        return od
+
+    # ----------------------------------------------------------------------
+    def _add_largest(self, attachments):
+        """Keep only the largest attachments."""
+        self.largest = heapq.nlargest(
+            ATTACHMENTS_LARGEST_REPORTED,
+            list(self.largest) + list(attachments),
+            key=lambda attachment: attachment[0])
+
+    # ----------------------------------------------------------------------
+    def _format_attachment(self, size, name, key):
+        """Format single attachment for the report."""
+        description = name if name is not None else ''
+        if self.key_column and key is not None:
+            description = u'{0} ({1} {2})'.format(description, self.key_column,
+                                                  key)
+        return u'{0}: {1}'.format(description.strip(), size)
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _get_values(batch, column, indexes):
+        """Get values of a column at the given indexes of a batch."""
+        if not column:
+            return [None] * len(indexes)
+        values = batch[column][indexes]
+        if np.ma.isMaskedArray(values):
+            values = values.astype(object).filled(None)
+        return [
+            value.decode('utf-8', 'replace')
+            if isinstance(value, bytes) else value
+            for value in values.tolist()
+        ]
+
+
+# ----------------------------------------------------------------------
+def get_attachments_sizes(dataset, parent_name, workers=1):
+    """Get sizes of attachments stored in an attachment table.
+
+    dataset: Table | TableOgr:
+        data object of the attachment table
+
+    parent_name: str:
+        name of the dataset the attachments belong to
+
+    Return ordered dict ready to write into report.
+    """
+    fields_names = {
+        field[GDB_TABLE_FIELD_PROPS['name']].upper():
+        field[GDB_TABLE_FIELD_PROPS['name']]
+        for field in dataset.get_fields()
+    }
+    if ATTACHMENT_SIZE_FIELD not in fields_names:
+        sizes = AttachmentsSizes(None)
+        sizes.count = dataset.get_row_count()
+        return sizes.finalize(parent_name, dataset.name)
+
+    key_columns = [
+        fields_names[key] for key in ATTACHMENT_KEY_FIELDS
+        if key in fields_names
+    ]
+    sizes_factory = functools.partial(
+        AttachmentsSizes,
+        fields_names[ATTACHMENT_SIZE_FIELD],
+        fields_names.get(ATTACHMENT_NAME_FIELD),
+        key_columns[0] if key_columns else None,
+    )
+    scanner = DatasetScanner(dataset, workers)
+    return scanner.scan(sizes_factory, sizes_factory().get_columns()).finalize(
+        parent_name, dataset.name)
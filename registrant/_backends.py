@@ -0,0 +1,518 @@
+# -*- coding: UTF-8 -*-
+"""Backends reading geodatabase objects.
+
+A backend implements some of the operations reading a geodatabase:
+the catalog of datasets, datasets properties, fields, domains, row
+counts, subtypes and indexes. Every operation is run with the fastest
+backend available for the geodatabase (see `BACKENDS_PREFERENCES`),
+so backends can be mixed; for instance, row counts of a file
+geodatabase are read from the tables headers while the properties
+are read with arcpy. A backend may return `None` for an object it
+cannot read, and then the next backend available is used.
+"""
+import os
+import json
+import struct
+from collections import OrderedDict, defaultdict
+from xml.etree import ElementTree
+
+from registrant._lazy import is_module_found, arcpy
+from registrant._data_objects import (
+    Table,
+    TableOgr,
+    FeatureClass,
+    FeatureClassOgr,
+)
+from registrant._ogr_drivers import (
+    get_driver_name,
+    open_data_source,
+)
+from registrant._fgdb_storage import (
+    read_system_catalog,
+    read_row_count,
+)
+from registrant._util_mappings import (
+    GDB_RELEASE,
+    GDB_WKSPC_TYPE,
+    GDB_DOMAIN_PROPS,
+    OGR_GDB_DOMAIN_PROPS,
+    OGR_DOMAIN_PROPS_MAPPINGS,
+)
+from registrant._config import (
+    BACKEND_ARCPY,
+    BACKEND_OGR,
+    BACKEND_FGDB,
+    BACKENDS_PREFERENCES,
+    BACKENDS_REQUIRED_OPERATIONS,
+    OPERATION_CATALOG,
+    OPERATION_PROPERTIES,
+    OPERATION_FIELDS,
+    OPERATION_DOMAINS,
+    OPERATION_COUNTS,
+    OPERATION_SUBTYPES,
+    OPERATION_INDEXES,
+    OGR_GDB_SUPPORT_MESSAGE,
+    FGDB_SYSTEM_CATALOG_ID,
+    FGDB_TABLE_FILE_NAME,
+    DATASET_TYPE_FC,
+    DATASET_TYPE_TABLE,
+)
+
+try:
+    string_types = basestring  # noqa: F821
+except NameError:
+    string_types = str
+
+
+########################################################################
+class Backend(object):
+    """Base class of backends; subclasses list the operations they run."""
+
+    name = None
+    operations = ()
+
+    # ----------------------------------------------------------------------
+    def __init__(self, gdb_path):
+        """Initialize backend with the path to the geodatabase."""
+        self.path = gdb_path
+        # data objects keyed by (dataset name, dataset type)
+        self._datasets = {}
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def is_available(cls, gdb_path):
+        """Check whether the backend can read the geodatabase."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def get_datasets_names(self):
+        """Get list of (dataset name, dataset type) tuples."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def get_feature_datasets(self):
+        """Get dict of feature class names and their feature datasets."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def get_release(self):
+        """Get geodatabase release version."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def get_workspace_type(self):
+        """Get geodatabase workspace type."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def iter_domains(self):
+        """Yield geodatabase domains as ordered dicts."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def get_dataset(self, dataset_name, dataset_type):
+        """Get data object of single dataset creating it only once."""
+        key = (dataset_name, dataset_type)
+        if key not in self._datasets:
+            self._datasets[key] = self._create_dataset(
+                dataset_name, dataset_type)
+        return self._datasets[key]
+
+    # ----------------------------------------------------------------------
+    def _create_dataset(self, dataset_name, dataset_type):
+        """Create data object of single dataset."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def get_fields(self, dataset_name, dataset_type):
+        """Get fields properties of single dataset as records."""
+        return self.get_dataset(dataset_name, dataset_type).get_fields()
+
+    # ----------------------------------------------------------------------
+    def get_row_count(self, dataset_name, dataset_type):
+        """Get number of rows of single dataset."""
+        return self.get_dataset(dataset_name, dataset_type).get_row_count()
+
+    # ----------------------------------------------------------------------
+    def get_subtypes(self, dataset_name, dataset_type):
+        """Get subtypes of single dataset as records."""
+        return self.get_dataset(dataset_name, dataset_type).get_subtypes()
+
+    # ----------------------------------------------------------------------
+    def get_indexes(self, dataset_name, dataset_type):
+        """Get attribute indexes of single dataset as records."""
+        return self.get_dataset(dataset_name, dataset_type).get_indexes()
+
+
+########################################################################
+class ArcpyBackend(Backend):
+    """Backend reading any geodatabase with `arcpy`."""
+
+    name = BACKEND_ARCPY
+    operations = (
+        OPERATION_CATALOG,
+        OPERATION_PROPERTIES,
+        OPERATION_FIELDS,
+        OPERATION_DOMAINS,
+        OPERATION_COUNTS,
+        OPERATION_SUBTYPES,
+        OPERATION_INDEXES,
+    )
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def is_available(cls, gdb_path):
+        """Check whether `arcpy` can be imported."""
+        return is_module_found('arcpy')
+
+    # ----------------------------------------------------------------------
+    def get_datasets_names(self):
+        """Get names of tables and feature classes walking the catalog."""
+        datasets_names = []
+        for datatype, dataset_type in (
+            ('Table', DATASET_TYPE_TABLE),
+            ('FeatureClass', DATASET_TYPE_FC),
+        ):
+            for _path, _dirs, names in arcpy.da.Walk(
+                    self.path, datatype=datatype):
+                datasets_names.extend((name, dataset_type) for name in names)
+        return datasets_names
+
+    # ----------------------------------------------------------------------
+    def get_feature_datasets(self):
+        """Get feature datasets of feature classes walking the catalog.
+
+        Feature classes outside of feature datasets have an empty string.
+        """
+        feature_datasets = {}
+        for path, _dirs, names in arcpy.da.Walk(self.path,
+                                                datatype='FeatureClass'):
+            feature_dataset = (os.path.basename(path)
+                               if path != self.path else '')
+            feature_datasets.update((name, feature_dataset) for name in names)
+        return feature_datasets
+
+    # ----------------------------------------------------------------------
+    def get_release(self):
+        """Get geodatabase release version."""
+        return GDB_RELEASE.get(arcpy.Describe(self.path).release, '')
+
+    # ----------------------------------------------------------------------
+    def get_workspace_type(self):
+        """Get geodatabase workspace type."""
+        return [
+            value for key, value in GDB_WKSPC_TYPE.items() if key.lower() in
+            arcpy.Describe(self.path).workspaceFactoryProgID.lower()
+        ][0]
+
+    # ----------------------------------------------------------------------
+    def iter_domains(self):
+        """Yield geodatabase domains as ordered dicts."""
+        for domain in arcpy.da.ListDomains(self.path):
+            od = OrderedDict()
+            for k, v in GDB_DOMAIN_PROPS.items():
+                od[v] = getattr(domain, k, '')
+            yield od
+
+    # ----------------------------------------------------------------------
+    def _create_dataset(self, dataset_name, dataset_type):
+        """Create `Table` or `FeatureClass` data object."""
+        if dataset_type == DATASET_TYPE_FC:
+            return FeatureClass(os.path.join(self.path, dataset_name))
+        return Table(os.path.join(self.path, dataset_name))
+
+
+########################################################################
+class OgrBackend(Backend):
+    """Backend reading file geodatabases with OGR."""
+
+    name = BACKEND_OGR
+    operations = (
+        OPERATION_CATALOG,
+        OPERATION_PROPERTIES,
+        OPERATION_FIELDS,
+        OPERATION_DOMAINS,
+        OPERATION_COUNTS,
+    )
+
+    # ----------------------------------------------------------------------
+    def __init__(self, gdb_path, driver_name=None):
+        """Initialize `OgrBackend` opening the geodatabase data source.
+
+        driver_name: str:
+            OGR driver to open the geodatabase with (`OpenFileGDB` or
+            `FileGDB`); the first driver available is used by default
+        """
+        Backend.__init__(self, gdb_path)
+        self.driver_name = get_driver_name(driver_name)
+        self.ds = open_data_source(gdb_path, self.driver_name)
+        self._metadata = None
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def is_available(cls, gdb_path):
+        """Check whether `ogr` can be imported and it is a file gdb."""
+        return gdb_path.endswith('.gdb') and is_module_found('ogr')
+
+    # ----------------------------------------------------------------------
+    @property
+    def metadata(self):
+        """Get the full geodatabase metadata as a list of xml objects.
+
+        The metadata is read only when datasets properties or domains
+        are read, not for the catalog and row counts.
+        """
+        if self._metadata is None:
+            res = self.ds.ExecuteSQL('select * from GDB_Items')
+            res.CommitTransaction()
+            self._metadata = []
+            for _i in range(0, res.GetFeatureCount()):
+                item = json.loads(res.GetNextFeature().ExportToJson(
+                ))['properties']['Definition']
+                if item:
+                    self._metadata.append(ElementTree.fromstring(item))
+        return self._metadata
+
+    # ----------------------------------------------------------------------
+    def get_datasets_names(self):
+        """Get names of tables and feature classes from the layers."""
+        datasets_names = []
+        for i in range(0, self.ds.GetLayerCount()):
+            layer = self.ds.GetLayerByIndex(i)
+            if layer.GetGeometryColumn():
+                datasets_names.append((layer.GetName(), DATASET_TYPE_FC))
+            else:
+                datasets_names.append((layer.GetName(), DATASET_TYPE_TABLE))
+        return datasets_names
+
+    # ----------------------------------------------------------------------
+    def get_feature_datasets(self):
+        """Get feature datasets of feature classes from the metadata.
+
+        The feature dataset is the parent of the feature class in its
+        catalog path (such as `\\FD\\FC`); feature classes outside of
+        feature datasets have an empty string.
+        """
+        feature_datasets = {}
+        for item in self.metadata:
+            if item.tag == 'DEFeatureClassInfo':
+                parts = (item.findtext('CatalogPath') or '').strip(
+                    '\\').split('\\')
+                feature_datasets[item.findtext('Name')] = (
+                    parts[0] if len(parts) > 1 else '')
+        return feature_datasets
+
+    # ----------------------------------------------------------------------
+    def get_release(self):
+        """Get geodatabase release version."""
+        xml = self._get_geodatabase_metadata()
+        return GDB_RELEASE.get(
+            ','.join([
+                xml.find('MajorVersion').text,
+                xml.find('MinorVersion').text,
+                xml.find('BugfixVersion').text,
+            ]), '')
+
+    # ----------------------------------------------------------------------
+    def get_workspace_type(self):
+        """Get geodatabase workspace type."""
+        return 'File geodatabase'
+
+    # ----------------------------------------------------------------------
+    def iter_domains(self):
+        """Yield geodatabase domains as ordered dicts."""
+        for domain_type, domains in self._get_domains_metadata().items():
+            for domain in domains:
+                od = OrderedDict()
+                for k, v in OGR_GDB_DOMAIN_PROPS.items():
+                    if k == 'domainType':
+                        od[v] = OGR_DOMAIN_PROPS_MAPPINGS[domain_type]
+
+                    # describing domain range
+                    elif k == 'range':
+                        try:
+                            od[v] = (
+                                float(domain.find('MinValue').text),
+                                float(domain.find('MaxValue').text),
+                            )
+                        except AttributeError:
+                            od[v] = ''
+
+                    # describing domain coded values
+                    elif k == 'codedValues':
+                        try:
+                            cvs = domain.find('CodedValues').findall(
+                                'CodedValue')
+                            od[v] = {
+                                cv.find('Code').text: cv.find('Name').text
+                                for cv in cvs
+                            }
+                        except AttributeError:
+                            od[v] = ''
+                    else:
+                        try:
+                            if domain.find(k).text:
+                                od[v] = OGR_DOMAIN_PROPS_MAPPINGS.get(
+                                    domain.find(k).text,
+                                    domain.find(k).text)
+                            else:
+                                od[v] = ''
+                        except AttributeError:
+                            od[v] = ''
+                yield od
+
+    # ----------------------------------------------------------------------
+    def get_row_count(self, dataset_name, dataset_type):
+        """Get number of rows of the layer without reading the metadata."""
+        return self.ds.GetLayerByName(dataset_name).GetFeatureCount()
+
+    # ----------------------------------------------------------------------
+    def _create_dataset(self, dataset_name, dataset_type):
+        """Create `TableOgr` or `FeatureClassOgr` data object."""
+        if dataset_type == DATASET_TYPE_FC:
+            return FeatureClassOgr(self, dataset_name)
+        return TableOgr(self, dataset_name)
+
+    # ----------------------------------------------------------------------
+    def _get_geodatabase_metadata(self):
+        """Get an xml object with the metadata of geodatabase repository."""
+        for item in self.metadata:
+            if item.tag == 'DEWorkspace':
+                return item
+
+    # ----------------------------------------------------------------------
+    def _get_domains_metadata(self):
+        """Get xml objects with the geodatabase domains metadata."""
+        domains = defaultdict(list)
+        for item in self.metadata:
+            if item.tag in ('GPCodedValueDomain2', 'GPRangeDomain2'):
+                domains[item.tag].append(item)
+        return domains
+
+
+########################################################################
+class FileGeodatabaseBackend(Backend):
+    """Backend reading row counts from the file geodatabase tables headers.
+
+    Neither arcpy nor GDAL are needed; only the system catalog and
+    the header of the table file are read.
+    """
+
+    name = BACKEND_FGDB
+    operations = (OPERATION_COUNTS, )
+
+    # ----------------------------------------------------------------------
+    def __init__(self, gdb_path):
+        """Initialize `FileGeodatabaseBackend` with the geodatabase path."""
+        Backend.__init__(self, gdb_path)
+        self._tables_ids = None
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def is_available(cls, gdb_path):
+        """Check whether the system catalog of file geodatabase exists."""
+        return os.path.isfile(
+            os.path.join(gdb_path,
+                         FGDB_TABLE_FILE_NAME.format(FGDB_SYSTEM_CATALOG_ID)))
+
+    # ----------------------------------------------------------------------
+    def get_row_count(self, dataset_name, dataset_type):
+        """Get number of rows from the table header.
+
+        Return `None` for compressed tables and tables which cannot be
+        read; they are counted by the next backend.
+        """
+        try:
+            if self._tables_ids is None:
+                self._tables_ids = {
+                    name.lower(): object_id
+                    for object_id, name in read_system_catalog(self.path)
+                }
+            object_id = self._tables_ids.get(
+                dataset_name.split('.')[-1].lower())
+            if object_id is None:
+                return None
+            return read_row_count(self.path, object_id)
+        except (IOError, OSError, ValueError, struct.error):
+            return None
+
+
+BACKENDS_CLASSES = OrderedDict([
+    (BACKEND_FGDB, FileGeodatabaseBackend),
+    (BACKEND_OGR, OgrBackend),
+    (BACKEND_ARCPY, ArcpyBackend),
+])
+
+
+# ----------------------------------------------------------------------
+def _check_backends_names(names):
+    """Raise `ValueError` if any of the backends names is not known."""
+    unknown = [name for name in names if name not in BACKENDS_CLASSES]
+    if unknown:
+        raise ValueError(
+            'Unknown backend {0}; valid backends are: {1}'.format(
+                ', '.join(map(repr, unknown)), ', '.join(BACKENDS_CLASSES)))
+    return
+
+
+# ----------------------------------------------------------------------
+def get_backends(gdb_path, backends=None, ogr_driver=None):
+    """Get backends to run every operation with for a geodatabase.
+
+    backends: str | list | dict:
+        name of the backend to use for every operation it runs, list of
+        names of backends allowed in the order of preference or dict of
+        operation and names of backends overriding `BACKENDS_PREFERENCES`
+
+    ogr_driver: str:
+        OGR driver the `ogr` backend opens the geodatabase with
+
+    Only the backends available for the geodatabase are created, once
+    each. Return ordered dict of operation and list of backends in the
+    order they should be tried; raise `ValueError` if a backend name is
+    not known or an operation required to report the geodatabase cannot
+    be run.
+    """
+    preferences = OrderedDict(
+        (operation, BACKENDS_PREFERENCES[operation])
+        for operation in sorted(BACKENDS_PREFERENCES))
+    if isinstance(backends, dict):
+        for operation, names in backends.items():
+            if isinstance(names, string_types):
+                names = (names, )
+            _check_backends_names(names)
+            preferences[operation] = names
+    elif backends:
+        allowed = ([backends]
+                   if isinstance(backends, string_types) else backends)
+        _check_backends_names(allowed)
+        preferences = OrderedDict(
+            (operation, [name for name in allowed if name in names])
+            for operation, names in preferences.items())
+
+    backends_options = {BACKEND_OGR: {'driver_name': ogr_driver}}
+    instances = {}
+    operations_backends = OrderedDict()
+    for operation, names in preferences.items():
+        operations_backends[operation] = []
+        for name in names:
+            backend_class = BACKENDS_CLASSES[name]
+            if operation not in backend_class.operations:
+                continue
+            if name not in instances:
+                instances[name] = None
+                if backend_class.is_available(gdb_path):
+                    instances[name] = backend_class(
+                        gdb_path, **backends_options.get(name, {}))
+            if instances[name] is not None:
+                operations_backends[operation].append(instances[name])
+
+    for operation in BACKENDS_REQUIRED_OPERATIONS:
+        if not operations_backends[operation]:
+            if not is_module_found('arcpy') and not gdb_path.endswith(
+                    '.gdb'):
+                raise ValueError(OGR_GDB_SUPPORT_MESSAGE)
+            raise ValueError(
+                'No backend available to read {0} of {1}'.format(
+                    operation, gdb_path))
+    return operations_backends
@@ -7,14 +7,11 @@ from registrant._config import (
     DIV_CSS_CLASS,
     COMMONS_LICENSE_TEXT,
 )
+from registrant._lazy import bs4
 
 import os
 import shutil
 from codecs import open
-from bs4 import BeautifulSoup
-import pandas as pd
-# to not truncate string content when export pandas DataFrame to HTML
-pd.set_option('display.max_colwidth', -1)
 
 
 # ----------------------------------------------------------------------
@@ -31,10 +28,10 @@ def add_timestamp_header(report_path, day_time):
     do_copy_report(report_path, REPORT_TEMPLATE_FILE)
 
     with open(report_path, 'r', encoding='utf-8') as report:
-        soup_page = BeautifulSoup(report, HTML_PARSER)
+        soup_page = bs4.BeautifulSoup(report, HTML_PARSER)
 
     soup_main_div = soup_page.find_all('div', {'class': DIV_CSS_CLASS})[0]
-    soup_page_header_template = BeautifulSoup(
+    soup_page_header_template = bs4.BeautifulSoup(
         """<h1 class="page-header">Report created {day_time}</h1>""".format(
             day_time=day_time), HTML_PARSER)
     soup_main_div.append(soup_page_header_template)
@@ -57,10 +54,10 @@ def add_li_to_toc(parent_id, section_header_id, report_path, li_text=None):
     do_copy_report(report_path, REPORT_TEMPLATE_FILE)
 
     with open(report_path, 'r', encoding='utf-8') as report:
-        soup_page = BeautifulSoup(report, HTML_PARSER)
+        soup_page = bs4.BeautifulSoup(report, HTML_PARSER)
 
     toc_ul = soup_page.find_all('ul', {'id': parent_id})[0]
-    soup_li_template = BeautifulSoup(
+    soup_li_template = bs4.BeautifulSoup(
         u"""<li><a href="#{section_header_id}">{li_text}</a></li>""".format(
             section_header_id=section_header_id, li_text=li_text), HTML_PARSER)
     toc_ul.append(soup_li_template)
@@ -71,30 +68,32 @@ def add_li_to_toc(parent_id, section_header_id, report_path, li_text=None):
 
 
 # ----------------------------------------------------------------------
-def add_div_to_html_page(df,
+def add_div_to_html_page(section,
                          report_path,
                          section_header_id,
                          section_title='New section',
                          header_size='h2',
-                         escape=True):
+                         escape=True,
+                         insert_after_section_id=None):
     """
     Update html report with `div` item.
 
-    Append `div` with the data table to the body of the report and
-    save the updated the HTML object to the .`html` file.
+    Append `div` with the table of the section to the body of the report and
+    save the updated the HTML object to the .`html` file. If
+    `insert_after_section_id` is given and the section is found,
+    the `div` is inserted right after the table of that section.
     """
-    html_table = df.to_html(
-        index=False,
+    html_table = section.to_html(
         classes='table table-striped table-hover',
         border=0,
         escape=escape)
 
     with open(report_path, 'r', encoding='utf-8') as report:
-        soup_page = BeautifulSoup(report, HTML_PARSER)
+        soup_page = bs4.BeautifulSoup(report, HTML_PARSER)
 
     soup_main_div = soup_page.find_all('div', {'class': DIV_CSS_CLASS})[0]
     soup_main_div['id'] = 'divDataTables'
-    soup_div_template = BeautifulSoup(
+    soup_div_template = bs4.BeautifulSoup(
         u"""
         <{header_size} class="sub-header"
         id="{section_header_id}">{section_title}</h2>
@@ -106,8 +105,60 @@ def add_div_to_html_page(df,
             section_title=section_title,
         ), HTML_PARSER)
 
-    soup_table = BeautifulSoup(html_table, HTML_PARSER)
+    soup_table = bs4.BeautifulSoup(html_table, HTML_PARSER)
     soup_div_template.div.append(soup_table)
+
+    section_header = None
+    if insert_after_section_id:
+        section_header = soup_main_div.find(id=insert_after_section_id)
+    if section_header is not None:
+        anchor = section_header.find_next_sibling('div') or section_header
+        for element in reversed(list(soup_div_template.contents)):
+            anchor.insert_after(element)
+    else:
+        soup_main_div.append(soup_div_template)
+
+    with open(report_path, 'w', encoding='utf-8') as report:
+        report.write(soup_page.decode())
+    return
+
+
+# ----------------------------------------------------------------------
+def add_reference_to_html_page(report_path,
+                               section_header_id,
+                               section_title,
+                               text,
+                               target_section_id,
+                               header_size='h2'):
+    """
+    Update html report with `div` item referring to another section.
+
+    Append `div` with the text followed by a link to the section with
+    `target_section_id` instead of repeating the data table of that
+    section and save the updated the HTML object to the `.html` file.
+    """
+    with open(report_path, 'r', encoding='utf-8') as report:
+        soup_page = bs4.BeautifulSoup(report, HTML_PARSER)
+
+    soup_main_div = soup_page.find_all('div', {'class': DIV_CSS_CLASS})[0]
+    soup_main_div['id'] = 'divDataTables'
+    soup_div_template = bs4.BeautifulSoup(
+        u"""
+        <{header_size} class="sub-header"
+        id="{section_header_id}">{section_title}</{header_size}>
+        <div class="section-reference">
+        <p></p>
+        </div>
+        """.format(
+            header_size=header_size,
+            section_header_id=section_header_id,
+            section_title=section_title,
+        ), HTML_PARSER)
+    paragraph = soup_div_template.div.p
+    paragraph.append(text)
+    link = soup_page.new_tag('a', href='#' + target_section_id)
+    link.string = target_section_id
+    paragraph.append(link)
     soup_main_div.append(soup_div_template)
 
     with open(report_path, 'w', encoding='utf-8') as report:
@@ -119,11 +170,11 @@ def add_div_to_html_page(df,
 def add_license_footer(report_path):
     """Add license footer to the end of the `.html` report page."""
     with open(report_path, 'r', encoding='utf-8') as report:
-        soup_page = BeautifulSoup(report, HTML_PARSER)
+        soup_page = bs4.BeautifulSoup(report, HTML_PARSER)
 
     soup_main_div = soup_page.find_all('div', {'class': DIV_CSS_CLASS})[0]
     soup_main_div['id'] = 'divDataTables'
-    soup_div_template = BeautifulSoup(
+    soup_div_template = bs4.BeautifulSoup(
         '<div class="license-text">{license_text}</div>'.format(
             license_text=COMMONS_LICENSE_TEXT), HTML_PARSER)
     soup_main_div.append(soup_div_template)
@@ -6,6 +6,9 @@ HTML_PARSER = 'html.parser'
 DIV_CSS_CLASS = 'col-sm-9 col-sm-offset-3 col-md-10 col-md-offset-2 main'
 
 REPORT_FILE_NAME = 'index.html'
+# times a report is moved into the output folder when reports of the same
+# geodatabase run at once keep publishing into it
+REPORT_PUBLISH_ATTEMPTS = 10
 HTML_TEMPLATE_FOLDER = 'html-template'
 HTML_TEMPLATE_FILE = 'template.html'
 REPORT_TEMPLATE_FILE = os.path.join(
@@ -25,6 +28,137 @@ Creative Commons, PO Box 1866, Mountain View, CA 94042, USA.
 OGR_GDB_SUPPORT_MESSAGE = """Only file geodatabases are supported
 for use with GDAL/OGR"""
 
+# backends reading the geodatabase; the file geodatabase backend reads
+# the tables files headers directly and needs neither arcpy nor GDAL
+BACKEND_ARCPY = 'arcpy'
+BACKEND_OGR = 'ogr'
+BACKEND_FGDB = 'fgdb'
+
+OPERATION_CATALOG = 'catalog'
+OPERATION_PROPERTIES = 'properties'
+OPERATION_FIELDS = 'fields'
+OPERATION_DOMAINS = 'domains'
+OPERATION_COUNTS = 'counts'
+OPERATION_SUBTYPES = 'subtypes'
+OPERATION_INDEXES = 'indexes'
+
+# backends running every operation, fastest first; the backends which
+# are not available for a geodatabase are skipped. Properties, fields
+# and domains are read with arcpy first as it reports more of them.
+BACKENDS_PREFERENCES = {
+    OPERATION_CATALOG: (BACKEND_OGR, BACKEND_ARCPY),
+    OPERATION_PROPERTIES: (BACKEND_ARCPY, BACKEND_OGR),
+    OPERATION_FIELDS: (BACKEND_ARCPY, BACKEND_OGR),
+    OPERATION_DOMAINS: (BACKEND_ARCPY, BACKEND_OGR),
+    OPERATION_COUNTS: (BACKEND_FGDB, BACKEND_OGR, BACKEND_ARCPY),
+    OPERATION_SUBTYPES: (BACKEND_ARCPY, ),
+    OPERATION_INDEXES: (BACKEND_ARCPY, ),
+}
+# operations a geodatabase cannot be reported without
+BACKENDS_REQUIRED_OPERATIONS = (
+    OPERATION_CATALOG,
+    OPERATION_PROPERTIES,
+    OPERATION_FIELDS,
+    OPERATION_COUNTS,
+)
+
+# sections of the report in the order they are reported
+REPORT_SECTIONS = (
+    'overview',
+    'versions',
+    'replicas',
+    'domains',
+    'relclasses',
+    'tables',
+    'fcs',
+    'attachments',
+    'storage',
+    'spatialindexes',
+    'growth',
+    'findings',
+)
+# columns of the tables and feature classes sections read without
+# describing the datasets; the names come from the catalog and the row
+# counts from the fastest counts backend
+DATASETS_COLUMNS_NOT_DESCRIBED = ('Name', 'Row count')
+
+# OGR drivers reading file geodatabases, tried in this order unless
+# a driver is chosen; `OpenFileGDB` is built into GDAL and is faster at
+# reading the metadata while `FileGDB` needs the Esri File Geodatabase API
+OGR_DRIVER_OPENFILEGDB = 'OpenFileGDB'
+OGR_DRIVER_FILEGDB = 'FileGDB'
+OGR_DRIVERS_PREFERENCES = (OGR_DRIVER_OPENFILEGDB, OGR_DRIVER_FILEGDB)
+
+# GDAL configuration options set while scanning all rows of datasets:
+# caching of the reads of the table files, which is set up when a file
+# is opened, so the data source is opened with the options set; the
+# catalog and the metadata are read with the default options as every
+# file is read once
+GDAL_CONFIG_SCAN = {
+    'VSI_CACHE': 'TRUE',
+    'VSI_CACHE_SIZE': str(64 * 1024 * 1024),
+}
+
 DATASET_TYPE_TABLE = 'table'
 DATASET_TYPE_FC = 'fc'
 ESRI_GDB_REPLICA_INF_DATE = 1899
+
+# replica schemas are exported by this many worker processes at once
+REPLICA_SCHEMA_EXPORT_WORKERS = 4
+
+# number of rows read at once when scanning datasets values
+SCAN_BATCH_SIZE = 65536
+
+# approximate profiling sketches parameters; memory per field is about
+# 2 ** precision bytes for distinct counts, 3 * k floats for quantiles
+# and the capacity number of counters for the most frequent values
+SKETCH_HLL_PRECISION = 12
+SKETCH_KLL_K = 200
+SKETCH_TOP_K_CAPACITY = 32
+SKETCH_TOP_K_REPORTED = 5
+
+# datasets scanned in parallel are split into this many ranges of
+# object IDs per worker process to balance the load between workers
+SCAN_CHUNKS_PER_WORKER = 4
+SCAN_BACKEND_OGR = 'ogr'
+SCAN_BACKEND_ARCPY = 'arcpy'
+
+# attachments are stored in tables named after the parent dataset with
+# this suffix; only the size column is read, never the blobs themselves
+ATTACHMENT_TABLE_SUFFIX = '__ATTACH'
+ATTACHMENT_SIZE_FIELD = 'DATA_SIZE'
+ATTACHMENT_NAME_FIELD = 'ATT_NAME'
+ATTACHMENT_KEY_FIELDS = ('REL_GLOBALID', 'REL_OBJECTID')
+ATTACHMENTS_LARGEST_REPORTED = 5
+
+# file geodatabase tables are stored in files named after their object ID
+# in the system catalog table; names of system tables start with prefix
+FGDB_SYSTEM_CATALOG_ID = 1
+FGDB_TABLE_FILE_NAME = 'a{0:08x}.gdbtable'
+FGDB_SYSTEM_TABLES_PREFIX = 'GDB_'
+
+# severities of performance findings ordered from the most severe one
+# and thresholds used to report the findings
+FINDING_SEVERITIES = ('High', 'Medium', 'Low')
+FINDING_MAX_FIELDS = 100
+FINDING_MAX_INDEXES = 10
+FINDING_TEXT_WIDTH_RATIO = 4
+FINDING_TEXT_MIN_UNUSED_LENGTH = 100
+FINDING_MAX_DELETED_ROWS_RATIO = 20
+
+# spatial index grid size is considered appropriate when it is between
+# these multiples of the average size of features envelopes
+SPATIAL_INDEX_MIN_GRID_RATIO = 1
+SPATIAL_INDEX_MAX_GRID_RATIO = 100
+
+# schema snapshots are saved as JSON; properties which change with the
+# data rather than with the schema are not part of the snapshots
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_DATA_PROPS = ('Row count', 'Attachments count')
+
+# history of datasets sizes is kept in a SQLite file; the growth of
+# datasets is projected linearly to the date the thresholds are reached
+HISTORY_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+HISTORY_ROW_COUNT_THRESHOLD = 10000000
+HISTORY_SIZE_THRESHOLD = 1024 ** 3
+HISTORY_RUNS_REPORTED = 10
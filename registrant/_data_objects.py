@@ -8,15 +8,160 @@ from registrant._util_mappings import (
     STRING_TO_BOOLEAN,
     BOOL_TO_YESNO_MAPPER,
 )
+from registrant._config import SCAN_BATCH_SIZE
+from registrant._records import FieldRecord, IndexRecord, SubtypeRecord
+from registrant._lazy import numpy as np, arcpy
 
 import os
 import operator
-import pkgutil
-from collections import OrderedDict
-
-arcpy_loader = pkgutil.find_loader('arcpy')
-if arcpy_loader:
-    import arcpy
+import datetime
+import itertools
+from collections import Counter
+
+
+# ----------------------------------------------------------------------
+def _ogr_get_wkb(feature):
+    """Get geometry of OGR feature as ISO WKB `bytes`."""
+    geometry = feature.GetGeometryRef()
+    if geometry is None:
+        return None
+    return bytes(geometry.ExportToIsoWkb())
+
+
+# ----------------------------------------------------------------------
+def _ogr_get_datetime(feature, index):
+    """Get value of OGR feature date field as `datetime` object."""
+    if not feature.IsFieldSetAndNotNull(index):
+        return None
+    year, month, day, hour, minute, second, _tz = (
+        feature.GetFieldAsDateTime(index))
+    return datetime.datetime(year, month, day, hour, minute, int(second))
+
+
+# ----------------------------------------------------------------------
+def iter_ogr_layer_batches(layer,
+                           columns,
+                           batch_size=SCAN_BATCH_SIZE,
+                           where_clause=None):
+    """Read values of columns of OGR layer in batches of rows.
+
+    Yield dicts of column name and numpy array of column values.
+    The Arrow stream interface of the layer is used when available
+    (GDAL 3.6+), otherwise features are read in batches one by one.
+    Nullable columns are returned as masked arrays or object arrays
+    with `None` values. Geometry column values are WKB `bytes`.
+    """
+    layer_defn = layer.GetLayerDefn()
+    ignored_fields = [
+        layer_defn.GetFieldDefn(i).GetName()
+        for i in range(0, layer_defn.GetFieldCount())
+        if layer_defn.GetFieldDefn(i).GetName() not in columns
+    ] + ['OGR_STYLE']
+    if not layer.GetGeometryColumn() or (layer.GetGeometryColumn()
+                                         not in columns):
+        ignored_fields.append('OGR_GEOMETRY')
+    layer.SetIgnoredFields(ignored_fields)
+    layer.SetAttributeFilter(where_clause)
+    layer.ResetReading()
+    try:
+        if hasattr(layer, 'GetArrowStreamAsNumPy'):
+            stream = layer.GetArrowStreamAsNumPy(options=[
+                'INCLUDE_FID=NO',
+                'MAX_FEATURES_IN_BATCH={0}'.format(batch_size),
+            ])
+            for batch in stream:
+                yield {column: batch[column] for column in columns}
+        else:
+            for batch in _iter_ogr_features_batches(layer, columns,
+                                                    batch_size):
+                yield batch
+    finally:
+        layer.SetIgnoredFields([])
+        layer.SetAttributeFilter(None)
+        layer.ResetReading()
+
+
+# ----------------------------------------------------------------------
+def _iter_ogr_features_batches(layer, columns, batch_size):
+    """Read values of columns of OGR layer reading features one by one."""
+    layer_defn = layer.GetLayerDefn()
+    columns_indexes = [(column, layer_defn.GetFieldIndex(column))
+                       for column in columns]
+    features = iter(layer.GetNextFeature, None)
+    while True:
+        batch_features = list(itertools.islice(features, batch_size))
+        if not batch_features:
+            return
+        batch = {}
+        for column, index in columns_indexes:
+            if index < 0:  # geometry column
+                batch[column] = np.array(
+                    [_ogr_get_wkb(feature) for feature in batch_features],
+                    dtype=object)
+                continue
+            defn = layer_defn.GetFieldDefn(index)
+            if defn.GetTypeName() in ('Date', 'DateTime'):
+                values = [
+                    _ogr_get_datetime(feature, index)
+                    for feature in batch_features
+                ]
+            else:
+                values = [
+                    feature.GetField(index) for feature in batch_features
+                ]
+            batch[column] = np.array(values, dtype=object)
+        yield batch
+
+
+# ----------------------------------------------------------------------
+def iter_arcpy_cursor_batches(path,
+                              columns,
+                              batch_size=SCAN_BATCH_SIZE,
+                              where_clause=None,
+                              geometry_column=None):
+    """Read values of columns of `arcpy` dataset in batches of rows.
+
+    Yield dicts of column name and numpy array of column values.
+    Null values are returned as `None` in object arrays. Values of the
+    geometry column (if requested) are WKB `bytearray` objects.
+    """
+    cursor_fields = [
+        'SHAPE@WKB' if column == geometry_column else column
+        for column in columns
+    ]
+    with arcpy.da.SearchCursor(path, cursor_fields, where_clause) as cursor:
+        while True:
+            rows = list(itertools.islice(cursor, batch_size))
+            if not rows:
+                return
+            yield {
+                column: np.array(values, dtype=object)
+                for column, values in zip(columns, zip(*rows))
+            }
+
+
+# ----------------------------------------------------------------------
+def count_batches_values(batches, column):
+    """Count rows having each distinct value of a column.
+
+    Values of every batch are counted at once with numpy.
+    Return list of (value, count) tuples; `None` stands for null values.
+    """
+    counts = Counter()
+    for batch in batches:
+        values = batch[column]
+        size = values.size
+        if np.ma.isMaskedArray(values):
+            values = values.compressed()
+        elif values.dtype == object:
+            values = values[np.not_equal(values, None)]
+        if size > values.size:
+            counts[None] += size - values.size
+        if not values.size:
+            continue
+        items, items_counts = np.unique(values, return_counts=True)
+        counts.update(dict(zip(items.tolist(), items_counts.tolist())))
+    return list(counts.items())
 
 
 ########################################################################
@@ -85,11 +230,11 @@ class TableOgr(object):
 
     # ----------------------------------------------------------------------
     def get_fields(self):
-        """Get geodatabase table fields properties as ordered dicts."""
+        """Get geodatabase table fields properties as records."""
         fields = []
         for field_order, field in enumerate(self.layer.schema, 1):
             field_name = field.GetName()
-            od = OrderedDict()
+            od = FieldRecord()
             od['UI order'] = field_order
             for k, v in GDB_TABLE_FIELD_PROPS.items():
                 if k == 'type':
@@ -117,6 +262,41 @@ class TableOgr(object):
             fields.append(od)
         return fields
 
+    # ----------------------------------------------------------------------
+    def iter_batches(self,
+                     columns,
+                     batch_size=SCAN_BATCH_SIZE,
+                     where_clause=None):
+        """Read values of columns in batches of rows.
+
+        Yield dicts of column name and numpy array of column values.
+        """
+        return iter_ogr_layer_batches(self.layer, columns, batch_size,
+                                      where_clause)
+
+    # ----------------------------------------------------------------------
+    def get_values_counts(self, field_name):
+        """Get distinct values of a field with number of rows having them.
+
+        Rows are counted by a `GROUP BY` query run with the SQLite dialect;
+        if it is not available, the values are read in batches and counted
+        with numpy. Return list of (value, count) tuples; `None` stands for
+        null values.
+        """
+        ds = self.gdb.ds
+        res = ds.ExecuteSQL(
+            'SELECT "{0}", COUNT(*) FROM "{1}" GROUP BY "{0}"'.format(
+                field_name, self.name),
+            dialect='SQLITE')
+        if res is None:
+            return count_batches_values(
+                self.iter_batches([field_name]), field_name)
+        try:
+            return [(feature.GetField(0) if feature.IsFieldSetAndNotNull(0)
+                     else None, feature.GetField(1)) for feature in res]
+        finally:
+            ds.ReleaseResultSet(res)
+
     # ----------------------------------------------------------------------
     def _ogr_get_table_field_property(self,
                                       field_name,
@@ -164,10 +344,10 @@ class Table(Dataset):
 
     # ----------------------------------------------------------------------
     def get_fields(self):
-        """Get geodatabase table fields properties as ordered dicts."""
+        """Get geodatabase table fields properties as records."""
         fields = []
         for field_order, field in enumerate(arcpy.ListFields(self.path), 1):
-            od = OrderedDict()
+            od = FieldRecord()
             od['UI order'] = field_order
             for k, v in GDB_TABLE_FIELD_PROPS.items():
                 od[v] = getattr(field, k, '')
@@ -176,12 +356,12 @@ class Table(Dataset):
 
     # ----------------------------------------------------------------------
     def get_subtypes(self):
-        """Get geodatabase table subtypes as ordered dicts."""
+        """Get geodatabase table subtypes as records."""
         subtypes = []
         subtypes_dict = arcpy.da.ListSubtypes(self.path)
         if any(subtypes_dict):
             for subtype_code, subtype_obj in subtypes_dict.items():
-                od = OrderedDict()
+                od = SubtypeRecord()
                 od['Code'] = subtype_code
                 for k, v in GDB_TABLE_SUBTYPE_PROPS.items():
                     od[v] = subtype_obj.get(k, '')
@@ -190,10 +370,10 @@ class Table(Dataset):
 
     # ----------------------------------------------------------------------
     def get_indexes(self):
-        """Get geodatabase table indexes as ordered dicts."""
+        """Get geodatabase table indexes as records."""
         indexes = []
         for index in arcpy.ListIndexes(self.path):
-            od = OrderedDict()
+            od = IndexRecord()
             for k, v in GDB_TABLE_INDEX_PROPS.items():
                 if k == 'fields':
                     od[v] = ', '.join(
@@ -224,6 +404,39 @@ class Table(Dataset):
         """Get number of rows in geodatabase table."""
         return int(arcpy.GetCount_management(self.path).getOutput(0))
 
+    # ----------------------------------------------------------------------
+    def iter_batches(self,
+                     columns,
+                     batch_size=SCAN_BATCH_SIZE,
+                     where_clause=None):
+        """Read values of columns in batches of rows.
+
+        Yield dicts of column name and numpy array of column values.
+        """
+        return iter_arcpy_cursor_batches(
+            self.path, columns, batch_size, where_clause,
+            getattr(self, 'shapeFieldName', None))
+
+    # ----------------------------------------------------------------------
+    def get_values_counts(self, field_name):
+        """Get distinct values of a field with number of rows having them.
+
+        Rows are counted in the geodatabase by `Statistics` run with the
+        field as the case field; the counts table is written into the
+        `in_memory` workspace and deleted once read. Return list of
+        (value, count) tuples; `None` stands for null values.
+        """
+        counts_table = arcpy.CreateUniqueName('values_counts', 'in_memory')
+        arcpy.Statistics_analysis(
+            self.path, counts_table, [[field_name, 'COUNT']],
+            case_field=field_name)
+        try:
+            with arcpy.da.SearchCursor(counts_table,
+                                       [field_name, 'FREQUENCY']) as cursor:
+                return [(value, int(count)) for value, count in cursor]
+        finally:
+            arcpy.Delete_management(counts_table)
+
 
 ########################################################################
 class FeatureClass(Table):
@@ -244,6 +457,8 @@ class FeatureClass(Table):
         self.areaFieldName = getattr(self._desc, 'areaFieldName', '')
         self.geometryStorage = getattr(self._desc, 'geometryStorage', '')
         self.lengthFieldName = getattr(self._desc, 'lengthFieldName', '')
+        self.featureDataset = (os.path.basename(self.root)
+                               if self.root != self.wkspc else '')
 
 
 ########################################################################
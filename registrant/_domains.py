@@ -0,0 +1,131 @@
+# -*- coding: UTF-8 -*-
+"""Usage of the domains and their codes in the datasets fields.
+
+The fields using every domain are found in a single pass over the
+fields of all datasets. Values of the fields are counted by the data
+objects (with `GROUP BY` queries where possible) and matched against
+the domain codes here.
+"""
+import numbers
+from collections import OrderedDict, defaultdict
+
+from registrant._util_mappings import (
+    GDB_TABLE_FIELD_PROPS,
+    GDB_DOMAIN_CODE_USAGE_PROPS,
+)
+
+
+# ----------------------------------------------------------------------
+def get_domains_usage(datasets_fields):
+    """Get reverse index of domains to the dataset fields using them.
+
+    datasets_fields: iterable:
+        (dataset name, dataset type, fields properties) tuples
+
+    Return dict of domain name and list of (dataset name, dataset type,
+    field name) tuples.
+    """
+    domain_column = GDB_TABLE_FIELD_PROPS['domain']
+    name_column = GDB_TABLE_FIELD_PROPS['name']
+    domains_usage = defaultdict(list)
+    for dataset_name, dataset_type, fields in datasets_fields:
+        for field in fields:
+            if field[domain_column]:
+                domains_usage[field[domain_column]].append(
+                    (dataset_name, dataset_type, field[name_column]))
+    return domains_usage
+
+
+# ----------------------------------------------------------------------
+def add_usage_columns(section, domains_usage):
+    """Add `Used by` and `Is used` columns to the domains section.
+
+    domains_usage: dict:
+        reverse index of domains as returned by `get_domains_usage`
+    """
+    section['Used by'] = [
+        ', '.join('{0}.{1}'.format(dataset_name, field_name)
+                  for dataset_name, _dataset_type, field_name in
+                  domains_usage.get(name, []))
+        for name in section['Name']
+    ]
+    section['Is used'] = [name in domains_usage for name in section['Name']]
+    return section
+
+
+# ----------------------------------------------------------------------
+def normalize_code(code):
+    """Get domain code or field value as text to match them by.
+
+    Codes read by OGR from the geodatabase metadata are strings whereas
+    field values are numbers for numeric fields; integral floats are
+    written without the fractional part.
+    """
+    if isinstance(code, float) and code.is_integer():
+        return u'{0}'.format(int(code))
+    if isinstance(code, bytes):
+        return code.decode('utf-8', 'replace')
+    return u'{0}'.format(code)
+
+
+# ----------------------------------------------------------------------
+def cast_value(value, code_type):
+    """Cast field value to the type of the domain codes.
+
+    Values are cast only when no information is lost; other values
+    (e.g. fractional numbers of an integer domain) are kept as read.
+    """
+    if code_type is None or isinstance(value, code_type):
+        return value
+    if not issubclass(code_type, numbers.Number):
+        return normalize_code(value)
+    if isinstance(value, float) and value.is_integer():
+        return code_type(value)
+    if isinstance(value, numbers.Integral) and code_type is float:
+        return float(value)
+    return value
+
+
+# ----------------------------------------------------------------------
+def get_codes_usage(coded_values, fields_values_counts):
+    """Get number of rows having each code in every field using a domain.
+
+    coded_values: dict:
+        domain codes and their descriptions
+
+    fields_values_counts: OrderedDict:
+        field title (`dataset.field`) and list of (value, count) tuples
+
+    Return list of ordered dicts: a row for every code (including codes
+    that are not used) followed by rows of the values that are not valid
+    codes of the domain cast to the type of the codes. Null values are
+    not counted.
+    """
+    code_column = GDB_DOMAIN_CODE_USAGE_PROPS['code']
+    value_column = GDB_DOMAIN_CODE_USAGE_PROPS['value']
+    is_valid_column = GDB_DOMAIN_CODE_USAGE_PROPS['isValidCode']
+
+    rows = OrderedDict()
+
+    def add_row(code, value, is_valid):
+        """Add row of a code or a value with zero counts."""
+        od = OrderedDict()
+        od[code_column] = code
+        od[value_column] = value
+        od[is_valid_column] = is_valid
+        for field_title in fields_values_counts:
+            od[field_title] = 0
+        rows[normalize_code(code)] = od
+
+    for code, value in coded_values.items():
+        add_row(code, value, True)
+    code_type = type(next(iter(coded_values))) if coded_values else None
+
+    for field_title, values_counts in fields_values_counts.items():
+        for value, count in values_counts:
+            if value is None:
+                continue
+            if normalize_code(value) not in rows:
+                add_row(cast_value(value, code_type), '', False)
+            rows[normalize_code(value)][field_title] += count
+    return list(rows.values())
@@ -0,0 +1,363 @@
+# -*- coding: UTF-8 -*-
+"""Storage used by the tables of a file geodatabase on disk.
+
+Every table of a file geodatabase is stored in a set of files named
+after the object ID of the table in the system catalog (`a00000001`
+table): `aXXXXXXXX.gdbtable` with the rows, `.gdbtablx` with the rows
+offsets, `.gdbindexes` and `.atx` with the attribute indexes, `.spx` with
+the spatial index and `.freelist` with the space of deleted rows that
+can be reused. Compressed tables are stored in `.cdf` files.
+
+Only the system catalog and the headers of the tables files are read;
+sizes of the files are taken from `os.stat`, so no rows are read.
+"""
+from __future__ import division
+import os
+import struct
+from collections import OrderedDict, defaultdict
+
+from registrant._util_mappings import GDB_STORAGE_PROPS
+from registrant._config import (
+    FGDB_SYSTEM_CATALOG_ID,
+    FGDB_TABLE_FILE_NAME,
+    FGDB_SYSTEM_TABLES_PREFIX,
+)
+
+# version of the tables files supported (ArcGIS 10.x)
+_GDBTABLE_VERSION = 3
+# field types of which descriptions can be read
+_FIELD_TYPE_STRING = 4
+_FIELD_TYPE_OBJECTID = 6
+_FIELD_TYPE_GEOMETRY = 7
+# binary, GUID, GlobalID and XML fields
+_FIELD_TYPES_FLAG_ONLY = (8, 10, 11, 12)
+# struct formats of values of fixed size fields: int16, int32, float32,
+# float64 and datetime (stored as float64)
+_FIELD_TYPES_FORMATS = {0: '<h', 1: '<i', 2: '<f', 3: '<d', 5: '<d'}
+
+
+# ----------------------------------------------------------------------
+def _read_varuint(data, offset):
+    """Read variable length unsigned integer returning it with new offset."""
+    value = shift = 0
+    while True:
+        byte = struct.unpack_from('B', data, offset)[0]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, offset
+
+
+# ----------------------------------------------------------------------
+def _get_gdbtablx_path(gdbtable_path):
+    """Get path of the `.gdbtablx` file of a table."""
+    return os.path.splitext(gdbtable_path)[0] + '.gdbtablx'
+
+
+# ----------------------------------------------------------------------
+def read_gdbtable_header(path):
+    """Read header of `.gdbtable` file.
+
+    Return tuple of file version, number of rows (not including deleted
+    rows) and offset of the fields descriptions.
+    """
+    with open(path, 'rb') as gdbtable:
+        header = gdbtable.read(40)
+    version, rows_count = struct.unpack_from('<ii', header, 0)
+    fields_offset = struct.unpack_from('<q', header, 32)[0]
+    return version, rows_count, fields_offset
+
+
+# ----------------------------------------------------------------------
+def read_gdbtablx_header(path):
+    """Read header of `.gdbtablx` file.
+
+    Return tuple of number of blocks of 1024 rows offsets, number of
+    rows including deleted rows and size of a single row offset.
+    """
+    with open(path, 'rb') as gdbtablx:
+        header = gdbtablx.read(16)
+    _version, blocks_count, rows_count, offset_size = struct.unpack(
+        '<iiii', header)
+    return blocks_count, rows_count, offset_size
+
+
+# ----------------------------------------------------------------------
+def _read_geometry_description(data, offset, fields_end):
+    """Read description of geometry field following the field type.
+
+    Return dict with the layer extent (`xmin`, `ymin`, `xmax`, `ymax`)
+    and the spatial index grid sizes (`gridSizes`) and the new offset.
+    """
+    flag = struct.unpack_from('B', data, offset + 1)[0]
+    wkt_size = struct.unpack_from('<H', data, offset + 2)[0]
+    offset += 4 + wkt_size
+    dimensions_flag = struct.unpack_from('B', data, offset)[0]
+    has_m, has_z = bool(dimensions_flag & 2), bool(dimensions_flag & 4)
+    # origins and scales, then tolerances of XY, M and Z
+    offset += 1 + 8 * (3 + 2 * has_m + 2 * has_z)
+    offset += 8 * (1 + has_m + has_z)
+    extent = struct.unpack_from('<4d', data, offset)
+    offset += 32
+
+    # Z and M ranges may be stored before the grid sizes which are
+    # preceded by a zero byte and the number of grid sizes (1 to 3)
+    for _range in range(0, 3):
+        grids_count = struct.unpack_from('<i', data, offset + 1)[0]
+        if (struct.unpack_from('B', data, offset)[0] == 0
+                and 1 <= grids_count <= 3
+                and offset + 5 + 8 * grids_count <= fields_end):
+            break
+        offset += 16
+    else:
+        raise ValueError('Spatial index grid sizes are not found')
+    grid_sizes = struct.unpack_from('<{0}d'.format(grids_count), data,
+                                    offset + 5)
+    offset += 5 + 8 * grids_count
+
+    props = dict(zip(('xmin', 'ymin', 'xmax', 'ymax'), extent))
+    props['gridSizes'] = [size for size in grid_sizes if size > 0]
+    props['isNullable'] = bool(flag & 1)
+    return props, offset
+
+
+# ----------------------------------------------------------------------
+def _read_fields(data, offset):
+    """Read fields descriptions of a table.
+
+    Return list of (field type, is nullable) tuples of fields stored in
+    the rows (object ID values are not stored) and properties of the
+    geometry field (`None` for tables without geometry).
+    """
+    header_size, _version, _flags, fields_count = struct.unpack_from(
+        '<iiih', data, offset)
+    fields_end = offset + 4 + header_size
+    offset += 14
+    fields = []
+    geometry = None
+    for _field in range(0, fields_count):
+        for _name in ('name', 'alias'):
+            chars_count = struct.unpack_from('B', data, offset)[0]
+            offset += 1 + 2 * chars_count
+        field_type = struct.unpack_from('B', data, offset)[0]
+        offset += 1
+        if field_type == _FIELD_TYPE_OBJECTID:
+            offset += 2
+            continue
+        if field_type == _FIELD_TYPE_GEOMETRY:
+            geometry, offset = _read_geometry_description(
+                data, offset, fields_end)
+            fields.append((field_type, geometry['isNullable']))
+            continue
+        if field_type == _FIELD_TYPE_STRING:
+            flag = struct.unpack_from('B', data, offset + 4)[0]
+            default_size, offset = _read_varuint(data, offset + 5)
+        elif field_type in _FIELD_TYPES_FORMATS:
+            flag, default_size = struct.unpack_from('BB', data, offset + 1)
+            offset += 3
+        elif field_type in _FIELD_TYPES_FLAG_ONLY:
+            flag, default_size = struct.unpack_from('B', data,
+                                                    offset + 1)[0], 0
+            offset += 2
+        else:
+            raise ValueError(
+                'Field type {0} is not supported'.format(field_type))
+        offset += default_size
+        fields.append((field_type, bool(flag & 1)))
+    return fields, geometry
+
+
+# ----------------------------------------------------------------------
+def _read_row(data, offset, fields):
+    """Read values of a row stored at the given offset."""
+    nullable_count = sum(1 for _type, is_nullable in fields if is_nullable)
+    null_flags = bytearray(
+        data[offset + 4:offset + 4 + (nullable_count + 7) // 8])
+    offset += 4 + len(null_flags)
+    values = []
+    nullable_index = 0
+    for field_type, is_nullable in fields:
+        if is_nullable:
+            is_null = null_flags[nullable_index // 8] & (
+                1 << (nullable_index % 8))
+            nullable_index += 1
+            if is_null:
+                values.append(None)
+                continue
+        if field_type == _FIELD_TYPE_STRING:
+            size, offset = _read_varuint(data, offset)
+            values.append(data[offset:offset + size].decode('utf-8'))
+            offset += size
+        else:
+            value_format = _FIELD_TYPES_FORMATS[field_type]
+            values.append(struct.unpack_from(value_format, data, offset)[0])
+            offset += struct.calcsize(value_format)
+    return values
+
+
+# ----------------------------------------------------------------------
+def read_system_catalog(gdb_path):
+    """Read names of the tables from the system catalog.
+
+    Return list of (table object ID, table name) tuples. Deleted rows
+    of the catalog are skipped.
+    """
+    catalog_path = os.path.join(gdb_path,
+                                FGDB_TABLE_FILE_NAME.format(
+                                    FGDB_SYSTEM_CATALOG_ID))
+    blocks_count, rows_count, offset_size = read_gdbtablx_header(
+        _get_gdbtablx_path(catalog_path))
+    if blocks_count != -(-rows_count // 1024):
+        # the offsets of sparse tables are stored along with a bitmap of
+        # blocks; a catalog with so many deleted tables is not supported
+        raise ValueError('Sparse system catalog is not supported')
+
+    with open(_get_gdbtablx_path(catalog_path), 'rb') as gdbtablx:
+        gdbtablx.seek(16)
+        offsets = gdbtablx.read(rows_count * offset_size)
+    with open(catalog_path, 'rb') as gdbtable:
+        data = gdbtable.read()
+
+    fields, _geometry = _read_fields(data,
+                                     read_gdbtable_header(catalog_path)[2])
+    tables = []
+    for index in range(0, rows_count):
+        row_offset = struct.unpack(
+            '<Q', offsets[index * offset_size:(index + 1) * offset_size]
+            + b'\0' * (8 - offset_size))[0]
+        if not row_offset:
+            continue
+        name = _read_row(data, row_offset, fields)[0]
+        tables.append((index + 1, name))
+    return tables
+
+
+# ----------------------------------------------------------------------
+def read_row_count(gdb_path, object_id):
+    """Read number of rows of a table from the header of its file.
+
+    Return `None` if the version of the table file is not supported.
+    """
+    version, rows_count, _fields_offset = read_gdbtable_header(
+        os.path.join(gdb_path, FGDB_TABLE_FILE_NAME.format(object_id)))
+    return rows_count if version == _GDBTABLE_VERSION else None
+
+
+# ----------------------------------------------------------------------
+def read_geometry_field(gdb_path, object_id):
+    """Read extent and spatial index grid sizes of a feature class.
+
+    Only the fields descriptions of the `.gdbtable` file are read.
+    Return dict as returned by `_read_geometry_description` or `None`
+    for tables without geometry field.
+    """
+    table_path = os.path.join(gdb_path,
+                              FGDB_TABLE_FILE_NAME.format(object_id))
+    version, _rows_count, fields_offset = read_gdbtable_header(table_path)
+    if version != _GDBTABLE_VERSION:
+        raise ValueError('Version {0} of table is not supported'.format(
+            version))
+    with open(table_path, 'rb') as gdbtable:
+        gdbtable.seek(fields_offset)
+        header_size = struct.unpack('<i', gdbtable.read(4))[0]
+        data = struct.pack('<i', header_size) + gdbtable.read(header_size)
+    return _read_fields(data, 0)[1]
+
+
+# ----------------------------------------------------------------------
+def get_tables_files_sizes(gdb_path):
+    """Get sizes of the files of every table of a file geodatabase.
+
+    Return dict of table object ID and dict of file extension and size
+    in bytes; sizes of all `.atx` files of a table are summed.
+    """
+    files_sizes = defaultdict(lambda: defaultdict(int))
+    for file_name in os.listdir(gdb_path):
+        prefix, _sep, extension = file_name.partition('.')
+        if len(prefix) != 9 or not prefix.startswith('a'):
+            continue
+        try:
+            object_id = int(prefix[1:], 16)
+        except ValueError:
+            continue
+        files_sizes[object_id][extension.rsplit('.', 1)[-1]] += os.stat(
+            os.path.join(gdb_path, file_name)).st_size
+    return files_sizes
+
+
+# ----------------------------------------------------------------------
+def _read_rows_counts(table_path, files_sizes):
+    """Read number of rows and of deleted rows from the tables headers.
+
+    Return `None` for the counts which cannot be read: compressed
+    tables and versions of table files not supported have neither.
+    """
+    if 'cdf' in files_sizes or 'gdbtable' not in files_sizes:
+        return None, None
+    version, rows_count, _fields_offset = read_gdbtable_header(table_path)
+    if version != _GDBTABLE_VERSION:
+        return None, None
+    if 'gdbtablx' not in files_sizes:
+        return rows_count, None
+    return rows_count, read_gdbtablx_header(
+        _get_gdbtablx_path(table_path))[1] - rows_count
+
+
+# ----------------------------------------------------------------------
+def _get_storage_sizes(files_sizes):
+    """Get sizes of the files of a table summed by what they store."""
+    return {
+        'tableSize': sum(files_sizes.get(extension, 0)
+                         for extension in ('gdbtable', 'gdbtablx', 'cdf')),
+        'indexesSize': sum(files_sizes.get(extension, 0)
+                           for extension in ('gdbindexes', 'atx')),
+        'spatialIndexSize': files_sizes.get('spx', 0),
+        'freeListSize': files_sizes.get('freelist', 0),
+        'totalSize': sum(files_sizes.values()),
+    }
+
+
+# ----------------------------------------------------------------------
+def get_table_storage(gdb_path, object_id, name, files_sizes):
+    """Get storage properties of a single table as ordered dict."""
+    table_path = os.path.join(gdb_path,
+                              FGDB_TABLE_FILE_NAME.format(object_id))
+    rows_count, deleted_rows_count = _read_rows_counts(table_path,
+                                                       files_sizes)
+    all_rows_count = (rows_count or 0) + (deleted_rows_count or 0)
+    deleted_ratio = 0
+    if deleted_rows_count and all_rows_count:
+        deleted_ratio = round(deleted_rows_count / all_rows_count * 100, 1)
+
+    values = _get_storage_sizes(files_sizes)
+    bytes_per_row = ''
+    if rows_count:
+        bytes_per_row = int(round(values['totalSize'] / rows_count))
+    values.update({
+        'name': name,
+        'fileName': os.path.basename(table_path).split('.')[0],
+        'rowCount': rows_count if rows_count is not None else '',
+        'deletedRowCount': (deleted_rows_count
+                            if deleted_rows_count is not None else ''),
+        'deletedRatio': deleted_ratio,
+        'bytesPerRow': bytes_per_row,
+        'isCompressed': 'cdf' in files_sizes,
+    })
+    return OrderedDict((v, values[k]) for k, v in GDB_STORAGE_PROPS.items())
+
+
+# ----------------------------------------------------------------------
+def get_datasets_storage(gdb_path, include_system_tables=False):
+    """Get storage properties of all tables of a file geodatabase.
+
+    Return list of ordered dicts ready to write into report.
+    """
+    files_sizes = get_tables_files_sizes(gdb_path)
+    return [
+        get_table_storage(gdb_path, object_id, name, files_sizes[object_id])
+        for object_id, name in read_system_catalog(gdb_path)
+        if object_id in files_sizes and (
+            include_system_tables
+            or not name.startswith(FGDB_SYSTEM_TABLES_PREFIX))
+    ]
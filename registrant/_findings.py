@@ -0,0 +1,261 @@
+# -*- coding: UTF-8 -*-
+"""Performance findings about the geodatabase schema.
+
+Findings are derived from the properties the reporter already reads
+(feature classes and fields properties, indexes, relationship classes,
+fields profiles, storage of tables and spatial indexes) and point to
+the schema design issues known to slow down queries and edits. Every
+finding has a severity; findings are sorted with the most severe ones
+first.
+"""
+from __future__ import division
+from collections import OrderedDict
+
+from registrant._util_mappings import (
+    GDB_FINDING_PROPS,
+    GDB_FC_PROPS,
+    GDB_TABLE_FIELD_PROPS,
+    GDB_TABLE_INDEX_PROPS,
+    GDB_RELATIONSHIP_CLASS_PROPS,
+    GDB_FIELD_PROFILE_PROPS,
+    GDB_STORAGE_PROPS,
+    GDB_SPATIAL_INDEX_PROPS,
+)
+from registrant._config import (
+    FINDING_SEVERITIES,
+    FINDING_MAX_FIELDS,
+    FINDING_MAX_INDEXES,
+    FINDING_TEXT_WIDTH_RATIO,
+    FINDING_TEXT_MIN_UNUSED_LENGTH,
+    FINDING_MAX_DELETED_ROWS_RATIO,
+)
+
+SEVERITY_HIGH, SEVERITY_MEDIUM, SEVERITY_LOW = FINDING_SEVERITIES
+
+
+# ----------------------------------------------------------------------
+def make_finding(severity, dataset, finding, details='', field=''):
+    """Get finding as ordered dict ready to write into report."""
+    values = {
+        'priority': FINDING_SEVERITIES.index(severity) + 1,
+        'severity': severity,
+        'dataset': dataset,
+        'field': field,
+        'finding': finding,
+        'details': details,
+    }
+    return OrderedDict(
+        (v, values[k]) for k, v in GDB_FINDING_PROPS.items())
+
+
+# ----------------------------------------------------------------------
+def sort_findings(findings):
+    """Sort findings by severity, dataset and field."""
+    return sorted(
+        findings,
+        key=lambda finding: (
+            finding[GDB_FINDING_PROPS['priority']],
+            finding[GDB_FINDING_PROPS['dataset']].lower(),
+            finding[GDB_FINDING_PROPS['field']].lower(),
+        ))
+
+
+# ----------------------------------------------------------------------
+def _get_unqualified_name(name):
+    """Get dataset name without database and owner names."""
+    return name.split('.')[-1]
+
+
+# ----------------------------------------------------------------------
+def find_missing_spatial_indexes(fcs):
+    """Find feature classes without spatial index.
+
+    fcs: list:
+        feature classes properties as returned by `get_feature_classes`
+    """
+    return [
+        make_finding(
+            SEVERITY_HIGH, fc[GDB_FC_PROPS['name']],
+            'Feature class has no spatial index',
+            'Spatial queries and drawing read all features')
+        for fc in fcs
+        if fc[GDB_FC_PROPS['hasSpatialIndex']] in (False, 'No')
+    ]
+
+
+# ----------------------------------------------------------------------
+def find_wide_datasets(dataset_name, fields):
+    """Find datasets with too many fields."""
+    if len(fields) <= FINDING_MAX_FIELDS:
+        return []
+    return [
+        make_finding(
+            SEVERITY_MEDIUM, dataset_name, 'Dataset has too many fields',
+            '{0} fields (more than {1})'.format(
+                len(fields), FINDING_MAX_FIELDS))
+    ]
+
+
+# ----------------------------------------------------------------------
+def find_excessive_indexes(dataset_name, indexes):
+    """Find datasets with too many attribute indexes slowing down edits."""
+    if len(indexes) <= FINDING_MAX_INDEXES:
+        return []
+    return [
+        make_finding(
+            SEVERITY_LOW, dataset_name, 'Dataset has too many indexes',
+            '{0} indexes (more than {1}) are updated on every edit'.format(
+                len(indexes), FINDING_MAX_INDEXES))
+    ]
+
+
+# ----------------------------------------------------------------------
+def make_skipped_checks_finding(checks, reason):
+    """Get finding telling that some checks were not run.
+
+    checks: str:
+        description of the checks skipped, such as `Indexes checks`
+
+    reason: str:
+        why the checks were skipped
+    """
+    return make_finding(SEVERITY_LOW, '', '{0} skipped'.format(checks),
+                        reason)
+
+
+# ----------------------------------------------------------------------
+def find_oversized_text_fields(dataset_name, fields, profiles):
+    """Find text fields declared far wider than the longest value stored.
+
+    profiles: list:
+        fields profiles as returned by the profile metric
+    """
+    type_column = GDB_TABLE_FIELD_PROPS['type']
+    name_column = GDB_TABLE_FIELD_PROPS['name']
+    length_column = GDB_TABLE_FIELD_PROPS['length']
+    max_length_used_column = GDB_FIELD_PROFILE_PROPS['maxLengthUsed']
+    text_fields_lengths = {
+        field[name_column]: field[length_column]
+        for field in fields if field[type_column] == 'String'
+    }
+
+    findings = []
+    for profile in profiles:
+        field_name = profile[GDB_FIELD_PROFILE_PROPS['name']]
+        length = text_fields_lengths.get(field_name)
+        max_length_used = profile[max_length_used_column]
+        if not length or max_length_used == '':
+            continue
+        if (length >= max(max_length_used, 1) * FINDING_TEXT_WIDTH_RATIO
+                and length - max_length_used
+                >= FINDING_TEXT_MIN_UNUSED_LENGTH):
+            findings.append(
+                make_finding(
+                    SEVERITY_LOW,
+                    dataset_name,
+                    'Text field is much wider than the values stored',
+                    'Length {0}, longest value {1}'.format(
+                        length, max_length_used),
+                    field=field_name,
+                ))
+    return findings
+
+
+# ----------------------------------------------------------------------
+def _get_keys_tables(rel_class):
+    """Get (table name, key field) pairs of relationship class keys."""
+    props = {k: rel_class[v] for k, v in GDB_RELATIONSHIP_CLASS_PROPS.items()}
+    origin = _get_unqualified_name(props['originClassNames'])
+    destination = _get_unqualified_name(props['destinationClassNames'])
+    # foreign keys of attributed relationship classes are stored in
+    # the relationship class table itself
+    foreign_table = (_get_unqualified_name(rel_class['Name'])
+                     if props['isAttributed'] is True else destination)
+    keys_tables = {
+        'OriginPrimary': origin,
+        'OriginForeign': foreign_table,
+        'DestinationPrimary': destination,
+        'DestinationForeign': foreign_table,
+    }
+    pairs = []
+    for keys in (props['originClassKeys'], props['destinationClassKeys']):
+        for key in keys or []:
+            field_name, key_role = key[0], key[1]
+            if key_role in keys_tables:
+                pairs.append((keys_tables[key_role], field_name))
+    return pairs
+
+
+# ----------------------------------------------------------------------
+def find_unindexed_relationship_keys(rel_classes, datasets_indexes):
+    """Find relationship classes key fields without attribute index.
+
+    rel_classes: list:
+        relationship classes as returned by `get_relationship_classes`
+
+    datasets_indexes: dict:
+        dataset name and list of indexes as returned by `get_indexes`
+    """
+    indexed_fields = {
+        dataset_name.lower(): set(
+            field.strip().lower() for index in indexes
+            for field in index[GDB_TABLE_INDEX_PROPS['fields']].split(','))
+        for dataset_name, indexes in datasets_indexes.items()
+    }
+    findings = []
+    for rel_class in rel_classes:
+        for table_name, field_name in _get_keys_tables(rel_class):
+            if table_name.lower() not in indexed_fields:
+                continue
+            if field_name.lower() in indexed_fields[table_name.lower()]:
+                continue
+            findings.append(
+                make_finding(
+                    SEVERITY_HIGH,
+                    table_name,
+                    'Relationship class key field has no index',
+                    'Key of {0}; related rows are found by reading '
+                    'all rows'.format(rel_class['Name']),
+                    field=field_name,
+                ))
+    return findings
+
+
+# ----------------------------------------------------------------------
+def find_fragmented_tables(storage):
+    """Find tables with a large share of deleted rows worth compacting.
+
+    storage: list:
+        tables storage as returned by `get_datasets_storage`
+    """
+    findings = []
+    for table in storage:
+        deleted_ratio = table[GDB_STORAGE_PROPS['deletedRatio']]
+        if deleted_ratio and deleted_ratio > FINDING_MAX_DELETED_ROWS_RATIO:
+            findings.append(
+                make_finding(
+                    SEVERITY_MEDIUM, table[GDB_STORAGE_PROPS['name']],
+                    'Table has many deleted rows',
+                    '{0}% of rows are deleted; compact the '
+                    'geodatabase'.format(deleted_ratio)))
+    return findings
+
+
+# ----------------------------------------------------------------------
+def find_poor_spatial_indexes(spatial_indexes):
+    """Find spatial indexes with grid sizes not fitting the features.
+
+    spatial_indexes: list:
+        spatial indexes as returned by `assess_spatial_index`; missing
+        spatial indexes are reported by `find_missing_spatial_indexes`
+    """
+    return [
+        make_finding(
+            spatial_index[GDB_SPATIAL_INDEX_PROPS['severity']],
+            spatial_index[GDB_SPATIAL_INDEX_PROPS['name']],
+            'Spatial index grid does not fit the features',
+            spatial_index[GDB_SPATIAL_INDEX_PROPS['issues']])
+        for spatial_index in spatial_indexes
+        if spatial_index[GDB_SPATIAL_INDEX_PROPS['hasSpatialIndex']]
+        and spatial_index[GDB_SPATIAL_INDEX_PROPS['severity']]
+    ]
@@ -3,57 +3,112 @@
 from __future__ import print_function
 import os
 import datetime
-import tempfile
-import pkgutil
-
-from xml.etree import ElementTree
-from collections import OrderedDict, defaultdict
-
-arcpy_loader = pkgutil.find_loader('arcpy')
-if arcpy_loader:
-    import arcpy
-    arcpy.env.overwriteOutput = True
-    arcpy_found = True
-else:
-    arcpy_found = False
-    import ogr
-    import json
-
-from registrant._data_objects import (
-    Table,
-    TableOgr,
-    FeatureClass,
-    FeatureClassOgr,
-)
+
+from collections import OrderedDict
+
+from registrant._lazy import arcpy
+from registrant._backends import get_backends
+from registrant._records import TableRecord, FeatureClassRecord
+from registrant._plan import needs_describe
+from registrant._replicas import iter_replica_schemas
 from registrant._util_mappings import (
-    GDB_RELEASE,
-    GDB_WKSPC_TYPE,
     GDB_PROPS,
-    GDB_DOMAIN_PROPS,
     GDB_REPLICA_PROPS,
     GDB_VERSION_PROPS,
     GDB_TABLE_PROPS,
     GDB_FC_PROPS,
-    OGR_GDB_DOMAIN_PROPS,
-    OGR_DOMAIN_PROPS_MAPPINGS,
     GDB_RELATIONSHIP_CLASS_PROPS,
 )
-from registrant._config import ESRI_GDB_REPLICA_INF_DATE
+from registrant._config import (
+    ESRI_GDB_REPLICA_INF_DATE,
+    DATASET_TYPE_FC,
+    DATASET_TYPE_TABLE,
+    ATTACHMENT_TABLE_SUFFIX,
+    BACKEND_ARCPY,
+    OPERATION_CATALOG,
+    OPERATION_PROPERTIES,
+    OPERATION_FIELDS,
+    OPERATION_DOMAINS,
+    OPERATION_COUNTS,
+    OPERATION_SUBTYPES,
+    OPERATION_INDEXES,
+)
 
 
 ########################################################################
 class Geodatabase(object):
     """Geodatabase object."""
 
-    def __init__(self, path):
-        """Initialize `Geodatabase` object with basic properties."""
-        self.arcpy_found = arcpy_found
+    def __init__(self, path, backends=None, ogr_driver=None):
+        """Initialize `Geodatabase` object with basic properties.
+
+        backends: str | list | dict:
+            backends to read the geodatabase with as accepted by
+            `_backends.get_backends`; by default, every operation is
+            run with the fastest backend available
+
+        ogr_driver: str:
+            OGR driver to open file geodatabase with when `ogr` is one
+            of the backends; the first driver available by default
+        """
         self.path = path
-        self.ds = self._get_gdb_ds()
-        self.metadata = self._get_ogr_metadata_full()
-        self.release = self._get_release()
-        self.wkspc_type = self._get_wkspc_type()
+        self.backends = get_backends(path, backends, ogr_driver)
+        # replicas, versions and relationship classes are read only
+        # when arcpy is one of the backends in use
+        self.arcpy_found = any(
+            backend.name == BACKEND_ARCPY
+            for operation_backends in self.backends.values()
+            for backend in operation_backends)
+        self.release = self._run(OPERATION_PROPERTIES, 'get_release')
+        self.wkspc_type = self._run(OPERATION_PROPERTIES,
+                                    'get_workspace_type')
         self.is_gdb_enabled = True if self.release else False
+        self._datasets_names = None
+        self._feature_datasets = None
+
+    # ----------------------------------------------------------------------
+    def _run(self, operation, method_name, *args):
+        """Run operation with the first backend returning a result."""
+        for backend in self.backends[operation]:
+            result = getattr(backend, method_name)(*args)
+            if result is not None:
+                return result
+        return None
+
+    # ----------------------------------------------------------------------
+    def supports(self, operation):
+        """Check whether any backend in use can run the operation."""
+        return bool(self.backends[operation])
+
+    # ----------------------------------------------------------------------
+    def get_dataset(self, dataset_name, dataset_type):
+        """Get data object of single dataset of the properties backend."""
+        return self._run(OPERATION_PROPERTIES, 'get_dataset', dataset_name,
+                         dataset_type)
+
+    # ----------------------------------------------------------------------
+    def get_fields(self, dataset_name, dataset_type):
+        """Get fields properties of single dataset as records."""
+        return self._run(OPERATION_FIELDS, 'get_fields', dataset_name,
+                         dataset_type)
+
+    # ----------------------------------------------------------------------
+    def get_row_count(self, dataset_name, dataset_type):
+        """Get number of rows of single dataset."""
+        return self._run(OPERATION_COUNTS, 'get_row_count', dataset_name,
+                         dataset_type)
+
+    # ----------------------------------------------------------------------
+    def get_subtypes(self, dataset_name, dataset_type):
+        """Get subtypes of single dataset as records."""
+        return self._run(OPERATION_SUBTYPES, 'get_subtypes', dataset_name,
+                         dataset_type) or []
+
+    # ----------------------------------------------------------------------
+    def get_indexes(self, dataset_name, dataset_type):
+        """Get attribute indexes of single dataset as records."""
+        return self._run(OPERATION_INDEXES, 'get_indexes', dataset_name,
+                         dataset_type) or []
 
     # ----------------------------------------------------------------------
     def get_pretty_props(self):
@@ -66,16 +121,27 @@ class Geodatabase(object):
     # ----------------------------------------------------------------------
     def get_replicas(self):
         """Get geodatabase replicas as ordered dict."""
-        replicas_props = []
+        return list(self.iter_replicas())
+
+    # ----------------------------------------------------------------------
+    def iter_replicas(self):
+        """Yield geodatabase replicas as ordered dicts as they are read."""
         if self.arcpy_found and self.is_gdb_enabled:
             # due to bug in arcpy, cannot use da.ListReplicas date properties
             # `lastSend` and `lastReceive` for file/personal geodatabases
             # because it crashes the Python process
+            is_enterprise = self.wkspc_type == 'Enterprise geodatabase'
+            replicas = []
             for replica in arcpy.da.ListReplicas(self.path):
+                # schemas are exported again only for the replicas
+                # synchronized since they were exported
+                generation = (getattr(replica, 'lastSend', None),
+                              getattr(replica, 'lastReceive', None)
+                              ) if is_enterprise else None
                 od = OrderedDict()
                 for k, v in GDB_REPLICA_PROPS.items():
-                    if (self.wkspc_type != 'Enterprise geodatabase') and (k in (
-                            'lastReceive', 'lastSend')):
+                    if not is_enterprise and k in ('lastReceive',
+                                                   'lastSend'):
                         od[v] = 'Not available'
                     else:
                         prop_value = getattr(replica, k, '')
@@ -89,49 +155,41 @@ class Geodatabase(object):
                             else:
                                 od[v] = ''
 
-                # need at least Standard license of ArcGIS Desktop
-                # to run this GP tool
-                if arcpy.ProductInfo() in ('ArcEditor', 'ArcInfo'):
-                    if not hasattr(arcpy, 'ExportReplicaSchema_management'):
-                        # ArcGIS Pro at 1.2 did not have this GP tool
-                        return
-                    replica_schema_xml = os.path.join(tempfile.gettempdir(),
-                                                      'ReplicaSchema.xml')
-                    arcpy.ExportReplicaSchema_management(
-                        in_geodatabase=self.path,
-                        output_replica_schema_file=replica_schema_xml,
-                        in_replica=replica.name,
-                    )
-                    with open(replica_schema_xml, 'r') as fh:
-                        schema_xml_data = fh.readlines()[0]
-                    try:
-                        os.remove(replica_schema_xml)
-                    except Exception:
-                        pass
-                    xml = ElementTree.fromstring(schema_xml_data)
-                    od['Creation date'] = xml.find('WorkspaceDefinition').find(
-                        'GPReplica').find('CreationDate').text.replace(
-                            'T', ' ')
-
-                    datasets = xml.find('WorkspaceDefinition').find(
-                        'GPReplica').find('GPReplicaDescription').find(
-                            'GPReplicaDatasets')
-                    datasets_pairs = sorted(
-                        ((d.find('DatasetName').text, d.find('TargetName').text)
-                         for d in datasets.getchildren()),
-                        key=lambda pair: pair[0].lower())
-
-                    od['Datasets'] = '<br>'.join([
-                        '{0} -> {1}'.format(i[0], i[1]) for i in datasets_pairs
-                    ])
-
-                replicas_props.append(od)
-        return replicas_props
+                replicas.append((od, replica.name, generation))
+
+            # need at least Standard license of ArcGIS Desktop
+            # to run this GP tool
+            if arcpy.ProductInfo() in ('ArcEditor', 'ArcInfo'):
+                if not hasattr(arcpy, 'ExportReplicaSchema_management'):
+                    # ArcGIS Pro at 1.2 did not have this GP tool
+                    return
+                schemas = iter_replica_schemas(
+                    self.path,
+                    [(name, generation) for _, name, generation in replicas])
+                for (od, _, _), schema in zip(replicas, schemas):
+                    if schema is None:
+                        # schema could not be exported
+                        od['Creation date'] = ''
+                        od['Datasets'] = ''
+                    else:
+                        od['Creation date'] = schema.creation_date
+                        od['Datasets'] = '<br>'.join([
+                            '{0} -> {1}'.format(i[0], i[1])
+                            for i in schema.datasets
+                        ])
+                    yield od
+            else:
+                for od, _, _ in replicas:
+                    yield od
 
     # ----------------------------------------------------------------------
     def get_versions(self):
         """Get ArcSDE geodatabase version objects as ordered dict."""
-        versions_props = []
+        return list(self.iter_versions())
+
+    # ----------------------------------------------------------------------
+    def iter_versions(self):
+        """Yield ArcSDE geodatabase versions as ordered dicts."""
         if (self.arcpy_found and self.wkspc_type == 'Enterprise geodatabase'
                 and self.is_gdb_enabled):
             for version in arcpy.da.ListVersions(self.path):
@@ -147,14 +205,16 @@ class Geodatabase(object):
                             od[v] = prop_value
                         else:
                             od[v] = ''
-                versions_props.append(od)
-
-        return versions_props
+                yield od
 
     # ----------------------------------------------------------------------
     def get_relationship_classes(self):
         """Get geodatabase relationship classes objects as ordered dict."""
-        rc_props = []
+        return list(self.iter_relationship_classes())
+
+    # ----------------------------------------------------------------------
+    def iter_relationship_classes(self):
+        """Yield geodatabase relationship classes as ordered dicts."""
         if self.arcpy_found and self.is_gdb_enabled:
             for gdb_path, _fd, rcs in arcpy.da.Walk(
                     self.path, datatype='RelationshipClass'):
@@ -182,244 +242,172 @@ class Geodatabase(object):
                                 od[v] = prop_value
                         else:
                             od[v] = ''
-                    rc_props.append(od)
-
-        return rc_props
+                    yield od
 
     # ----------------------------------------------------------------------
     def get_domains(self):
         """Get geodatabase domains as ordered dict."""
-        domains_props = []
-        if self.is_gdb_enabled:
-            if self.arcpy_found:
-                for domain in arcpy.da.ListDomains(self.path):
-                    od = OrderedDict()
-                    for k, v in GDB_DOMAIN_PROPS.items():
-                        od[v] = getattr(domain, k, '')
-                    domains_props.append(od)
-
-            else:
-                gdb_domains = self._ogr_get_domains()
-                for domain_type, domains in gdb_domains.items():
-                    for domain in domains:
-                        od = OrderedDict()
-                        for k, v in OGR_GDB_DOMAIN_PROPS.items():
-                            if k == 'domainType':
-                                od[v] = OGR_DOMAIN_PROPS_MAPPINGS[domain_type]
-
-                            # describing domain range
-                            elif k == 'range':
-                                try:
-                                    od[v] = (
-                                        float(domain.find('MinValue').text),
-                                        float(domain.find('MaxValue').text),
-                                    )
-                                except AttributeError:
-                                    od[v] = ''
-
-                            # describing domain coded values
-                            elif k == 'codedValues':
-                                try:
-                                    cvs = domain.find('CodedValues').findall(
-                                        'CodedValue')
-                                    od[v] = {
-                                        cv.find('Code').text:
-                                        cv.find('Name').text
-                                        for cv in cvs
-                                    }
-                                except AttributeError:
-                                    od[v] = ''
-                            else:
-                                try:
-                                    if domain.find(k).text:
-                                        od[v] = OGR_DOMAIN_PROPS_MAPPINGS.get(
-                                            domain.find(k).text,
-                                            domain.find(k).text)
-                                    else:
-                                        od[v] = ''
-                                except AttributeError:
-                                    od[v] = ''
-                        domains_props.append(od)
-
-        return domains_props
+        return list(self.iter_domains())
 
     # ----------------------------------------------------------------------
-    def get_tables(self):
-        """Get geodatabase tables as `Table` class instances."""
-        tables = []
-        if self.arcpy_found:
-            arcpy.env.workspace = self.path
-            for tbl in arcpy.ListTables():
-                try:
-                    tbl_instance = Table(arcpy.Describe(tbl).catalogPath)
-                    if tbl_instance.OIDFieldName == 'ATTACHMENTID':
-                        continue
-                    od = OrderedDict()
-                    for k, v in GDB_TABLE_PROPS.items():
-                        od[v] = getattr(tbl_instance, k, '')
-
-                    # custom props
-                    od['Row count'] = tbl_instance.get_row_count()
-                    num_attachments = tbl_instance.get_attachments_count()
-
-                    if num_attachments is not None:
-                        od['Attachments enabled'] = True
-                        od['Attachments count'] = num_attachments
-                    else:
-                        od['Attachments enabled'] = False
-                        od['Attachments count'] = ''
-
-                    tables.append(od)
-                except Exception as e:
-                    print('Error. Could not read table', tbl, '. Reason: ', e)
-
-        else:
-            table_names = [
-                self.ds.GetLayerByIndex(i).GetName()
-                for i in range(0, self.ds.GetLayerCount())
-                if not self.ds.GetLayerByIndex(i).GetGeometryColumn()
-            ]
-            for table_name in table_names:
-                try:
-                    tbl_instance = TableOgr(self, table_name)
-                    od = OrderedDict()
-                    for k, v in GDB_TABLE_PROPS.items():
-                        od[v] = getattr(tbl_instance, k, '')
-
-                    # custom props
-                    od['Row count'] = tbl_instance.get_row_count()
-                    tables.append(od)
-                except Exception as e:
-                    print(e)
-        return tables
+    def iter_domains(self):
+        """Yield geodatabase domains as ordered dicts as they are read."""
+        if not self.is_gdb_enabled:
+            return
+        for backend in self.backends[OPERATION_DOMAINS][:1]:
+            for domain in backend.iter_domains():
+                yield domain
 
     # ----------------------------------------------------------------------
-    def get_feature_classes(self):
-        """Get geodatabase feature classes as ordered dicts."""
-        fcs = []
-        if self.arcpy_found:
-            arcpy.env.workspace = self.path
-            # iterate feature classes within feature datasets
-            fds = [fd for fd in arcpy.ListDatasets(feature_type='feature')]
-            if fds:
-                for fd in fds:
-                    arcpy.env.workspace = os.path.join(self.path, fd)
-                    for fc in arcpy.ListFeatureClasses():
-                        od = self._get_fc_props(fc)
-                        od['Feature dataset'] = fd
-                        fcs.append(od)
-
-            # iterate feature classes in the geodatabase root
-            arcpy.env.workspace = self.path
-            for fc in arcpy.ListFeatureClasses():
-                od = self._get_fc_props(fc)
-                fcs.append(od)
-
-        else:
-            ds = ogr.Open(self.path, 0)
-            fcs_names = [
-                ds.GetLayerByIndex(i).GetName()
-                for i in range(0, ds.GetLayerCount())
-                if ds.GetLayerByIndex(i).GetGeometryColumn()
-            ]
-            for fc_name in fcs_names:
-                try:
-                    fc_instance = FeatureClassOgr(self, fc_name)
-                    od = OrderedDict()
-                    for k, v in GDB_FC_PROPS.items():
-                        od[v] = getattr(fc_instance, k, '')
-                    # custom props
-                    od['Row count'] = fc_instance.get_row_count()
-                    fcs.append(od)
-                except Exception as e:
-                    print(e)
-        return fcs
+    def get_tables(self, columns=None):
+        """Get geodatabase tables properties as records."""
+        return list(self.iter_tables(columns))
 
     # ----------------------------------------------------------------------
-    def _get_gdb_ds(self):
-        """Get the geodatabase OGR data source object."""
-        if not self.arcpy_found:
-            return ogr.Open(self.path, 0)
+    def iter_tables(self, columns=None):
+        """Yield geodatabase tables properties as records as they are read.
+
+        Attachment tables are skipped by their names, so the same tables
+        are listed whatever the columns read; a table which cannot be
+        read is reported and skipped without stopping the iteration.
+
+        columns: list:
+            labels of the properties to read; all properties by default.
+            Tables are described only when a property other than the name
+            and the row count is read
+        """
+        suffix = ATTACHMENT_TABLE_SUFFIX.upper()
+        for table_name, dataset_type in self.get_datasets_names():
+            if (dataset_type != DATASET_TYPE_TABLE
+                    or table_name.upper().endswith(suffix)):
+                continue
+            try:
+                od = TableRecord()
+                tbl_instance = None
+                if needs_describe(columns):
+                    tbl_instance = self.get_dataset(table_name, dataset_type)
+                    self._add_props(od, tbl_instance, GDB_TABLE_PROPS,
+                                    columns)
+                else:
+                    od['Name'] = table_name
+                self._add_custom_props(od, tbl_instance, table_name,
+                                       dataset_type, columns)
+            except Exception as e:
+                print('Error. Could not read table', table_name, '. Reason: ',
+                      e)
+                continue
+            yield od
 
     # ----------------------------------------------------------------------
-    def _get_ogr_metadata_full(self):
-        """Get the full geodatabase metadata as a list of xml objects."""
-        metadata = None
-        if not self.arcpy_found:
-            res = self.ds.ExecuteSQL('select * from GDB_Items')
-            res.CommitTransaction()
-            metadata = []
-            for _i in range(0, res.GetFeatureCount()):
-                item = json.loads(res.GetNextFeature().
-                                  ExportToJson())['properties']['Definition']
-                if item:
-                    xml = ElementTree.fromstring(item)
-                    metadata.append(xml)
-        return metadata
+    def get_feature_classes(self, columns=None):
+        """Get geodatabase feature classes properties as records."""
+        return list(self.iter_feature_classes(columns))
 
     # ----------------------------------------------------------------------
-    def _ogr_get_geodatabase(self):
-        """Return an xml object with the metadata of geodatabase repository."""
-        for item in self.metadata:
-            if item.tag == 'DEWorkspace':
-                return item
-
-        # ----------------------------------------------------------------------
-    def _ogr_get_domains(self):
-        """Get an xml object with the geodatase domains metadata."""
-        domains = defaultdict(list)
-        for item in self.metadata:
-            if item.tag in ('GPCodedValueDomain2', 'GPRangeDomain2'):
-                domains[item.tag].append(item)
-        return domains
+    def iter_feature_classes(self, columns=None):
+        """Yield geodatabase feature classes properties as records.
+
+        A feature class which cannot be read is reported and skipped
+        without stopping the iteration.
+
+        columns: list:
+            labels of the properties to read; all properties by default.
+            Feature classes are described only when a property other
+            than the name and the row count is read
+        """
+        for fc_name, dataset_type in self.get_datasets_names():
+            if dataset_type != DATASET_TYPE_FC:
+                continue
+            try:
+                od = FeatureClassRecord()
+                fc_instance = None
+                if needs_describe(columns):
+                    fc_instance = self.get_dataset(fc_name, dataset_type)
+                    self._add_props(od, fc_instance, GDB_FC_PROPS, columns)
+                    # feature datasets are known only with arcpy
+                    if hasattr(fc_instance, 'featureDataset') and (
+                            columns is None or 'Feature dataset' in columns):
+                        od['Feature dataset'] = fc_instance.featureDataset
+                else:
+                    od['Name'] = fc_name
+                self._add_custom_props(od, fc_instance, fc_name,
+                                       dataset_type, columns)
+            except Exception as e:
+                print('Error. Could not read feature class', fc_name,
+                      '. Reason: ', e)
+                continue
+            yield od
 
     # ----------------------------------------------------------------------
-    @staticmethod
-    def _get_fc_props(fc):
-        """Get single geodatabase feature class props as ordered dict."""
-        fc_instance = FeatureClass(arcpy.Describe(fc).catalogPath)
-        od = OrderedDict()
-
-        passed_first_column = False
-        for k, v in GDB_FC_PROPS.items():
-            od[v] = getattr(fc_instance, k, '')
-            if not passed_first_column:
-                od['Feature dataset'] = ''
-                passed_first_column = True
-        # custom props
-        od['Row count'] = fc_instance.get_row_count()
-        num_attachments = fc_instance.get_attachments_count()
+    def _add_props(self, od, dataset, props, columns=None):
+        """Add described properties of dataset which are read."""
+        for k, v in props.items():
+            if columns is None or v in columns:
+                od[v] = getattr(dataset, k, '')
+        return
 
+    # ----------------------------------------------------------------------
+    def _add_custom_props(self,
+                          od,
+                          dataset,
+                          dataset_name,
+                          dataset_type,
+                          columns=None):
+        """Add row count and attachments count to dataset properties."""
+        if columns is None or 'Row count' in columns:
+            od['Row count'] = self.get_row_count(dataset_name, dataset_type)
+        # attachments are counted through the relationship classes which
+        # are described only with arcpy
+        if not hasattr(dataset, 'get_attachments_count'):
+            return
+        if columns is not None and not ('Attachments enabled' in columns
+                                        or 'Attachments count' in columns):
+            return
+        num_attachments = dataset.get_attachments_count()
         if num_attachments is not None:
             od['Attachments enabled'] = True
             od['Attachments count'] = num_attachments
         else:
             od['Attachments enabled'] = False
             od['Attachments count'] = ''
+        return
 
-        return od
+    # ----------------------------------------------------------------------
+    def get_datasets_names(self):
+        """Get names of geodatabase tables and feature classes.
+
+        Return a list of (dataset name, dataset type) tuples. Only the
+        catalog is read; no dataset properties are described.
+        """
+        if self._datasets_names is None:
+            self._datasets_names = self._run(OPERATION_CATALOG,
+                                             'get_datasets_names')
+        return self._datasets_names
 
     # ----------------------------------------------------------------------
-    def _get_release(self):
-        """Get geodatabase release version."""
-        if self.arcpy_found:
-            return GDB_RELEASE.get(arcpy.Describe(self.path).release, '')
-        else:
-            xml = self._ogr_get_geodatabase()
-            return GDB_RELEASE.get(
-                ','.join([
-                    xml.find('MajorVersion').text,
-                    xml.find('MinorVersion').text,
-                    xml.find('BugfixVersion').text,
-                ]), '')
+    def get_feature_datasets(self):
+        """Get feature datasets of the feature classes.
+
+        Return a dict of feature class names and names of their feature
+        datasets (an empty string for feature classes outside of them).
+        Only the catalog is read.
+        """
+        if self._feature_datasets is None:
+            self._feature_datasets = self._run(OPERATION_CATALOG,
+                                               'get_feature_datasets')
+        return self._feature_datasets
 
     # ----------------------------------------------------------------------
-    def _get_wkspc_type(self):
-        """Get geodatabase workspace type."""
-        if self.arcpy_found:
-            return [
-                value for key, value in GDB_WKSPC_TYPE.items() if key.lower() in
-                arcpy.Describe(self.path).workspaceFactoryProgID.lower()
-            ][0]
-        else:
-            return 'File geodatabase'
+    def get_attachment_tables_names(self):
+        """Get names of attachment tables along with their parent datasets.
+
+        Return a list of (attachment table name, parent dataset name)
+        tuples sorted by the parent dataset name.
+        """
+        suffix = ATTACHMENT_TABLE_SUFFIX.upper()
+        return sorted(
+            ((name, name[:-len(suffix)])
+             for name, dataset_type in self.get_datasets_names()
+             if dataset_type == DATASET_TYPE_TABLE
+             and name.upper().endswith(suffix)),
+            key=lambda names: names[1].lower())
@@ -0,0 +1,312 @@
+# -*- coding: UTF-8 -*-
+"""Statistics of the geometries stored in the feature classes.
+
+Geometries are read as WKB. Only the headers of geometries (types and
+counts of parts and points) are parsed; the coordinates of all features
+of a batch are gathered into a single numpy array and the extents are
+computed for the whole batch at once without building geometry objects.
+"""
+from __future__ import division
+import struct
+from collections import OrderedDict
+
+from registrant._lazy import numpy as np
+
+from registrant._util_mappings import GDB_FC_GEOMETRY_STATS_PROPS
+from registrant._config import DATASET_TYPE_FC
+from registrant._metrics import Metric, register_metric
+from registrant._sketches import KllSketch
+
+# WKB geometry types which are followed by a list of points
+_WKB_POINT = 1
+_WKB_CURVES = (2, 8)  # LineString, CircularString
+_WKB_POLYGONS = (3, 17)  # Polygon, Triangle
+# WKB geometry types which are followed by a list of geometries: multi
+# part geometries, collections, compound curves, curve polygons, multi
+# curves, multi surfaces, polyhedral surfaces and TINs
+_WKB_COLLECTIONS = (4, 5, 6, 7, 9, 10, 11, 12, 15, 16)
+# numbers of extra dimensions of ISO WKB types by their thousands
+_WKB_ISO_DIMENSIONS = {0: 0, 1: 1, 2: 1, 3: 2}
+# extended WKB flags of Z and M dimensions
+_EWKB_Z = 0x80000000
+_EWKB_M = 0x40000000
+
+
+# ----------------------------------------------------------------------
+def _parse_wkb(wkb, offset, runs):
+    """Parse WKB geometry header appending its runs of points.
+
+    A run of points is a (offset, points count, dimensions, byte order)
+    tuple. Return offset of the end of the geometry; raise `ValueError`
+    if the geometry type is not known.
+    """
+    endian = '<' if struct.unpack_from('B', wkb, offset)[0] == 1 else '>'
+    geometry_type = struct.unpack_from(endian + 'I', wkb, offset + 1)[0]
+    offset += 5
+
+    dimensions = 2
+    if geometry_type & (_EWKB_Z | _EWKB_M):
+        dimensions += bool(geometry_type & _EWKB_Z) + bool(
+            geometry_type & _EWKB_M)
+        geometry_type &= 0xFFFF
+    elif geometry_type // 1000 in _WKB_ISO_DIMENSIONS:
+        dimensions += _WKB_ISO_DIMENSIONS[geometry_type // 1000]
+    else:
+        raise ValueError('Unknown WKB geometry type {0}'.format(
+            geometry_type))
+    geometry_type %= 1000
+
+    if geometry_type == _WKB_POINT:
+        runs.append((offset, 1, dimensions, endian))
+        return offset + 8 * dimensions
+
+    if geometry_type in _WKB_CURVES:
+        points_count = struct.unpack_from(endian + 'I', wkb, offset)[0]
+        runs.append((offset + 4, points_count, dimensions, endian))
+        return offset + 4 + 8 * dimensions * points_count
+
+    if (geometry_type not in _WKB_POLYGONS
+            and geometry_type not in _WKB_COLLECTIONS):
+        raise ValueError('Unknown WKB geometry type {0}'.format(
+            geometry_type))
+
+    count = struct.unpack_from(endian + 'I', wkb, offset)[0]
+    offset += 4
+    if geometry_type in _WKB_POLYGONS:
+        for _ring in range(0, count):
+            points_count = struct.unpack_from(endian + 'I', wkb, offset)[0]
+            runs.append((offset + 4, points_count, dimensions, endian))
+            offset += 4 + 8 * dimensions * points_count
+        return offset
+
+    for _geometry in range(0, count):
+        offset = _parse_wkb(wkb, offset, runs)
+    return offset
+
+
+# ----------------------------------------------------------------------
+def decode_wkb_batch(geometries):
+    """Decode batch of WKB geometries into numpy arrays.
+
+    Return tuple of:
+    * sizes of geometries in bytes,
+    * numbers of parts (rings, lines, points) of geometries,
+    * numbers of vertices of geometries,
+    * (n, 2) array of x, y coordinates of all vertices of the batch,
+    * booleans of geometries of unknown types or malformed.
+
+    Null geometries have zero size, parts and vertices; geometries which
+    cannot be parsed have zero parts and vertices. Coordinates of each
+    dimensions and byte order are decoded at once; vertices of batches
+    mixing them (such as geometries with and without Z values) are put
+    back in the order of geometries.
+    """
+    unsupported = np.zeros(len(geometries), dtype=bool)
+    sizes = np.zeros(len(geometries), dtype=np.int64)
+    parts = np.zeros(len(geometries), dtype=np.int64)
+    vertices = np.zeros(len(geometries), dtype=np.int64)
+    # chunks of bytes of the runs of points, their numbers in the batch
+    # and their points counts keyed by (dimensions, byte order)
+    coordinates = {}
+    runs_count = 0
+    for index, wkb in enumerate(geometries):
+        if not wkb:
+            continue
+        runs = []
+        sizes[index] = len(wkb)
+        try:
+            _parse_wkb(wkb, 0, runs)
+        except (ValueError, struct.error):
+            unsupported[index] = True
+            continue
+        for offset, points_count, dimensions, endian in runs:
+            if not points_count:
+                continue
+            parts[index] += 1
+            vertices[index] += points_count
+            chunks, runs_ids, points_counts = coordinates.setdefault(
+                (dimensions, endian), ([], [], []))
+            chunks.append(
+                bytes(wkb[offset:offset + 8 * dimensions * points_count]))
+            runs_ids.append(runs_count)
+            points_counts.append(points_count)
+            runs_count += 1
+
+    xy = [
+        np.frombuffer(b''.join(chunks), dtype=endian + 'f8').reshape(
+            -1, dimensions)[:, :2]
+        for (dimensions, endian), (chunks, _runs_ids, _points_counts) in
+        sorted(coordinates.items())
+    ]
+    if len(xy) == 1:
+        xy = xy[0]
+    elif xy:
+        runs_owners = np.concatenate([
+            np.repeat(runs_ids, points_counts)
+            for _key, (_chunks, runs_ids, points_counts) in
+            sorted(coordinates.items())
+        ])
+        xy = np.concatenate(xy)[np.argsort(runs_owners, kind='stable')]
+    else:
+        xy = np.zeros((0, 2), dtype=np.float64)
+
+    # an empty point is written as a point with NaN coordinates
+    empty_points = np.isnan(xy[:, 0])
+    if empty_points.any():
+        vertex_owner = np.repeat(np.arange(len(geometries)), vertices)
+        np.subtract.at(vertices, vertex_owner[empty_points], 1)
+        np.subtract.at(parts, vertex_owner[empty_points], 1)
+        xy = xy[~empty_points]
+    return sizes, parts, vertices, xy, unsupported
+
+
+# ----------------------------------------------------------------------
+def get_envelopes(vertices, xy):
+    """Get (n, 4) array of xmin, ymin, xmax, ymax of geometries.
+
+    Only geometries with at least one vertex are included.
+    """
+    counts = vertices[vertices > 0]
+    if not counts.size:
+        return np.zeros((0, 4), dtype=np.float64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return np.column_stack((
+        np.minimum.reduceat(xy, starts, axis=0),
+        np.maximum.reduceat(xy, starts, axis=0),
+    ))
+
+
+########################################################################
+@register_metric
+class GeometryStatsMetric(Metric):
+    """Statistics of the geometries of a feature class."""
+
+    name = 'geometry_stats'
+    title = 'Geometry statistics'
+    dataset_types = (DATASET_TYPE_FC, )
+
+    # ----------------------------------------------------------------------
+    def __init__(self, fields, dataset_props):
+        """Initialize `GeometryStatsMetric` with empty statistics."""
+        Metric.__init__(self, fields, dataset_props)
+        self.featureCount = 0
+        self.emptyCount = 0
+        self.unsupportedCount = 0
+        self.extent = None
+        self.verticesSum = 0
+        self.maxVertices = 0
+        self.partsSum = 0
+        self.maxParts = 0
+        self.bytesSum = 0
+        self.maxBytes = 0
+        self.envelopeSum = np.zeros(2, dtype=np.float64)
+        self.vertices_sketch = KllSketch()
+
+    # ----------------------------------------------------------------------
+    def get_columns(self):
+        """Get name of the shape field."""
+        if self.dataset_props.get('shapeFieldName'):
+            return [self.dataset_props['shapeFieldName']]
+        return []
+
+    # ----------------------------------------------------------------------
+    def update(self, batch):
+        """Update the statistics with a batch of geometries."""
+        geometries = batch[self.dataset_props['shapeFieldName']]
+        sizes, parts, vertices, xy, unsupported = decode_wkb_batch(
+            geometries)
+        self.featureCount += len(geometries)
+        self.emptyCount += int(np.count_nonzero(
+            (vertices == 0) & ~unsupported))
+        self.unsupportedCount += int(np.count_nonzero(unsupported))
+        self.bytesSum += int(sizes.sum())
+        self.partsSum += int(parts.sum())
+        self.verticesSum += int(vertices.sum())
+        if not len(geometries):
+            return
+        self.maxBytes = max(self.maxBytes, int(sizes.max()))
+        self.maxParts = max(self.maxParts, int(parts.max()))
+        self.maxVertices = max(self.maxVertices, int(vertices.max()))
+        self.vertices_sketch.update(vertices[vertices > 0])
+
+        envelopes = get_envelopes(vertices, xy)
+        if envelopes.size:
+            self.envelopeSum += (envelopes[:, 2:] - envelopes[:, :2]).sum(
+                axis=0)
+            self._update_extent(
+                (envelopes[:, 0].min(), envelopes[:, 1].min(),
+                 envelopes[:, 2].max(), envelopes[:, 3].max()))
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge statistics computed for other features."""
+        for attr in ('featureCount', 'emptyCount', 'unsupportedCount',
+                     'verticesSum', 'partsSum', 'bytesSum'):
+            setattr(self, attr, getattr(self, attr) + getattr(other, attr))
+        for attr in ('maxVertices', 'maxParts', 'maxBytes'):
+            setattr(self, attr, max(getattr(self, attr), getattr(
+                other, attr)))
+        self.envelopeSum += other.envelopeSum
+        self.vertices_sketch.merge(other.vertices_sketch)
+        if other.extent is not None:
+            self._update_extent(other.extent)
+        return self
+
+    # ----------------------------------------------------------------------
+    def finalize(self):
+        """Get the statistics as a single row ready to write into report."""
+        if not self.featureCount:
+            return []
+        non_empty = (self.featureCount - self.emptyCount
+                     - self.unsupportedCount)
+        od = OrderedDict()
+        for k, v in GDB_FC_GEOMETRY_STATS_PROPS.items():
+            if k == 'extent':
+                od[v] = ', '.join('{0:.6g}'.format(value)
+                                  for value in self.extent or [])
+            elif k == 'avgVertices':
+                od[v] = self._average(self.verticesSum, non_empty)
+            elif k == 'verticesQuantiles':
+                od[v] = ' / '.join(
+                    '{0:g}'.format(value) for value in
+                    self.vertices_sketch.quantiles([0.5, 0.9, 0.99])
+                ) if self.vertices_sketch.count else ''
+            elif k == 'avgParts':
+                od[v] = self._average(self.partsSum, non_empty)
+            elif k == 'avgBytes':
+                od[v] = self._average(self.bytesSum, self.featureCount)
+            elif k == 'avgEnvelope':
+                od[v] = ' x '.join(
+                    '{0:.6g}'.format(value / non_empty)
+                    for value in self.envelopeSum) if non_empty else ''
+            else:
+                od[v] = getattr(self, k, '')
+        return [od]
+
+    # ----------------------------------------------------------------------
+    def get_average_envelope(self):
+        """Get average width and height of geometries envelopes."""
+        non_empty = (self.featureCount - self.emptyCount
+                     - self.unsupportedCount)
+        if not non_empty:
+            return None
+        return tuple(float(value) / non_empty for value in self.envelopeSum)
+
+    # ----------------------------------------------------------------------
+    def _update_extent(self, extent):
+        """Extend the extent seen so far."""
+        if self.extent is None:
+            self.extent = tuple(float(value) for value in extent)
+        else:
+            self.extent = (
+                min(self.extent[0], extent[0]),
+                min(self.extent[1], extent[1]),
+                max(self.extent[2], extent[2]),
+                max(self.extent[3], extent[3]),
+            )
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _average(total, count):
+        """Get average value rounded for the report."""
+        return round(total / count, 2) if count else ''
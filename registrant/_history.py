@@ -0,0 +1,189 @@
+# -*- coding: UTF-8 -*-
+"""History of the datasets sizes kept between the runs of the reporter.
+
+Every run appends the row count, size on disk and number of fields of
+every dataset to a SQLite file. The growth rate of a dataset is the
+slope of the least squares line fitted to its values over time, and
+the date a dataset reaches a threshold is projected along this line.
+"""
+from __future__ import division
+import sqlite3
+import datetime
+from collections import OrderedDict
+
+from registrant._util_mappings import GDB_GROWTH_PROPS
+from registrant._config import (
+    HISTORY_DATE_FORMAT,
+    HISTORY_ROW_COUNT_THRESHOLD,
+    HISTORY_SIZE_THRESHOLD,
+    HISTORY_RUNS_REPORTED,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    geodatabase TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS datasets (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    dataset_type TEXT NOT NULL,
+    row_count INTEGER,
+    size INTEGER,
+    field_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_geodatabase ON runs (geodatabase);
+CREATE INDEX IF NOT EXISTS datasets_run ON datasets (run_id);
+"""
+
+
+########################################################################
+class GrowthHistory(object):
+    """History of datasets sizes stored in a SQLite file."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, path):
+        """Initialize `GrowthHistory` creating the file if needed."""
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    # ----------------------------------------------------------------------
+    def close(self):
+        """Close the history file."""
+        self.connection.close()
+        return
+
+    # ----------------------------------------------------------------------
+    def add_run(self, gdb_path, datasets, created=None):
+        """Append sizes of the datasets seen by a run of the reporter.
+
+        datasets: list:
+            (name, dataset type, row count, size, field count) tuples;
+            unknown values are `None`
+        """
+        created = created or datetime.datetime.now()
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (geodatabase, created) VALUES (?, ?)',
+                (gdb_path, created.strftime(HISTORY_DATE_FORMAT)))
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO datasets (run_id, name, dataset_type, '
+                'row_count, size, field_count) VALUES (?, ?, ?, ?, ?, ?)',
+                ((run_id, ) + tuple(dataset) for dataset in datasets))
+        return run_id
+
+    # ----------------------------------------------------------------------
+    def get_history(self, gdb_path):
+        """Get history of the datasets of a geodatabase.
+
+        Return ordered dict of (name, dataset type) and list of
+        (date, row count, size, field count) tuples ordered by date.
+        """
+        history = OrderedDict()
+        for row in self.connection.execute(
+                'SELECT d.name, d.dataset_type, r.created, d.row_count, '
+                'd.size, d.field_count FROM datasets d '
+                'JOIN runs r ON r.run_id = d.run_id '
+                'WHERE r.geodatabase = ? '
+                'ORDER BY lower(d.name), d.dataset_type, r.created, '
+                'r.run_id', (gdb_path, )):
+            history.setdefault((row[0], row[1]), []).append(
+                (datetime.datetime.strptime(row[2], HISTORY_DATE_FORMAT), )
+                + tuple(row[3:]))
+        return history
+
+
+# ----------------------------------------------------------------------
+def get_growth_rate(dates, values):
+    """Get growth per day of values fitting a least squares line.
+
+    Return (slope per day, intercept at the first date) or `None` if
+    there are not enough values over time.
+    """
+    points = [(date, value) for date, value in zip(dates, values)
+              if value is not None]
+    if len(points) < 2:
+        return None
+    days = [(date - points[0][0]).total_seconds() / 86400
+            for date, _value in points]
+    mean_days = sum(days) / len(days)
+    mean_value = sum(value for _date, value in points) / len(points)
+    variance = sum((day - mean_days) ** 2 for day in days)
+    if not variance:
+        return None
+    slope = sum((day - mean_days) * (value - mean_value)
+                for day, (_date, value) in zip(days, points)) / variance
+    return slope, mean_value - slope * mean_days
+
+
+# ----------------------------------------------------------------------
+def project_threshold_date(dates, values, threshold):
+    """Get date the values are projected to reach the threshold.
+
+    Return 'Reached' if the last value is over the threshold and
+    an empty string if the values do not grow.
+    """
+    known = [value for value in values if value is not None]
+    if not known or threshold is None:
+        return ''
+    if known[-1] >= threshold:
+        return 'Reached'
+    growth = get_growth_rate(dates, values)
+    if growth is None or growth[0] <= 0:
+        return ''
+    slope, intercept = growth
+    # the intercept is at the first date having a value
+    first_date = next(date for date, value in zip(dates, values)
+                      if value is not None)
+    try:
+        return (first_date + datetime.timedelta(
+            days=(threshold - intercept) / slope)).strftime('%Y-%m-%d')
+    except OverflowError:
+        return ''
+
+
+# ----------------------------------------------------------------------
+def _format_history(dates, values):
+    """Format the last values with their dates for the report."""
+    return ', '.join(
+        '{0}: {1}'.format(date.strftime('%Y-%m-%d'), value)
+        for date, value in list(zip(dates, values))[-HISTORY_RUNS_REPORTED:]
+        if value is not None)
+
+
+# ----------------------------------------------------------------------
+def get_growth(history,
+               row_count_threshold=HISTORY_ROW_COUNT_THRESHOLD,
+               size_threshold=HISTORY_SIZE_THRESHOLD):
+    """Get growth of the datasets as returned by `get_history`.
+
+    Return list of ordered dicts ready to write into report.
+    """
+    growth = []
+    for (name, _dataset_type), runs in history.items():
+        dates, row_counts, sizes, field_counts = zip(*runs)
+        rows_rate = get_growth_rate(dates, row_counts)
+        size_rate = get_growth_rate(dates, sizes)
+        values = {
+            'name': name,
+            'runsCount': len(runs),
+            'firstRun': dates[0].strftime('%Y-%m-%d'),
+            'rowCount': row_counts[-1] if row_counts[-1] is not None else '',
+            'rowsPerDay': round(rows_rate[0], 2) if rows_rate else '',
+            'rowsHistory': _format_history(dates, row_counts),
+            'rowsThresholdDate': project_threshold_date(
+                dates, row_counts, row_count_threshold),
+            'size': sizes[-1] if sizes[-1] is not None else '',
+            'bytesPerDay': round(size_rate[0], 2) if size_rate else '',
+            'sizeHistory': _format_history(dates, sizes),
+            'sizeThresholdDate': project_threshold_date(
+                dates, sizes, size_threshold),
+            'fieldCount': (field_counts[-1]
+                           if field_counts[-1] is not None else ''),
+        }
+        growth.append(
+            OrderedDict((v, values[k]) for k, v in GDB_GROWTH_PROPS.items()))
+    return growth
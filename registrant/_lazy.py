@@ -0,0 +1,69 @@
+# -*- coding: UTF-8 -*-
+"""Modules imported only when they are used.
+
+Importing `arcpy` takes seconds and `numpy` and `bs4` take tens of
+milliseconds, so they are not imported when `registrant` is imported
+but on the first access of their attributes. Whether `arcpy` can be
+imported is found out once, also on demand.
+"""
+import pkgutil
+import importlib
+
+_MODULES_FOUND = {}
+
+
+# ----------------------------------------------------------------------
+def is_module_found(name):
+    """Check whether module can be imported without importing it."""
+    if name not in _MODULES_FOUND:
+        _MODULES_FOUND[name] = pkgutil.find_loader(name) is not None
+    return _MODULES_FOUND[name]
+
+
+########################################################################
+class LazyModule(object):
+    """Proxy of a module imported on the first access of its attributes.
+
+    Attributes are copied to the proxy once they are read, so only
+    the first access of every attribute goes through the proxy.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, name):
+        """Initialize `LazyModule` with the name of module to import."""
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    # ----------------------------------------------------------------------
+    def _load(self):
+        """Import the module once."""
+        if self._module is None:
+            self.__dict__['_module'] = importlib.import_module(self._name)
+        return self._module
+
+    # ----------------------------------------------------------------------
+    def __getattr__(self, attr):
+        """Get attribute of the module importing it if needed."""
+        value = getattr(self._load(), attr)
+        self.__dict__[attr] = value
+        return value
+
+    # ----------------------------------------------------------------------
+    def __setattr__(self, attr, value):
+        """Set attribute of the module importing it if needed."""
+        setattr(self._load(), attr, value)
+        self.__dict__.pop(attr, None)
+
+    # ----------------------------------------------------------------------
+    def __repr__(self):
+        """Get representation with the state of the module."""
+        return '<lazy module {0!r} ({1})>'.format(
+            self._name, 'imported' if self._module is not None else
+            'not imported')
+
+
+numpy = LazyModule('numpy')
+bs4 = LazyModule('bs4')
+arcpy = LazyModule('arcpy')
+ogr = LazyModule('ogr')
+gdal = LazyModule('gdal')
@@ -0,0 +1,193 @@
+# -*- coding: UTF-8 -*-
+"""Metrics computed from the values read from datasets rows.
+
+Every metric declares the columns it needs and implements `update`,
+`merge` and `finalize`. All the metrics requested for a dataset are
+computed in a single scan: the union of their columns is read once and
+every batch of rows is fed to each of the metrics.
+
+Custom metrics can be registered with `register_metric` and requested
+by their name when creating a report. Metric classes should be defined
+at the module level so that they can be used by worker processes.
+"""
+import functools
+from collections import OrderedDict
+
+from registrant._scanner import DatasetScanner
+from registrant._config import (
+    SCAN_BATCH_SIZE,
+    DATASET_TYPE_FC,
+    DATASET_TYPE_TABLE,
+)
+
+METRICS_REGISTRY = OrderedDict()
+
+
+# ----------------------------------------------------------------------
+def register_metric(metric_class):
+    """Register metric class to be able to request it by its name.
+
+    Can be used as a class decorator.
+    """
+    if not metric_class.name:
+        raise ValueError('Metric class must have a name')
+    METRICS_REGISTRY[metric_class.name] = metric_class
+    return metric_class
+
+
+# ----------------------------------------------------------------------
+def get_metric_class(metric):
+    """Get metric class from registered metric name or the class itself."""
+    if isinstance(metric, type) and issubclass(metric, Metric):
+        return metric
+    try:
+        return METRICS_REGISTRY[metric]
+    except KeyError:
+        raise ValueError('Metric {0} is not registered'.format(metric))
+
+
+########################################################################
+class Metric(object):
+    """Base class of metrics computed from values of datasets rows.
+
+    Initialized with the fields properties (as returned by `get_fields`)
+    and basic properties of the dataset (name, `OIDFieldName` and
+    `shapeFieldName` for feature classes).
+    """
+
+    # name used to request the metric and title of its report section
+    name = None
+    title = None
+    # types of datasets the metric is computed for
+    dataset_types = (DATASET_TYPE_TABLE, DATASET_TYPE_FC)
+
+    # ----------------------------------------------------------------------
+    def __init__(self, fields, dataset_props):
+        """Initialize metric with the dataset fields and properties."""
+        self.fields = fields
+        self.dataset_props = dataset_props
+
+    # ----------------------------------------------------------------------
+    def get_columns(self):
+        """Get names of the columns which values are needed."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def update(self, batch):
+        """Update the metric with a batch of rows (column name to array)."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge the same metric computed for other rows and return self."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------------
+    def finalize(self):
+        """Get the metric as a list of ordered dicts (rows of report table)."""
+        raise NotImplementedError
+
+
+########################################################################
+class MetricSet(object):
+    """Set of metrics of a dataset computed from the same batches of rows."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, metrics_classes, fields, dataset_props):
+        """Initialize `MetricSet` creating the metrics for the dataset."""
+        self.metrics = [
+            metric_class(fields, dataset_props)
+            for metric_class in metrics_classes
+        ]
+
+    # ----------------------------------------------------------------------
+    def get_columns(self):
+        """Get union of the columns needed by the metrics."""
+        columns = OrderedDict()
+        for metric in self.metrics:
+            for column in metric.get_columns():
+                columns[column] = True
+        return list(columns.keys())
+
+    # ----------------------------------------------------------------------
+    def update(self, batch):
+        """Feed a batch of rows to every metric."""
+        for metric in self.metrics:
+            columns = metric.get_columns()
+            if columns:
+                metric.update({column: batch[column] for column in columns})
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge metrics computed for other rows."""
+        for metric, other_metric in zip(self.metrics, other.metrics):
+            metric.merge(other_metric)
+        return self
+
+    # ----------------------------------------------------------------------
+    def get_metric(self, metric_class):
+        """Get the metric of the given class or `None` if not computed."""
+        for metric in self.metrics:
+            if isinstance(metric, metric_class):
+                return metric
+        return None
+
+    # ----------------------------------------------------------------------
+    def finalize(self):
+        """Get results of the metrics as ordered dict keyed by title."""
+        return OrderedDict(
+            (metric.title, metric.finalize()) for metric in self.metrics)
+
+
+# ----------------------------------------------------------------------
+def get_dataset_props(dataset):
+    """Get basic properties of dataset data object passed to metrics."""
+    return {
+        'name': dataset.name,
+        'OIDFieldName': dataset.OIDFieldName,
+        'shapeFieldName': getattr(dataset, 'shapeFieldName', ''),
+    }
+
+
+# ----------------------------------------------------------------------
+def compute_metrics(dataset,
+                    fields,
+                    metrics_classes,
+                    workers=1,
+                    batch_size=SCAN_BATCH_SIZE):
+    """Compute metrics of a dataset reading its rows once.
+
+    Same as `scan_dataset` but return the `MetricSet` itself so that
+    the state of the metrics can be used after the results are reported.
+    """
+    metric_set_factory = functools.partial(MetricSet, metrics_classes,
+                                           fields, get_dataset_props(dataset))
+    columns = metric_set_factory().get_columns()
+    if not columns:
+        return metric_set_factory()
+
+    scanner = DatasetScanner(dataset, workers, batch_size)
+    return scanner.scan(metric_set_factory, columns)
+
+
+# ----------------------------------------------------------------------
+def scan_dataset(dataset,
+                 fields,
+                 metrics_classes,
+                 workers=1,
+                 batch_size=SCAN_BATCH_SIZE):
+    """Compute metrics of a dataset reading its rows once.
+
+    dataset: Table | TableOgr | FeatureClass | FeatureClassOgr:
+        data object of the dataset to scan
+
+    fields: list:
+        fields properties as returned by the `get_fields` method
+
+    metrics_classes: list:
+        classes of metrics to compute
+
+    Return ordered dict of metric title and list of ordered dicts.
+    """
+    return compute_metrics(dataset, fields, metrics_classes, workers,
+                           batch_size).finalize()
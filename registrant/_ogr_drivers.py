@@ -0,0 +1,73 @@
+# -*- coding: UTF-8 -*-
+"""Opening file geodatabases with a chosen OGR driver and GDAL options.
+
+File geodatabases can be read either with the `OpenFileGDB` driver
+built into GDAL or with the `FileGDB` driver of the Esri File
+Geodatabase API. The data source is opened with the driver chosen or
+with the first driver of `OGR_DRIVERS_PREFERENCES` available. GDAL
+configuration options tuned for scanning all rows are set only while the
+data source is opened and read and only for the thread doing it, so
+reports run in other threads are not affected.
+"""
+import contextlib
+
+from registrant._lazy import ogr, gdal
+from registrant._config import OGR_DRIVERS_PREFERENCES
+
+
+# ----------------------------------------------------------------------
+def get_driver_name(driver_name=None):
+    """Get name of the OGR driver to open file geodatabases with.
+
+    Raise `ValueError` if the driver chosen is not available in the GDAL
+    installation or if no driver reading file geodatabases is available.
+    """
+    if driver_name is not None:
+        if ogr.GetDriverByName(driver_name) is None:
+            raise ValueError(
+                'OGR driver {0} is not available'.format(driver_name))
+        return driver_name
+    for name in OGR_DRIVERS_PREFERENCES:
+        if ogr.GetDriverByName(name) is not None:
+            return name
+    raise ValueError('None of OGR drivers {0} is available'.format(
+        ', '.join(OGR_DRIVERS_PREFERENCES)))
+
+
+# ----------------------------------------------------------------------
+def open_data_source(gdb_path, driver_name=None):
+    """Open file geodatabase read only with the OGR driver.
+
+    Raise `ValueError` if the driver cannot open the geodatabase.
+    """
+    driver_name = get_driver_name(driver_name)
+    ds = ogr.GetDriverByName(driver_name).Open(gdb_path, 0)
+    if ds is None:
+        raise ValueError('Cannot open {0} with OGR driver {1}'.format(
+            gdb_path, driver_name))
+    return ds
+
+
+# ----------------------------------------------------------------------
+@contextlib.contextmanager
+def gdal_config(options):
+    """Set GDAL configuration options of the current thread temporarily.
+
+    options: dict:
+        configuration options and their values, for instance,
+        `GDAL_CONFIG_SCAN`; the values the thread had before are
+        restored afterwards
+    """
+    # thread-local values are restored, so that the global values set
+    # afterwards are still seen by the thread
+    previous = {
+        key: gdal.GetThreadLocalConfigOption(key, None)
+        for key in options
+    }
+    for key, value in options.items():
+        gdal.SetThreadLocalConfigOption(key, value)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            gdal.SetThreadLocalConfigOption(key, value)
@@ -0,0 +1,166 @@
+# -*- coding: UTF-8 -*-
+"""Plan of the sections of a report and the reads of geodatabase they need.
+
+The `do_report_*` flags of `Reporter.gdb2html` and an optional selection
+of columns of the tables and feature classes sections are compiled into
+a plan before anything is read. The plan lists the sections to report
+and the properties of datasets to read for them, so cheap reports do
+only the reads they need; for instance, a report of fields only does
+not describe the datasets nor count rows.
+"""
+from registrant._config import (
+    REPORT_SECTIONS,
+    DATASETS_COLUMNS_NOT_DESCRIBED,
+    DATASET_TYPE_TABLE,
+    DATASET_TYPE_FC,
+)
+from registrant._util_mappings import GDB_FC_PROPS
+
+_NAME_COLUMN = 'Name'
+_ROW_COUNT_COLUMN = 'Row count'
+
+
+########################################################################
+class ReportPlan(object):
+    """Sections to report and what is read from the geodatabase for them.
+
+    sections: list:
+        names of the sections in the order they are reported
+
+    datasets_columns: dict:
+        dataset type and labels of the properties of the datasets to
+        read for the sections; `None` stands for all the properties
+
+    columns: list:
+        labels of the columns of the tables and feature classes sections
+        starting with the name; `None` for all of them
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, sections, datasets_columns, columns=None):
+        """Initialize `ReportPlan` with the sections and reads."""
+        self.sections = sections
+        self.datasets_columns = datasets_columns
+        self.columns = columns
+        return
+
+    # ----------------------------------------------------------------------
+    def __repr__(self):
+        """Get representation with the sections and datasets columns."""
+        return 'ReportPlan(sections={0}, datasets_columns={1})'.format(
+            self.sections, self.datasets_columns)
+
+
+# ----------------------------------------------------------------------
+def needs_describe(columns):
+    """Check whether reading the columns requires describing datasets.
+
+    columns: list:
+        labels of the properties of datasets; `None` for all of them
+    """
+    if columns is None:
+        return True
+    return any(label not in DATASETS_COLUMNS_NOT_DESCRIBED
+               for label in columns)
+
+
+# ----------------------------------------------------------------------
+def _add_columns(datasets_columns, dataset_type, columns):
+    """Add columns to the ones read for datasets of a type."""
+    current = datasets_columns.get(dataset_type, frozenset())
+    if current is None or columns is None:
+        datasets_columns[dataset_type] = None
+    else:
+        datasets_columns[dataset_type] = current | frozenset(columns)
+    return
+
+
+# ----------------------------------------------------------------------
+def make_plan(do_report_versions=False,
+              do_report_replicas=False,
+              do_report_domains=False,
+              do_report_domains_coded_values=False,
+              do_report_domains_usage_counts=False,
+              do_report_relclasses=False,
+              do_report_tables=False,
+              do_report_tables_fields=False,
+              do_report_tables_subtypes=False,
+              do_report_tables_indexes=False,
+              do_report_fcs=False,
+              do_report_fcs_fields=False,
+              do_report_fcs_subtypes=False,
+              do_report_fcs_indexes=False,
+              do_report_attachments=False,
+              do_report_storage=False,
+              do_report_spatial_indexes=False,
+              do_report_growth=False,
+              do_report_findings=False,
+              tables_metrics=None,
+              fcs_metrics=None,
+              columns=None):
+    """Compile the flags of `Reporter.gdb2html` into a `ReportPlan`.
+
+    The overview is always reported; every other section is reported
+    only when requested. Flags not given are off.
+
+    columns: list:
+        labels of the columns of the tables and feature classes sections
+        to report; the name is always reported. All columns by default
+    """
+    if columns is not None:
+        columns = [_NAME_COLUMN] + [
+            label for label in columns if label != _NAME_COLUMN
+        ]
+    sections = {'overview'}
+    datasets_columns = {}
+
+    for section, flag in (
+        ('versions', do_report_versions),
+        ('replicas', do_report_replicas),
+        ('relclasses', do_report_relclasses),
+        ('attachments', do_report_attachments),
+        ('storage', do_report_storage),
+    ):
+        if flag:
+            sections.add(section)
+
+    if (do_report_domains or do_report_domains_coded_values
+            or do_report_domains_usage_counts):
+        sections.add('domains')
+
+    for section, dataset_type, listed, fields, subtypes, indexes, metrics in (
+        ('tables', DATASET_TYPE_TABLE, do_report_tables,
+         do_report_tables_fields, do_report_tables_subtypes,
+         do_report_tables_indexes, tables_metrics),
+        ('fcs', DATASET_TYPE_FC, do_report_fcs, do_report_fcs_fields,
+         do_report_fcs_subtypes, do_report_fcs_indexes, fcs_metrics),
+    ):
+        if not (listed or fields or subtypes or indexes or metrics):
+            continue
+        sections.add(section)
+        # names of datasets are needed for the table of contents
+        _add_columns(datasets_columns, dataset_type,
+                     columns if listed else [_NAME_COLUMN])
+
+    if do_report_spatial_indexes:
+        sections.add('spatialindexes')
+        _add_columns(datasets_columns, DATASET_TYPE_FC,
+                     [_NAME_COLUMN, GDB_FC_PROPS['hasSpatialIndex']])
+
+    if do_report_growth:
+        sections.add('growth')
+        for dataset_type in (DATASET_TYPE_TABLE, DATASET_TYPE_FC):
+            _add_columns(datasets_columns, dataset_type,
+                         [_NAME_COLUMN, _ROW_COUNT_COLUMN])
+
+    if do_report_findings:
+        sections.add('findings')
+        _add_columns(datasets_columns, DATASET_TYPE_FC,
+                     [_NAME_COLUMN, GDB_FC_PROPS['hasSpatialIndex']])
+
+    return ReportPlan(
+        sections=[section for section in REPORT_SECTIONS
+                  if section in sections],
+        datasets_columns=datasets_columns,
+        columns=columns,
+    )
@@ -0,0 +1,312 @@
+# -*- coding: UTF-8 -*-
+"""Profiling of the values stored in the geodatabase tables fields.
+
+Values are read in batches of rows as numpy arrays and the statistics
+are computed for the whole batch at once which makes it possible to
+profile tables with millions of rows. In the approximate mode, distinct
+counts, quartiles and most frequent values are estimated with mergeable
+sketches of bounded size.
+"""
+from __future__ import division
+import numbers
+from collections import OrderedDict
+
+from registrant._lazy import numpy as np
+
+from registrant._util_mappings import (
+    GDB_TABLE_FIELD_PROPS,
+    GDB_FIELD_PROFILE_PROPS,
+    GDB_FIELD_SKETCH_PROPS,
+    PROFILE_FIELD_KINDS,
+    PROFILE_INTEGER_FIELD_TYPES,
+)
+from registrant._config import SKETCH_TOP_K_REPORTED
+from registrant._metrics import Metric, register_metric
+from registrant._sketches import (
+    HyperLogLog,
+    KllSketch,
+    FrequentItems,
+    hash_values,
+)
+
+
+# ----------------------------------------------------------------------
+def split_nulls(values):
+    """Split array of values into array of non-null values and nulls count.
+
+    Masked arrays (OGR Arrow stream), object arrays with `None` values
+    (OGR features and `arcpy` cursors), NaN floats and NaT dates are
+    supported.
+    """
+    if np.ma.isMaskedArray(values):
+        valid = values.compressed()
+        return valid, values.size - valid.size
+
+    values = np.asarray(values)
+    if values.dtype == object:
+        nulls_mask = np.equal(values, None)
+    elif values.dtype.kind == 'f':
+        nulls_mask = np.isnan(values)
+    elif values.dtype.kind == 'M':
+        nulls_mask = np.isnat(values)
+    else:
+        return values, 0
+    return values[~nulls_mask], int(np.count_nonzero(nulls_mask))
+
+
+# ----------------------------------------------------------------------
+def get_strings_lengths(values):
+    """Get number of characters of each string in array of strings."""
+    if not values.size:
+        return np.zeros(0, dtype=np.int64)
+    if isinstance(values.flat[0], bytes):
+        values = np.char.decode(values.astype(np.bytes_), 'utf-8')
+    else:
+        values = values.astype(np.str_)
+    return np.char.str_len(values)
+
+
+########################################################################
+class FieldProfile(object):
+    """Statistics of a single field values accumulated over batches of rows.
+
+    Profiles computed for separate batches (or separate chunks of a table)
+    can be combined with `merge`. When `approximate` is set, sketches
+    estimating distinct values, quartiles and most frequent values
+    are maintained as well.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, name, field_type, length=None, approximate=False):
+        """Initialize `FieldProfile` with the field properties."""
+        self.name = name
+        self.type = field_type
+        self.kind = PROFILE_FIELD_KINDS.get(field_type)
+        self.length = length
+        self.rowCount = 0
+        self.nullCount = 0
+        self.minValue = None
+        self.maxValue = None
+        self.valuesSum = 0.0
+        self.valuesCount = 0
+        self.maxLengthUsed = None
+
+        self.approximate = approximate
+        if approximate:
+            self.distinct_sketch = HyperLogLog()
+            self.frequent_sketch = FrequentItems()
+            self.quantiles_sketch = (KllSketch() if self.kind
+                                     in ('numeric', 'date') else None)
+
+    # ----------------------------------------------------------------------
+    def update(self, values):
+        """Update the profile with a batch of values."""
+        values, nulls_count = split_nulls(values)
+        self.rowCount += values.size + nulls_count
+        self.nullCount += nulls_count
+        if not values.size:
+            return
+
+        if self.kind == 'numeric':
+            values = self._get_numbers(values)
+            self.valuesSum += float(values.sum(dtype=np.float64))
+            self.valuesCount += values.size
+            self._update_range(values.min(), values.max())
+        elif self.kind == 'date':
+            values = values.astype('datetime64[s]')
+            self._update_range(values.min(), values.max())
+        elif self.kind == 'string':
+            max_length = int(get_strings_lengths(values).max())
+            self.maxLengthUsed = max(self.maxLengthUsed or 0, max_length)
+
+        if self.approximate:
+            self.distinct_sketch.update(hash_values(values))
+            self.frequent_sketch.update(values)
+            if self.quantiles_sketch is not None:
+                self.quantiles_sketch.update(
+                    values.astype(np.int64) if self.kind == 'date' else values)
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge profile of the same field computed for other rows."""
+        self.rowCount += other.rowCount
+        self.nullCount += other.nullCount
+        self.valuesSum += other.valuesSum
+        self.valuesCount += other.valuesCount
+        if other.minValue is not None:
+            self._update_range(other.minValue, other.maxValue)
+        if other.maxLengthUsed is not None:
+            self.maxLengthUsed = max(self.maxLengthUsed or 0,
+                                     other.maxLengthUsed)
+        if self.approximate:
+            self.distinct_sketch.merge(other.distinct_sketch)
+            self.frequent_sketch.merge(other.frequent_sketch)
+            if self.quantiles_sketch is not None:
+                self.quantiles_sketch.merge(other.quantiles_sketch)
+        return self
+
+    # ----------------------------------------------------------------------
+    def finalize(self):
+        """Get field profile as ordered dict ready to write into report."""
+        od = OrderedDict()
+        for k, v in GDB_FIELD_PROFILE_PROPS.items():
+            if k == 'minValue':
+                od[v] = self._format_value(self.minValue)
+            elif k == 'maxValue':
+                od[v] = self._format_value(self.maxValue)
+            elif k == 'meanValue':
+                od[v] = round(self.valuesSum / self.valuesCount,
+                              4) if self.valuesCount else ''
+            elif k == 'length':
+                od[v] = self.length if self.kind == 'string' else ''
+            elif k == 'maxLengthUsed':
+                od[v] = (self.maxLengthUsed
+                         if self.maxLengthUsed is not None else '')
+            elif k == 'lengthUsedRatio':
+                if self.maxLengthUsed is not None and self.length:
+                    od[v] = round(self.maxLengthUsed / self.length * 100, 1)
+                else:
+                    od[v] = ''
+            else:
+                od[v] = getattr(self, k, '')
+
+        if self.approximate:
+            for k, v in GDB_FIELD_SKETCH_PROPS.items():
+                od[v] = getattr(self, '_get_{0}'.format(k))()
+        return od
+
+    # ----------------------------------------------------------------------
+    def _get_distinctCount(self):
+        """Get estimated number of distinct values with its error bound."""
+        if not self.rowCount - self.nullCount:
+            return ''
+        return u'{0} (\u00b1{1:.1%})'.format(
+            self.distinct_sketch.estimate(),
+            self.distinct_sketch.relative_error)
+
+    # ----------------------------------------------------------------------
+    def _get_quartiles(self):
+        """Get estimated quartiles with the rank error bound."""
+        if self.quantiles_sketch is None or not self.quantiles_sketch.count:
+            return ''
+        quartiles = self.quantiles_sketch.quantiles([0.25, 0.5, 0.75])
+        if self.kind == 'date':
+            quartiles = [
+                np.datetime64(int(value), 's') for value in quartiles
+            ]
+        return u'{0} (rank \u00b1{1:.1%})'.format(
+            ' / '.join(
+                str(self._format_value(value)) for value in quartiles),
+            self.quantiles_sketch.rank_error)
+
+    # ----------------------------------------------------------------------
+    def _get_topValues(self):
+        """Get most frequent values with the counts error bound."""
+        top_values = self.frequent_sketch.top(SKETCH_TOP_K_REPORTED)
+        if not top_values:
+            return ''
+        values = ', '.join(
+            u'{0}: {1}'.format(
+                value.decode('utf-8', 'replace')
+                if isinstance(value, bytes) else self._format_value(value),
+                count) for value, count in top_values)
+        if self.frequent_sketch.max_error:
+            return u'{0} (counts +0..{1})'.format(
+                values, self.frequent_sketch.max_error)
+        return values
+
+    # ----------------------------------------------------------------------
+    def _get_numbers(self, values):
+        """Get array of numbers keeping integers of integer fields exact."""
+        if (self.type in PROFILE_INTEGER_FIELD_TYPES
+                or values.dtype.kind in 'iu'):
+            return values.astype(np.int64)
+        return values.astype(np.float64)
+
+    # ----------------------------------------------------------------------
+    def _update_range(self, min_value, max_value):
+        """Update the minimum and maximum values seen so far."""
+        if self.minValue is None or min_value < self.minValue:
+            self.minValue = min_value
+        if self.maxValue is None or max_value > self.maxValue:
+            self.maxValue = max_value
+
+    # ----------------------------------------------------------------------
+    def _format_value(self, value):
+        """Format minimum or maximum value for the report."""
+        if value is None:
+            return ''
+        if self.kind == 'date':
+            return str(value).replace('T', ' ')
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        value = float(value)
+        return int(value) if value.is_integer() else value
+
+
+# ----------------------------------------------------------------------
+def get_profiled_fields(fields):
+    """Get fields properties of fields which values can be profiled."""
+    type_column = GDB_TABLE_FIELD_PROPS['type']
+    return [
+        field for field in fields
+        if PROFILE_FIELD_KINDS.get(field[type_column])
+    ]
+
+
+########################################################################
+class FieldsProfileMetric(Metric):
+    """Profiles of all the fields of a dataset which values can be profiled."""
+
+    name = 'profile'
+    title = 'Profile'
+    approximate = False
+
+    # ----------------------------------------------------------------------
+    def __init__(self, fields, dataset_props):
+        """Initialize `FieldsProfileMetric` creating profile of each field."""
+        Metric.__init__(self, fields, dataset_props)
+        self.profiles = OrderedDict()
+        for field in get_profiled_fields(fields):
+            name = field[GDB_TABLE_FIELD_PROPS['name']]
+            self.profiles[name] = FieldProfile(
+                name,
+                field[GDB_TABLE_FIELD_PROPS['type']],
+                field[GDB_TABLE_FIELD_PROPS['length']],
+                self.approximate,
+            )
+
+    # ----------------------------------------------------------------------
+    def get_columns(self):
+        """Get names of the profiled fields."""
+        return list(self.profiles.keys())
+
+    # ----------------------------------------------------------------------
+    def update(self, batch):
+        """Update the fields profiles with a batch of rows."""
+        for column, values in batch.items():
+            self.profiles[column].update(values)
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge profiles of the same fields computed for other rows."""
+        for name, profile in self.profiles.items():
+            profile.merge(other.profiles[name])
+        return self
+
+    # ----------------------------------------------------------------------
+    def finalize(self):
+        """Get fields profiles as ordered dicts ready to write into report."""
+        return [profile.finalize() for profile in self.profiles.values()]
+
+
+########################################################################
+class ApproximateFieldsProfileMetric(FieldsProfileMetric):
+    """Fields profiles with the values estimated with sketches."""
+
+    name = 'profile_approximate'
+    approximate = True
+
+
+register_metric(FieldsProfileMetric)
+register_metric(ApproximateFieldsProfileMetric)
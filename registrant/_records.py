@@ -0,0 +1,165 @@
+# -*- coding: UTF-8 -*-
+"""Compact records of the geodatabase objects properties.
+
+Records store the values of properties in slots named after the
+properties (`arcpy.Describe` names) instead of dicts keyed by the human
+readable column labels, so no per record dict is created and the labels
+are kept once per record class. Records are read only mappings of labels
+to values (with item assignment), so they are used in the same way as
+ordered dicts, including building the tables of sections when rendering.
+Properties which are never set are not part of the mapping.
+"""
+from collections import OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from registrant._util_mappings import (
+    GDB_TABLE_PROPS,
+    GDB_TABLE_FIELD_PROPS,
+    GDB_TABLE_INDEX_PROPS,
+    GDB_TABLE_SUBTYPE_PROPS,
+    GDB_FC_PROPS,
+)
+
+# properties added to tables and feature classes props by the reporter
+_DATASET_EXTRA_PROPS = [
+    ('rowCount', 'Row count'),
+    ('attachmentsEnabled', 'Attachments enabled'),
+    ('attachmentsCount', 'Attachments count'),
+]
+
+
+# ----------------------------------------------------------------------
+def _record_class(cls):
+    """Map the labels of a record class to its slots.
+
+    Used as a class decorator.
+    """
+    cls.attrs = {label: attr for attr, label in cls.labels.items()}
+    return cls
+
+
+########################################################################
+class Record(Mapping):
+    """Base class of records; subclasses define `labels` and `__slots__`."""
+
+    __slots__ = ()
+    # property name and its label in the order of the report columns
+    labels = OrderedDict()
+    attrs = {}
+
+    # ----------------------------------------------------------------------
+    def __init__(self, **values):
+        """Initialize record with the values of properties by name."""
+        for attr, value in values.items():
+            setattr(self, attr, value)
+
+    # ----------------------------------------------------------------------
+    def __getitem__(self, label):
+        """Get value of property by its label."""
+        try:
+            return getattr(self, self.attrs[label])
+        except AttributeError:
+            raise KeyError(label)
+
+    # ----------------------------------------------------------------------
+    def __setitem__(self, label, value):
+        """Set value of property by its label."""
+        setattr(self, self.attrs[label], value)
+
+    # ----------------------------------------------------------------------
+    def __iter__(self):
+        """Iterate over labels of the properties set."""
+        return (label for attr, label in self.labels.items()
+                if hasattr(self, attr))
+
+    # ----------------------------------------------------------------------
+    def items(self):
+        """Get (label, value) pairs of the properties set.
+
+        Read from the slots directly since records are iterated for
+        every section rendered.
+        """
+        return [(label, getattr(self, attr))
+                for attr, label in self.labels.items() if hasattr(self, attr)]
+
+    # ----------------------------------------------------------------------
+    def __len__(self):
+        """Get number of the properties set."""
+        return sum(1 for _label in self)
+
+    # ----------------------------------------------------------------------
+    def __getstate__(self):
+        """Get values of the properties set for pickling."""
+        return {
+            attr: getattr(self, attr)
+            for attr in self.labels if hasattr(self, attr)
+        }
+
+    # ----------------------------------------------------------------------
+    def __setstate__(self, state):
+        """Restore values of the properties when unpickling."""
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    # ----------------------------------------------------------------------
+    def __repr__(self):
+        """Get representation with the properties set."""
+        return '{0}({1})'.format(
+            self.__class__.__name__, ', '.join(
+                '{0}={1!r}'.format(attr, value)
+                for attr, value in self.__getstate__().items()))
+
+
+########################################################################
+@_record_class
+class FieldRecord(Record):
+    """Properties of a field of a table or feature class."""
+
+    labels = OrderedDict([('uiOrder', 'UI order')]
+                         + list(GDB_TABLE_FIELD_PROPS.items()))
+    __slots__ = tuple(labels.keys())
+
+
+########################################################################
+@_record_class
+class IndexRecord(Record):
+    """Properties of an attribute index."""
+
+    labels = OrderedDict(GDB_TABLE_INDEX_PROPS)
+    __slots__ = tuple(labels.keys())
+
+
+########################################################################
+@_record_class
+class SubtypeRecord(Record):
+    """Properties of a subtype."""
+
+    labels = OrderedDict([('Code', 'Code')]
+                         + list(GDB_TABLE_SUBTYPE_PROPS.items()))
+    __slots__ = tuple(labels.keys())
+
+
+########################################################################
+@_record_class
+class TableRecord(Record):
+    """Properties of a table."""
+
+    labels = OrderedDict(
+        list(GDB_TABLE_PROPS.items()) + _DATASET_EXTRA_PROPS)
+    __slots__ = tuple(labels.keys())
+
+
+########################################################################
+@_record_class
+class FeatureClassRecord(Record):
+    """Properties of a feature class."""
+
+    # the feature dataset is set only for arcpy and goes after the name
+    labels = OrderedDict(
+        list(GDB_FC_PROPS.items())[:1]
+        + [('featureDataset', 'Feature dataset')]
+        + list(GDB_FC_PROPS.items())[1:] + _DATASET_EXTRA_PROPS)
+    __slots__ = tuple(labels.keys())
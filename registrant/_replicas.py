@@ -0,0 +1,163 @@
+# -*- coding: UTF-8 -*-
+"""Replica schemas exported with the geoprocessing tool.
+
+The creation date and the datasets of a replica are found only in its
+schema exported into an .xml file with `ExportReplicaSchema_management`,
+which is the slowest read of the replicas section. The schemas of all
+replicas are exported at once by a pool of worker processes, as
+geoprocessing tools are not thread-safe, each into a folder of its own,
+and every file is parsed as it is read keeping only the elements
+needed. A replica whose schema cannot be exported is still reported.
+The schemas of replicas of enterprise geodatabases are cached along
+with the dates of the last data changes sent and received, so a replica
+is exported again only after it is synchronized.
+"""
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+import multiprocessing
+
+from xml.etree import ElementTree
+
+from registrant._lazy import arcpy
+from registrant._config import REPLICA_SCHEMA_EXPORT_WORKERS
+
+# schemas keyed by (geodatabase path, replica name, last send date,
+# last receive date)
+_SCHEMAS = {}
+
+
+########################################################################
+class ReplicaSchema(object):
+    """Properties of replica read from its schema."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, creation_date, datasets):
+        """Initialize `ReplicaSchema` with the properties.
+
+        creation_date: str:
+            date and time the replica was created at
+
+        datasets: list:
+            pairs of names of the replicated datasets and their targets
+            sorted by the dataset name
+        """
+        self.creation_date = creation_date
+        self.datasets = datasets
+        return
+
+
+# ----------------------------------------------------------------------
+def parse_replica_schema(source):
+    """Parse replica schema from .xml file or file object.
+
+    Only the creation date and the datasets of the replica are kept;
+    other elements are cleared as soon as they are read.
+    """
+    creation_date = None
+    datasets = []
+    path = []
+    for event, element in ElementTree.iterparse(source,
+                                                events=('start', 'end')):
+        if event == 'start':
+            path.append(element.tag)
+            continue
+        path.pop()
+        if element.tag == 'CreationDate' and path[-1:] == ['GPReplica']:
+            creation_date = (element.text or '').replace('T', ' ')
+        elif (element.tag == 'GPReplicaDataset'
+              and path[-1:] == ['GPReplicaDatasets']):
+            datasets.append((element.findtext('DatasetName'),
+                             element.findtext('TargetName')))
+        if element.tag != 'DatasetName' and element.tag != 'TargetName':
+            element.clear()
+    datasets.sort(key=lambda pair: pair[0].lower())
+    return ReplicaSchema(creation_date, datasets)
+
+
+# ----------------------------------------------------------------------
+def export_replica_schema(gdb_path, replica_name):
+    """Export replica schema and parse it.
+
+    The schema is exported into a temporary folder of its own removed
+    once it is parsed, so exports run at once never share a file.
+    """
+    temp_folder = tempfile.mkdtemp(prefix='registrant_')
+    try:
+        replica_schema_xml = os.path.join(temp_folder, 'ReplicaSchema.xml')
+        arcpy.ExportReplicaSchema_management(
+            in_geodatabase=gdb_path,
+            output_replica_schema_file=replica_schema_xml,
+            in_replica=replica_name,
+        )
+        return parse_replica_schema(replica_schema_xml)
+    finally:
+        shutil.rmtree(temp_folder, ignore_errors=True)
+
+
+# ----------------------------------------------------------------------
+def _export_replica_schema_task(task):
+    """Export schema of a single replica catching the errors.
+
+    Run in a worker process importing arcpy of its own or in the
+    current process; return the schema and the error message, one of
+    which is `None`.
+    """
+    gdb_path, replica_name = task
+    try:
+        return export_replica_schema(gdb_path, replica_name), None
+    except Exception as e:
+        return None, str(e)
+
+
+# ----------------------------------------------------------------------
+def iter_replica_schemas(gdb_path, replicas, workers=None):
+    """Yield schemas of replicas in the order of the replicas.
+
+    A schema which could not be exported is yielded as `None`, so the
+    replica is still reported.
+
+    replicas: list:
+        pairs of replica names and their generations; the generation
+        is a hashable value changed when the replica is synchronized
+        (the dates of the last send and receive) or `None` if not
+        known, in which case the schema is always exported
+
+    workers: int:
+        number of worker processes exporting schemas at once;
+        `REPLICA_SCHEMA_EXPORT_WORKERS` by default; with a single
+        worker the schemas are exported in the current process
+    """
+    replicas = list(replicas)
+    schemas = [None] * len(replicas)
+    tasks = []
+    for index, (name, generation) in enumerate(replicas):
+        if generation is not None:
+            schemas[index] = _SCHEMAS.get((gdb_path, name, generation))
+        if schemas[index] is None:
+            tasks.append((gdb_path, name))
+
+    workers = min(workers or REPLICA_SCHEMA_EXPORT_WORKERS, len(tasks))
+    # geoprocessing tools are not thread-safe, so the schemas are
+    # exported by processes each running arcpy of its own
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        if pool is None:
+            results = (_export_replica_schema_task(task) for task in tasks)
+        else:
+            results = pool.imap(_export_replica_schema_task, tasks)
+        for index, schema in enumerate(schemas):
+            if schema is None:
+                name, generation = replicas[index]
+                schema, error = next(results)
+                if error is not None:
+                    print('Error. Could not export schema of replica', name,
+                          '. Reason: ', error)
+                elif generation is not None:
+                    _SCHEMAS[(gdb_path, name, generation)] = schema
+            yield schema
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
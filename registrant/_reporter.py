@@ -5,31 +5,59 @@ The main module to work with the report.
 It can instantiate `Geodatabase` class, read its objects,
 and their properties and build an HTML report file.
 """
+from __future__ import print_function
 import os
+import struct
+import errno
+import atexit
 import shutil
 import datetime
-import pkgutil
-import pandas as pd
+import tempfile
+from collections import OrderedDict
 from registrant import _util_mappings as utils
 from registrant import _geodatabase
 from registrant import _build_html
-
-from registrant._data_objects import (
-    Table,
-    TableOgr,
-    FeatureClass,
-    FeatureClassOgr,
-)
+from registrant import _metrics
+from registrant import _profiling
+from registrant import _geometry
+from registrant import _domains
+from registrant import _attachments
+from registrant import _fgdb_storage
+from registrant import _spatial_index
+from registrant import _findings
+from registrant import _snapshot
+from registrant import _history
+from registrant import _plan
+from registrant import _session
+
+from registrant._sections import Section
 from registrant._config import (
     REPORT_DATA_FOLDER_PATH,
     REPORT_FILE_NAME,
-    OGR_GDB_SUPPORT_MESSAGE,
+    REPORT_PUBLISH_ATTEMPTS,
     DATASET_TYPE_FC,
     DATASET_TYPE_TABLE,
+    OPERATION_SUBTYPES,
+    OPERATION_INDEXES,
+    HISTORY_ROW_COUNT_THRESHOLD,
+    HISTORY_SIZE_THRESHOLD,
 )
 
-pd.set_option('display.max_rows', 20)  # noqa: Z432
-pd.set_option('display.width', 250)  # noqa: Z432
+# staging folders of the reporters not closed yet
+_STAGING_ROOTS = set()
+
+
+# ----------------------------------------------------------------------
+def _remove_staging_roots():
+    """Remove staging folders of the reporters not closed."""
+    for staging_root in list(_STAGING_ROOTS):
+        shutil.rmtree(staging_root, ignore_errors=True)
+    return
+
+
+# a single handler for all reporters, so that no handler is left behind
+# by every reporter of a long-running process
+atexit.register(_remove_staging_roots)
 
 
 ########################################################################
@@ -37,7 +65,13 @@ class Reporter(object):
     """Reporter of geodatabase properties capable of creating .html reports."""
 
     # ----------------------------------------------------------------------
-    def __init__(self, gdb_path, out_report_folder_path):
+    def __init__(self,
+                 gdb_path,
+                 out_report_folder_path,
+                 backends=None,
+                 ogr_driver=None,
+                 session=None,
+                 feature_dataset=None):
         """Initialize reporter with basic properties.
 
         gdb_path: str:
@@ -46,16 +80,47 @@ class Reporter(object):
         out_report_folder_path: str:
             path to the folder where HTML report file along with
             the template and styling files folder will be created
+
+        backends: str, list or dict:
+            backends to read the geodatabase with (`arcpy`, `ogr`, `fgdb`);
+            a name or a list of names in the order of preference for all
+            operations or a dict of operation names and such lists. By
+            default, every operation uses the fastest backend available
+
+        ogr_driver: str:
+            OGR driver to open file geodatabase with (`OpenFileGDB` or
+            `FileGDB`) when it is read with `ogr`; by default, the first
+            driver available in `OGR_DRIVERS_PREFERENCES` is used
+
+        session: ReportSession:
+            session of the geodatabase to share the geodatabase opened
+            and the properties read with other reports of it (see
+            `ReportSession.create_reporter`); the backends and the OGR
+            driver of the session are used. The session must be of the
+            same geodatabase
+
+        feature_dataset: str:
+            name of the feature dataset to report only the feature
+            classes of (along with their attachments and findings); the
+            sections of the geodatabase as a whole (domains, versions,
+            replicas, relationship classes and storage) are reported in
+            full. All datasets are reported by default
         """
         self.gdb_path = gdb_path
-        arcpy_loader = pkgutil.find_loader('arcpy')
-        if arcpy_loader:
-            self.arcpy_found = True
-        else:
-            self.arcpy_found = False
-
-        if not self.arcpy_found and not gdb_path.endswith('.gdb'):
-            raise ValueError(OGR_GDB_SUPPORT_MESSAGE)
+        if session is None:
+            session = _session.ReportSession(gdb_path, backends, ogr_driver)
+        elif (os.path.normcase(os.path.abspath(gdb_path))
+              != os.path.normcase(os.path.abspath(session.gdb_path))):
+            raise ValueError(
+                'Session is of another geodatabase: {0}'.format(
+                    session.gdb_path))
+        self.session = session
+
+        # names of the datasets reported; `None` for all datasets
+        self._datasets_filter = None
+        if feature_dataset is not None:
+            self._datasets_filter = self._get_feature_dataset_names(
+                feature_dataset)
 
         self._out_report_folder = os.path.join(
             out_report_folder_path,
@@ -63,26 +128,52 @@ class Reporter(object):
             os.path.basename(REPORT_DATA_FOLDER_PATH),
         )
 
-        if not os.path.exists(out_report_folder_path):
-            os.mkdir(out_report_folder_path)
-        else:
-            if os.path.exists(self._out_report_folder):
-                shutil.rmtree(self._out_report_folder)
+        try:
+            os.makedirs(os.path.dirname(self._out_report_folder))
+        except OSError as e:
+            # the folder may be created by another report run at once
+            if e.errno != errno.EEXIST:
+                raise
 
-        shutil.copytree(REPORT_DATA_FOLDER_PATH, self._out_report_folder)
+        # the report is written into a staging folder of this run and
+        # published into the output folder when it is complete, so
+        # reports of other runs are neither seen incomplete nor removed
+        # while they are written (see `_publish_report`)
+        self._stage_report()
 
-        # path to .html file report that will be updated by this class methods
+        # path to .html file report once it is published
         self.report_file_path = os.path.join(self._out_report_folder,
                                              REPORT_FILE_NAME)
 
-        self.gdb = _geodatabase.Geodatabase(gdb_path)
+        self._backends = session.backends
+        self._ogr_driver = session.ogr_driver
+        self.gdb = session.gdb
+        self.arcpy_found = self.gdb.arcpy_found
+
+        # fields of datasets keyed by (dataset name, dataset type); filled
+        # once and shared between the domains and the datasets sections
+        # and between the reports of the session
+        self._datasets_fields = session.datasets_fields
+        # indexes of datasets keyed by (dataset name, dataset type); read
+        # once for the datasets sections, the findings and the snapshot
+        self._datasets_indexes = session.datasets_indexes
+        # properties of datasets keyed by dataset type along with the
+        # labels of the properties read (`None` for all of them), labels
+        # planned to be read for the report and results of the metrics
+        # keyed by (dataset name, dataset type); reused by the findings
+        self._datasets_props = session.datasets_props
+        self._datasets_columns = {}
+        self._datasets_metrics = {}
+        self._spatial_indexes = None
+        # fingerprint of fields and the first dataset reported with them
+        self._fields_fingerprints = {}
 
         self._write_timestamp()
         self._cleanup_report_folder()
 
         # general gdb properties
-        self._gdb_info = pd.DataFrame.from_records(
-            self.gdb.get_pretty_props(), index=[0])
+        self._gdb_info = session.get_section(
+            'overview', lambda: [self.gdb.get_pretty_props()])
         return
 
     # ----------------------------------------------------------------------
@@ -92,6 +183,7 @@ class Reporter(object):
             do_report_replicas=True,
             do_report_domains=True,
             do_report_domains_coded_values=True,
+            do_report_domains_usage_counts=False,
             do_report_relclasses=True,
             do_report_tables=True,
             do_report_tables_fields=True,
@@ -101,47 +193,200 @@ class Reporter(object):
             do_report_fcs_fields=True,
             do_report_fcs_subtypes=True,
             do_report_fcs_indexes=True,
+            dedup_fields=False,
+            do_report_tables_profile=False,
+            do_report_fcs_profile=False,
+            profile_approximate=False,
+            do_report_fcs_geometry_stats=False,
+            do_report_attachments=False,
+            do_report_storage=False,
+            do_report_spatial_indexes=False,
+            do_report_findings=False,
+            history_path=None,
+            growth_row_count_threshold=HISTORY_ROW_COUNT_THRESHOLD,
+            growth_size_threshold=HISTORY_SIZE_THRESHOLD,
+            scan_workers=1,
+            metrics=None,
+            columns=None,
     ):
         r"""Report geodatabase properties as an HTML file.
 
         do_report_%obj%: bool:
             what type of information should be reported
-        """
-        self._report_overview()
 
-        if do_report_versions:
-            self._report_versions()
-
-        if do_report_replicas:
-            self._report_replicas()
-
-        if do_report_domains | do_report_domains_coded_values:
-            self._report_domains(do_report_domains,
-                                 do_report_domains_coded_values)
-
-        if do_report_relclasses:
-            self._report_relclasses()
-
-        if (do_report_tables | do_report_tables_fields
-                | do_report_tables_subtypes
-                | do_report_tables_indexes):
-            self._report_tables(
-                do_report_tables,
-                do_report_tables_fields,
-                do_report_tables_subtypes,
-                do_report_tables_indexes,
-            )
-
-        if (do_report_fcs | do_report_fcs_fields | do_report_fcs_subtypes
-                | do_report_fcs_indexes):
-            self._report_fcs(
-                do_report_fcs,
-                do_report_fcs_fields,
-                do_report_fcs_subtypes,
-                do_report_fcs_indexes,
-            )
+        dedup_fields: bool:
+            whether the fields of datasets with exactly the same fields
+            as a dataset already reported (such as yearly archives or
+            regional copies of a table) should be replaced with a link
+            to the fields of that dataset to keep the report smaller
+
+        do_report_domains_usage_counts: bool:
+            whether the coded values of domains should be reported along
+            with number of rows having each code in every field using
+            the domain, including unused codes and values which are not
+            valid codes; this requires reading the values of the fields
+
+        do_report_%obj%_profile: bool:
+            whether the values of the fields should be read to report
+            null counts, value ranges and string lengths used; this
+            requires a full scan of every dataset and is off by default
+
+        profile_approximate: bool:
+            whether the profile should include distinct values count,
+            quartiles and most frequent values estimated with sketches
+            of bounded size along with their error bounds
+
+        do_report_fcs_geometry_stats: bool:
+            whether the geometries of feature classes should be read to
+            report their extent, vertices and parts counts and sizes
+
+        do_report_attachments: bool:
+            whether the attachment tables should be reported with number
+            of attachments, their total and average size and the largest
+            attachments of every dataset; only the sizes are read
+
+        do_report_storage: bool:
+            whether the size on disk of every table of a file geodatabase
+            should be reported along with the number of deleted rows to
+            find the tables that should be compacted; only the headers of
+            the files are read
+
+        do_report_spatial_indexes: bool:
+            whether the spatial indexes grid sizes of feature classes of
+            a file geodatabase should be compared with the extent and the
+            average size of features to find poorly configured indexes;
+            features sizes are known when geometry stats are reported
+
+        do_report_findings: bool:
+            whether the schema issues slowing down queries and edits
+            should be reported (such as feature classes without spatial
+            index or relationship keys without attribute index); the
+            section is placed right after the overview
+
+        history_path: str:
+            path to a SQLite file keeping the row count, size on disk (of
+            file geodatabases) and number of fields of every dataset seen
+            by every run; when given, this run is appended to the file and
+            a growth section is reported with the growth per day and the
+            date every dataset is projected to reach the thresholds
+
+        growth_row_count_threshold: int:
+            row count of a dataset to project the date it is reached
+
+        growth_size_threshold: int:
+            size of a dataset in bytes to project the date it is reached
+
+        scan_workers: int:
+            number of processes reading ranges of rows of a dataset in
+            parallel when values are read; when run in a script, the
+            report should be created under `if __name__ == '__main__':`
+            because of the way worker processes are started on Windows
+
+        metrics: list:
+            names of registered metrics (or `Metric` subclasses) to compute
+            for every table and feature class; they are computed in the
+            same single scan of a dataset as the profile
+
+        columns: list:
+            labels of the columns of the tables and feature classes
+            sections to report (such as `['Name', 'Row count']`); the
+            name is always reported. The datasets are not described when
+            only the names and row counts are reported. All columns are
+            reported by default
+
+        The flags are compiled into a plan (see `_plan.make_plan`) so only
+        the properties the sections requested need are read; for instance,
+        the datasets are neither described nor counted when only their
+        fields are reported.
+        """
+        if do_report_fcs_geometry_stats:
+            metrics = list(metrics or []) + [
+                _geometry.GeometryStatsMetric.name
+            ]
+        tables_metrics = self._get_metrics_classes(
+            DATASET_TYPE_TABLE, do_report_tables_profile, profile_approximate,
+            metrics)
+        fcs_metrics = self._get_metrics_classes(
+            DATASET_TYPE_FC, do_report_fcs_profile, profile_approximate,
+            metrics)
+
+        plan = _plan.make_plan(
+            do_report_versions=do_report_versions,
+            do_report_replicas=do_report_replicas,
+            do_report_domains=do_report_domains,
+            do_report_domains_coded_values=do_report_domains_coded_values,
+            do_report_domains_usage_counts=do_report_domains_usage_counts,
+            do_report_relclasses=do_report_relclasses,
+            do_report_tables=do_report_tables,
+            do_report_tables_fields=do_report_tables_fields,
+            do_report_tables_subtypes=do_report_tables_subtypes,
+            do_report_tables_indexes=do_report_tables_indexes,
+            do_report_fcs=do_report_fcs,
+            do_report_fcs_fields=do_report_fcs_fields,
+            do_report_fcs_subtypes=do_report_fcs_subtypes,
+            do_report_fcs_indexes=do_report_fcs_indexes,
+            do_report_attachments=do_report_attachments,
+            do_report_storage=do_report_storage,
+            do_report_spatial_indexes=do_report_spatial_indexes,
+            do_report_growth=bool(history_path),
+            do_report_findings=do_report_findings,
+            tables_metrics=tables_metrics,
+            fcs_metrics=fcs_metrics,
+            columns=columns,
+        )
+        # properties of datasets read for one section are read along
+        # with the ones the other sections need
+        self._datasets_columns = plan.datasets_columns
+
+        for section in plan.sections:
+            if section == 'overview':
+                self._report_overview()
+            elif section == 'versions':
+                self._report_versions()
+            elif section == 'replicas':
+                self._report_replicas()
+            elif section == 'domains':
+                self._report_domains(do_report_domains,
+                                     do_report_domains_coded_values,
+                                     do_report_domains_usage_counts)
+            elif section == 'relclasses':
+                self._report_relclasses()
+            elif section == 'tables':
+                self._report_tables(
+                    do_report_tables,
+                    do_report_tables_fields,
+                    do_report_tables_subtypes,
+                    do_report_tables_indexes,
+                    tables_metrics,
+                    scan_workers,
+                    dedup_fields,
+                    plan.columns,
+                )
+            elif section == 'fcs':
+                self._report_fcs(
+                    do_report_fcs,
+                    do_report_fcs_fields,
+                    do_report_fcs_subtypes,
+                    do_report_fcs_indexes,
+                    fcs_metrics,
+                    scan_workers,
+                    dedup_fields,
+                    plan.columns,
+                )
+            elif section == 'attachments':
+                self._report_attachments(scan_workers)
+            elif section == 'storage':
+                self._report_storage()
+            elif section == 'spatialindexes':
+                self._report_spatial_indexes()
+            elif section == 'growth':
+                self._report_growth(history_path, growth_row_count_threshold,
+                                    growth_size_threshold)
+            elif section == 'findings':
+                self._report_findings()
 
         self._write_license_text()
+        self._publish_report()
         return
 
     # ----------------------------------------------------------------------
@@ -160,6 +405,7 @@ class Reporter(object):
             do_report_fcs_fields=False,
             do_report_fcs_subtypes=False,
             do_report_fcs_indexes=False,
+            do_report_domains_usage_counts=False,
     ):
         """Report geodatabase domains properties only."""
         self.gdb2html(
@@ -167,6 +413,7 @@ class Reporter(object):
             do_report_replicas=False,
             do_report_domains=True,
             do_report_domains_coded_values=True,
+            do_report_domains_usage_counts=do_report_domains_usage_counts,
             do_report_relclasses=False,
             do_report_tables=False,
             do_report_tables_fields=False,
@@ -246,6 +493,168 @@ class Reporter(object):
             do_report_fcs_indexes=True,
         )
 
+    # ----------------------------------------------------------------------
+    def get_schema_snapshot(self, gdb_path=None):
+        """Get snapshot of the geodatabase schema with fingerprints.
+
+        The snapshot holds the properties, fields, indexes and subtypes of
+        the datasets, the domains and the relationship classes; indexes
+        and subtypes are read only with arcpy. Properties read for
+        the report sections are reused. Only the datasets reported are
+        included when the reporter reports a feature dataset. A dataset
+        whose properties are not found by its catalog name is reported
+        with a message and kept with no properties.
+
+        gdb_path: str:
+            path to another geodatabase to take the snapshot of (such as
+            a replica of this geodatabase); nothing is cached for it
+        """
+        if gdb_path is None:
+            gdb = self.gdb
+            datasets_names = self._get_datasets_names
+            datasets_props = self._get_datasets_props
+            fields_props = self._get_dataset_fields_props
+            indexes_props = self._get_dataset_indexes_props
+        else:
+            gdb = _geodatabase.Geodatabase(gdb_path, self._backends,
+                                           self._ogr_driver)
+            datasets_names = gdb.get_datasets_names
+            datasets_props = {
+                DATASET_TYPE_TABLE: gdb.get_tables(),
+                DATASET_TYPE_FC: gdb.get_feature_classes(),
+            }.get
+
+            def fields_props(dataset_name, dataset_type):
+                """Get fields properties of dataset of another geodatabase."""
+                return gdb.get_fields(dataset_name, dataset_type)
+
+            def indexes_props(dataset_name, dataset_type):
+                """Get indexes of dataset of another geodatabase."""
+                return gdb.get_indexes(dataset_name, dataset_type)
+
+        # properties of datasets keyed by (dataset name, dataset type)
+        datasets_props_by_name = {
+            (props['Name'], dataset_type): props
+            for dataset_type in (DATASET_TYPE_TABLE, DATASET_TYPE_FC)
+            for props in datasets_props(dataset_type)
+        }
+        datasets = []
+        for dataset_name, dataset_type in datasets_names():
+            props = datasets_props_by_name.get((dataset_name, dataset_type))
+            if props is None:
+                # a dataset which could not be described or whose name
+                # differs from its name in the catalog
+                print('Error. Could not find properties of dataset',
+                      dataset_name, '. Reason: ',
+                      'no dataset of this name was described')
+                props = {}
+            indexes = subtypes = None
+            if gdb.supports(OPERATION_INDEXES):
+                indexes = indexes_props(dataset_name, dataset_type)
+            if gdb.supports(OPERATION_SUBTYPES):
+                subtypes = gdb.get_subtypes(dataset_name, dataset_type)
+            datasets.append(
+                _snapshot.make_dataset_record(
+                    dataset_name, dataset_type, props,
+                    fields_props(dataset_name, dataset_type), indexes,
+                    subtypes))
+
+        return _snapshot.make_snapshot(
+            os.path.basename(gdb.path), datasets, gdb.get_domains(),
+            gdb.get_relationship_classes())
+
+    # ----------------------------------------------------------------------
+    def snapshot2json(self, out_snapshot_path):
+        """Save snapshot of the geodatabase schema to a JSON file.
+
+        The file can be compared later with another geodatabase or with
+        the same geodatabase after its schema has changed with `diff2html`.
+        Return the snapshot.
+        """
+        snapshot = self.get_schema_snapshot()
+        _snapshot.save_snapshot(snapshot, out_snapshot_path)
+        return snapshot
+
+    # ----------------------------------------------------------------------
+    def diff2html(self, baseline_snapshot):
+        """Report changes of the schema compared to a baseline snapshot.
+
+        baseline_snapshot: str | dict:
+            path to the JSON file saved with `snapshot2json` or the
+            snapshot itself; for instance, of the production copy of
+            the geodatabase when this one is the development copy
+
+        Only the datasets with different fingerprints are compared field
+        by field. Return list of changes.
+        """
+        if not isinstance(baseline_snapshot, dict):
+            baseline_snapshot = _snapshot.load_snapshot(baseline_snapshot)
+        changes = _snapshot.diff_snapshots(baseline_snapshot,
+                                           self.get_schema_snapshot())
+
+        self._report_overview()
+        if changes:
+            section = Section.from_records(changes)
+        else:
+            section = Section.from_records([
+                _snapshot.make_change('', '', '', 'No changes')
+            ])
+        _build_html.add_div_to_html_page(
+            section,
+            section_header_id='changes',
+            section_title='Schema changes since {0} ({1})'.format(
+                baseline_snapshot['geodatabase'],
+                baseline_snapshot['created']),
+            report_path=self._staging_file_path)
+        self._write_license_text()
+        self._publish_report()
+        return changes
+
+    # ----------------------------------------------------------------------
+    def compare2html(self, geodatabases):
+        """Report geodatabases deviating from the schema of the majority.
+
+        geodatabases: list:
+            paths to geodatabases (for instance, replicas which should
+            share the schema of this geodatabase), paths to JSON files
+            saved with `snapshot2json` or snapshots themselves
+
+        This geodatabase is compared along with the listed ones. Every
+        dataset, domain and relationship class is fingerprinted and
+        identical fingerprints are grouped, so only the geodatabases
+        deviating from the majority are reported, for the objects that
+        differ. Return tuple of list of geodatabases with their schema
+        fingerprints and list of outliers.
+        """
+        snapshots = OrderedDict([(self.gdb.path, self.get_schema_snapshot())])
+        for geodatabase in geodatabases:
+            if isinstance(geodatabase, dict):
+                label, snapshot = geodatabase['geodatabase'], geodatabase
+            elif geodatabase.lower().endswith('.json'):
+                label = geodatabase
+                snapshot = _snapshot.load_snapshot(geodatabase)
+            else:
+                label = geodatabase
+                snapshot = self.get_schema_snapshot(geodatabase)
+            snapshots[label] = snapshot
+        clusters, outliers = _snapshot.cluster_snapshots(snapshots)
+
+        self._report_overview()
+        _build_html.add_div_to_html_page(
+            Section.from_records(clusters),
+            section_header_id='schemas',
+            section_title='Geodatabases schemas',
+            report_path=self._staging_file_path)
+        if outliers:
+            _build_html.add_div_to_html_page(
+                Section.from_records(outliers),
+                section_header_id='outliers',
+                section_title='Schema outliers',
+                report_path=self._staging_file_path)
+        self._write_license_text()
+        self._publish_report()
+        return clusters, outliers
+
     # ----------------------------------------------------------------------
     def _cleanup_report_folder(self):
         """Remove files that do not belong to the output report folder.
@@ -255,31 +664,116 @@ class Reporter(object):
         """
         for file_name in ['__init__.py', '__init__.pyc']:
             file_path = os.path.join(
-                os.path.join(self._out_report_folder, file_name))
+                os.path.join(self._staging_folder, file_name))
             if os.path.exists(file_path):
                 os.remove(file_path)
         return
 
+    # ----------------------------------------------------------------------
+    def _stage_report(self):
+        """Create the staging folder of this run from the report template.
+
+        The staging folder is created next to the output folder with
+        a name unique to this run and is kept while the reporter exists,
+        so the sections reported by this reporter one call after another
+        are added to the same report.
+        """
+        self._staging_root = tempfile.mkdtemp(
+            prefix='.registrant_',
+            dir=os.path.dirname(self._out_report_folder))
+        self._staging_folder = os.path.join(
+            self._staging_root, os.path.basename(self._out_report_folder))
+        # removed when the reporter is closed or at the latest when the
+        # interpreter exits, including after an unhandled exception
+        _STAGING_ROOTS.add(self._staging_root)
+        shutil.copytree(REPORT_DATA_FOLDER_PATH, self._staging_folder)
+        return
+
+    # ----------------------------------------------------------------------
+    @property
+    def _staging_file_path(self):
+        """Get path to .html file report updated by this class methods."""
+        if self._staging_root is None:
+            raise ValueError('Reporter is closed')
+        return os.path.join(self._staging_folder, REPORT_FILE_NAME)
+
+    # ----------------------------------------------------------------------
+    def _publish_report(self):
+        """Copy the report from the staging folder to the output folder.
+
+        A copy of the staging folder is renamed into the output folder
+        after the report published before is renamed away, and then the
+        report published before is removed, so the output folder never
+        holds a partially written report. Renaming is atomic as both
+        folders are on the same drive. When another run publishes its
+        report of the same geodatabase in between, that report is
+        replaced; the last report published wins.
+        """
+        publishing_root = tempfile.mkdtemp(dir=self._staging_root)
+        publishing_folder = os.path.join(
+            publishing_root, os.path.basename(self._out_report_folder))
+        shutil.copytree(self._staging_folder, publishing_folder)
+        try:
+            for attempt in range(REPORT_PUBLISH_ATTEMPTS):
+                try:
+                    os.rename(self._out_report_folder,
+                              os.path.join(publishing_root,
+                                           'replaced{0}'.format(attempt)))
+                except OSError:
+                    # not published yet or moved away by another run
+                    pass
+                try:
+                    os.rename(publishing_folder, self._out_report_folder)
+                    break
+                except OSError:
+                    if not os.path.exists(self._out_report_folder):
+                        raise
+            else:
+                raise OSError('Could not publish report to {0}'.format(
+                    self._out_report_folder))
+        finally:
+            shutil.rmtree(publishing_root, ignore_errors=True)
+        return
+
+    # ----------------------------------------------------------------------
+    def close(self):
+        """Remove the staging folder of the report.
+
+        The report published stays in the output folder; no sections can
+        be reported with the reporter afterwards. Called on leaving the
+        `with` block when the reporter is used as a context manager.
+        """
+        staging_root = getattr(self, '_staging_root', None)
+        if staging_root:
+            shutil.rmtree(staging_root, ignore_errors=True)
+            _STAGING_ROOTS.discard(staging_root)
+            self._staging_root = None
+        return
+
+    # ----------------------------------------------------------------------
+    def __enter__(self):
+        """Get the reporter used as a context manager."""
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Remove the staging folder even when reporting failed."""
+        self.close()
+
+    # ----------------------------------------------------------------------
+    def __del__(self):
+        """Remove the staging folder of a reporter not closed."""
+        self.close()
+
     # ----------------------------------------------------------------------
     def _write_timestamp(self):
         """Write timestamp to .html report file."""
         day_time = datetime.datetime.strftime(datetime.datetime.now(),
                                               '%d %b %Y %H:%M:%S')
         _build_html.add_timestamp_header(
-            report_path=self.report_file_path, day_time=day_time)
+            report_path=self._staging_file_path, day_time=day_time)
         return
 
-    # ----------------------------------------------------------------------
-    def _map_boolean(self, df):
-        """Map pandas data frame boolean columns.
-
-        Used to get `Yes` from `True` and `No` from `False`.
-        """
-        return df.replace({
-            col: utils.BOOL_TO_YESNO_MAPPER
-            for col in df.select_dtypes([bool])
-        })
-
     # ----------------------------------------------------------------------
     def _report_overview(self):
         """Report overview information."""
@@ -287,98 +781,114 @@ class Reporter(object):
             self._gdb_info,
             section_header_id='overview',
             section_title='Overview',
-            report_path=self.report_file_path)
+            report_path=self._staging_file_path)
         return
 
     # ----------------------------------------------------------------------
     def _report_versions(self):
         """Report versions information."""
-        versions = self.gdb.get_versions()
-        if versions:
-            df = self._map_boolean(
-                pd.DataFrame.from_dict(versions).sort_values(by='Name'))
+        section = self.session.get_section('versions',
+                                           self.gdb.iter_versions)
+        if len(section):
+            section = section.sort('Name').map_booleans()
             _build_html.add_div_to_html_page(
-                df=df,
+                section,
                 section_header_id='versions',
                 section_title='Versions',
-                report_path=self.report_file_path)
+                report_path=self._staging_file_path)
         return
 
     # ---------------------------------------------------------------------
     def _report_replicas(self):
         """Report replicas information."""
-        replicas = self.gdb.get_replicas()
-        if replicas:
-            df = self._map_boolean(
-                pd.DataFrame.from_dict(replicas).sort_values(by='Name'))
+        section = self.session.get_section('replicas',
+                                           self.gdb.iter_replicas)
+        if len(section):
+            section = section.sort('Name').map_booleans()
             _build_html.add_div_to_html_page(
-                df=df,
+                section,
                 section_header_id='replicas',
                 section_title='Replicas',
-                report_path=self.report_file_path,
+                report_path=self._staging_file_path,
                 escape=False)
         return
 
     # ---------------------------------------------------------------------
-    def _report_domains(self, do_report_domains,
-                        do_report_domains_coded_values):
+    def _report_domains(self,
+                        do_report_domains,
+                        do_report_domains_coded_values,
+                        do_report_domains_usage_counts=False):
         """Report domains information."""
-        domains = self.gdb.get_domains()
-        if not domains:
+        section = self.session.get_section('domains', self.gdb.iter_domains)
+        if not len(section):
             return
 
-        df = pd.DataFrame.from_dict(domains).sort_values(by='Name')
-        df['Range'].fillna(value='', inplace=True)
+        section = section.sort('Name').fillna('Range', '')
+
+        if do_report_domains or do_report_domains_usage_counts:
+            domains_usage = self._get_domains_usage()
 
         if do_report_domains:
+            section = _domains.add_usage_columns(
+                section, domains_usage).map_booleans()
+
             for domain_name in sorted(
-                    df[df['Domain type'] == 'CodedValue']['Name'].values):
+                    name for name, domain_type in zip(
+                        section['Name'], section['Domain type'])
+                    if domain_type == 'CodedValue'):
                 _build_html.add_li_to_toc(
                     parent_id='tocDomains',
                     section_header_id='dmn' + domain_name,
                     li_text=domain_name,
-                    report_path=self.report_file_path)
+                    report_path=self._staging_file_path)
 
             _build_html.add_div_to_html_page(
-                df=df.drop('Coded values', 1),
+                section.drop('Coded values'),
                 section_header_id='domains',
                 section_title='Domains',
-                report_path=self.report_file_path)
+                report_path=self._staging_file_path)
 
         if do_report_domains_coded_values:
-            df_coded_values = {
+            coded_values = {
                 item['Name']: item['Coded values']
-                for item in df.to_dict(orient='records')
+                for item in section.records()
                 if item['Domain type'] == 'CodedValue'
             }
 
             for domain_name, coded_values_dict in sorted(
-                    df_coded_values.items(), key=lambda i: i[0]):
-                df = pd.DataFrame([{
-                    'Code': k,
-                    'Value': v,
-                } for k, v in coded_values_dict.items()])
+                    coded_values.items(), key=lambda i: i[0]):
+                if do_report_domains_usage_counts:
+                    section = Section.from_records(
+                        self._get_domain_codes_usage(
+                            coded_values_dict,
+                            domains_usage.get(domain_name,
+                                              []))).map_booleans()
+                else:
+                    section = Section([
+                        ('Code', list(coded_values_dict.keys())),
+                        ('Value', list(coded_values_dict.values())),
+                    ])
                 _build_html.add_div_to_html_page(
-                    df,
+                    section,
                     section_header_id='dmn' + domain_name,
                     section_title=domain_name,
                     header_size='h3',
-                    report_path=self.report_file_path)
+                    report_path=self._staging_file_path)
         return
 
     # ----------------------------------------------------------------------
     def _report_relclasses(self):
         """Report relationship classes information."""
-        rel_classes = self.gdb.get_relationship_classes()
-        if rel_classes:
-            df = self._map_boolean(
-                pd.DataFrame.from_dict(rel_classes).sort_values(by='Name'))
+        section = self.session.get_section('relclasses',
+                                           self.gdb.iter_relationship_classes)
+        if len(section):
+            section = section.sort('Name').map_booleans()
 
             _build_html.add_div_to_html_page(
-                df=df,
+                section,
                 section_header_id='relclasses',
                 section_title='Relationship classes',
-                report_path=self.report_file_path,
+                report_path=self._staging_file_path,
                 escape=False)
         return
 
@@ -389,35 +899,39 @@ class Reporter(object):
             do_report_tables_fields,
             do_report_tables_subtypes,
             do_report_tables_indexes,
+            tables_metrics=None,
+            scan_workers=1,
+            dedup_fields=False,
+            columns=None,
     ):
-        """Report tables information."""
-        tables = self.gdb.get_tables()
+        """Report tables information.
+
+        Only the names of tables are read unless the tables are listed.
+        """
+        if not do_report_tables:
+            columns = ['Name']
+        tables = self._get_datasets_props(DATASET_TYPE_TABLE, columns)
         if tables:
-            tables_info = self._get_tables_info(tables)
+            tables_info = self._get_tables_info(tables, columns)
             if do_report_tables:
                 _build_html.add_div_to_html_page(
                     tables_info,
                     section_header_id='tables',
                     section_title='Tables',
-                    report_path=self.report_file_path)
+                    report_path=self._staging_file_path)
 
-            for table_name in tables_info['Name'].values:
+            for table_name in tables_info['Name']:
                 _build_html.add_li_to_toc(
                     parent_id='tocTables',
                     section_header_id=table_name,
-                    report_path=self.report_file_path)
+                    report_path=self._staging_file_path)
 
-                if do_report_tables_fields:
-                    table_fields = self._get_table_fields(table_name)
-                    if table_fields is not None:
-                        _build_html.add_div_to_html_page(
-                            table_fields,
-                            section_header_id=table_name,
-                            section_title=table_name,
-                            header_size='h3',
-                            report_path=self.report_file_path)
+                self._report_dataset_fields(table_name, DATASET_TYPE_TABLE,
+                                            do_report_tables_fields,
+                                            dedup_fields)
 
-                if do_report_tables_subtypes and self.arcpy_found:
+                if (do_report_tables_subtypes
+                        and self.gdb.supports(OPERATION_SUBTYPES)):
                     table_subtypes = self._get_table_subtypes(table_name)
                     if table_subtypes is not None:
                         if do_report_tables_fields:
@@ -429,9 +943,10 @@ class Reporter(object):
                             section_header_id=table_name,
                             section_title=section_title,
                             header_size='h4',
-                            report_path=self.report_file_path)
+                            report_path=self._staging_file_path)
 
-                if do_report_tables_indexes and self.arcpy_found:
+                if (do_report_tables_indexes
+                        and self.gdb.supports(OPERATION_INDEXES)):
                     table_indexes = self._get_table_indexes(table_name)
                     if do_report_tables_fields is not None:
                         section_title = 'Indexes'
@@ -442,7 +957,12 @@ class Reporter(object):
                         section_header_id=table_name,
                         section_title=section_title,
                         header_size='h4',
-                        report_path=self.report_file_path)
+                        report_path=self._staging_file_path)
+
+                if tables_metrics:
+                    self._report_dataset_metrics(
+                        table_name, DATASET_TYPE_TABLE, tables_metrics,
+                        scan_workers, do_report_tables_fields)
         return
 
     # ---------------------------------------------------------------------
@@ -452,35 +972,40 @@ class Reporter(object):
             do_report_fcs_fields,
             do_report_fcs_subtypes,
             do_report_fcs_indexes,
+            fcs_metrics=None,
+            scan_workers=1,
+            dedup_fields=False,
+            columns=None,
     ):
-        """Report feature classes information."""
-        fcs = self.gdb.get_feature_classes()
+        """Report feature classes information.
+
+        Only the names of feature classes are read unless the feature
+        classes are listed.
+        """
+        if not do_report_fcs:
+            columns = ['Name']
+        fcs = self._get_datasets_props(DATASET_TYPE_FC, columns)
         if fcs:
+            fcs_info = self._get_fcs_info(fcs, columns)
             if do_report_fcs:
-                fcs_info = self._get_fcs_info(fcs)
                 _build_html.add_div_to_html_page(
                     fcs_info,
                     section_header_id='fcs',
                     section_title='Feature classes',
-                    report_path=self.report_file_path)
+                    report_path=self._staging_file_path)
 
-            for fc_name in fcs_info['Name'].values:
+            for fc_name in fcs_info['Name']:
                 _build_html.add_li_to_toc(
                     parent_id='tocFcs',
                     section_header_id=fc_name,
-                    report_path=self.report_file_path)
+                    report_path=self._staging_file_path)
 
-                if do_report_fcs_fields:
-                    fc_fields = self._get_fc_fields(fc_name)
-                    if fc_fields is not None:
-                        _build_html.add_div_to_html_page(
-                            fc_fields,
-                            section_header_id=fc_name,
-                            section_title=fc_name,
-                            header_size='h3',
-                            report_path=self.report_file_path)
+                self._report_dataset_fields(fc_name, DATASET_TYPE_FC,
+                                            do_report_fcs_fields,
+                                            dedup_fields)
 
-                if do_report_fcs_subtypes and self.arcpy_found:
+                if (do_report_fcs_subtypes
+                        and self.gdb.supports(OPERATION_SUBTYPES)):
                     fc_subtypes = self._get_fc_subtypes(fc_name)
                     if fc_subtypes is not None:
                         if do_report_fcs_fields:
@@ -493,9 +1018,10 @@ class Reporter(object):
                             section_header_id=fc_name,
                             section_title=section_title,
                             header_size='h4',
-                            report_path=self.report_file_path)
+                            report_path=self._staging_file_path)
 
-                if do_report_fcs_indexes and self.arcpy_found:
+                if (do_report_fcs_indexes
+                        and self.gdb.supports(OPERATION_INDEXES)):
                     fc_indexes = self._get_fc_indexes(fc_name)
                     if fc_indexes is not None:
                         if do_report_fcs_fields:
@@ -507,73 +1033,540 @@ class Reporter(object):
                             section_header_id=fc_name,
                             section_title=section_title,
                             header_size='h4',
-                            report_path=self.report_file_path)
+                            report_path=self._staging_file_path)
+
+                if fcs_metrics:
+                    self._report_dataset_metrics(
+                        fc_name, DATASET_TYPE_FC, fcs_metrics,
+                        scan_workers, do_report_fcs_fields)
+        return
+
+    # ----------------------------------------------------------------------
+    def _report_dataset_fields(self,
+                               dataset_name,
+                               dataset_type,
+                               do_report_fields,
+                               dedup_fields=False):
+        """Report fields of single dataset or link to identical fields."""
+        identical_to = None
+        if do_report_fields and dedup_fields:
+            identical_to = self._get_identical_fields_dataset(
+                dataset_name, dataset_type)
+        if identical_to:
+            _build_html.add_reference_to_html_page(
+                section_header_id=dataset_name,
+                section_title=dataset_name,
+                text='Fields are identical to ',
+                target_section_id=identical_to,
+                header_size='h3',
+                report_path=self._staging_file_path)
+        elif do_report_fields:
+            fields = self._get_dataset_fields(dataset_name, dataset_type)
+            if fields is not None:
+                _build_html.add_div_to_html_page(
+                    fields,
+                    section_header_id=dataset_name,
+                    section_title=dataset_name,
+                    header_size='h3',
+                    report_path=self._staging_file_path)
+        return
+
+    # ----------------------------------------------------------------------
+    def _report_dataset_metrics(self,
+                                dataset_name,
+                                dataset_type,
+                                metrics_classes,
+                                scan_workers=1,
+                                do_report_fields=True):
+        """Report metrics (such as profile) of single dataset.
+
+        The titles of the metrics include the dataset name when its
+        fields are not reported right before them.
+        """
+        for metric_title, metric_section in self._get_dataset_metrics(
+                dataset_name, dataset_type, metrics_classes, scan_workers):
+            if do_report_fields:
+                section_title = metric_title
+            else:
+                section_title = '{0} ({1})'.format(metric_title, dataset_name)
+            _build_html.add_div_to_html_page(
+                metric_section,
+                section_header_id=dataset_name,
+                section_title=section_title,
+                header_size='h4',
+                report_path=self._staging_file_path)
+        return
+
+    # ----------------------------------------------------------------------
+    def _report_attachments(self, scan_workers=1):
+        """Report attachments storage information."""
+        attachments = [
+            _attachments.get_attachments_sizes(
+                self._get_dataset(table_name, DATASET_TYPE_TABLE),
+                parent_name,
+                workers=scan_workers)
+            for table_name, parent_name in
+            self.gdb.get_attachment_tables_names()
+            if self._is_dataset_reported(parent_name)
+        ]
+        if attachments:
+            _build_html.add_div_to_html_page(
+                Section.from_records(attachments),
+                section_header_id='attachments',
+                section_title='Attachments',
+                report_path=self._staging_file_path)
+        return
+
+    # ----------------------------------------------------------------------
+    def _report_storage(self):
+        """Report storage of file geodatabase tables on disk."""
+        if not os.path.isdir(self.gdb.path):
+            return
+        try:
+            storage = _fgdb_storage.get_datasets_storage(self.gdb.path)
+        except (IOError, ValueError) as e:
+            print('Error. Could not read storage of tables. Reason: ', e)
+            return
+
+        if storage:
+            section = Section.from_records(storage).sort(
+                'Total size, bytes', reverse=True).map_booleans()
+            _build_html.add_div_to_html_page(
+                section,
+                section_header_id='storage',
+                section_title='Storage',
+                report_path=self._staging_file_path)
+        return
+
+    # ----------------------------------------------------------------------
+    def _report_spatial_indexes(self):
+        """Report spatial indexes health of feature classes."""
+        spatial_indexes = self._get_spatial_indexes()
+        if spatial_indexes:
+            section = Section.from_records(spatial_indexes).sort(
+                'Name').map_booleans()
+            _build_html.add_div_to_html_page(
+                section,
+                section_header_id='spatialindexes',
+                section_title='Spatial indexes',
+                report_path=self._staging_file_path)
         return
 
     # ----------------------------------------------------------------------
-    def _get_dataset_info(self, datasets):
-        """Get dataset information ready to write into report."""
-        df = self._map_boolean(
-            pd.DataFrame.from_dict(datasets).sort_values(by='Name'))
+    def _get_spatial_indexes(self):
+        """Get spatial indexes health of feature classes reading it once.
+
+        Grid sizes and extent are read from the geometry field description
+        stored in the table file; they are not exposed by `arcpy.Describe`.
+        The average size of features is taken from geometry statistics
+        when they were computed.
+        """
+        if self._spatial_indexes is not None:
+            return self._spatial_indexes
+        self._spatial_indexes = []
+        if not os.path.isdir(self.gdb.path):
+            return self._spatial_indexes
+        try:
+            tables_ids = {
+                name.lower(): object_id
+                for object_id, name in _fgdb_storage.read_system_catalog(
+                    self.gdb.path)
+            }
+            files_sizes = _fgdb_storage.get_tables_files_sizes(self.gdb.path)
+        except (IOError, ValueError) as e:
+            print('Error. Could not read spatial indexes. Reason: ', e)
+            return self._spatial_indexes
+
+        fcs = self._get_datasets_props(DATASET_TYPE_FC, [
+            utils.GDB_FC_PROPS['name'],
+            utils.GDB_FC_PROPS['hasSpatialIndex'],
+        ])
+        for fc in fcs:
+            fc_name = fc[utils.GDB_FC_PROPS['name']]
+            object_id = tables_ids.get(fc_name.split('.')[-1].lower())
+            if object_id is None:
+                continue
+            try:
+                geometry = _fgdb_storage.read_geometry_field(
+                    self.gdb.path, object_id) or {}
+            except (IOError, ValueError, struct.error) as e:
+                print('Error. Could not read spatial index of {0}. '
+                      'Reason: '.format(fc_name), e)
+                geometry = {}
+
+            extent = (geometry.get('xmin'), geometry.get('ymin'),
+                      geometry.get('xmax'), geometry.get('ymax'))
+            average_envelope = None
+            metric_set = self._datasets_metrics.get((fc_name,
+                                                     DATASET_TYPE_FC))
+            geometry_stats = metric_set.get_metric(
+                _geometry.GeometryStatsMetric) if metric_set else None
+            if geometry_stats:
+                average_envelope = geometry_stats.get_average_envelope()
+                extent = geometry_stats.extent or extent
+
+            self._spatial_indexes.append(
+                _spatial_index.assess_spatial_index(
+                    fc_name,
+                    fc[utils.GDB_FC_PROPS['hasSpatialIndex']] not in (False,
+                                                                      'No'),
+                    geometry.get('gridSizes'),
+                    extent if None not in extent else None,
+                    average_envelope,
+                    files_sizes[object_id].get('spx', 0),
+                ))
+        return self._spatial_indexes
+
+    # ----------------------------------------------------------------------
+    def _report_growth(self, history_path, row_count_threshold,
+                       size_threshold):
+        """Append this run to the history file and report the growth."""
+        sizes = {}
+        if os.path.isdir(self.gdb.path):
+            try:
+                sizes = {
+                    table[utils.GDB_STORAGE_PROPS['name']].lower():
+                    table[utils.GDB_STORAGE_PROPS['totalSize']]
+                    for table in _fgdb_storage.get_datasets_storage(
+                        self.gdb.path)
+                }
+            except (IOError, ValueError) as e:
+                print('Error. Could not read storage of tables. Reason: ', e)
+
+        datasets = []
+        for dataset_type in (DATASET_TYPE_TABLE, DATASET_TYPE_FC):
+            for props in self._get_datasets_props(dataset_type,
+                                                  ['Name', 'Row count']):
+                name = props['Name']
+                datasets.append((
+                    name,
+                    dataset_type,
+                    props.get('Row count'),
+                    sizes.get(name.split('.')[-1].lower()),
+                    len(self._get_dataset_fields_props(name, dataset_type)),
+                ))
+
+        gdb_path = os.path.abspath(self.gdb.path)
+        history = _history.GrowthHistory(history_path)
+        try:
+            history.add_run(gdb_path, datasets)
+            growth = _history.get_growth(
+                history.get_history(gdb_path), row_count_threshold,
+                size_threshold)
+        finally:
+            history.close()
+
+        if growth:
+            _build_html.add_div_to_html_page(
+                Section.from_records(growth),
+                section_header_id='growth',
+                section_title='Growth',
+                report_path=self._staging_file_path)
+        return
+
+    # ----------------------------------------------------------------------
+    def _report_findings(self):
+        """Report performance findings right after the overview.
+
+        Properties, fields and indexes already read for other sections
+        are reused; the fields profiles are used when they were
+        computed. The checks of indexes which cannot be read are
+        reported as skipped.
+        """
+        findings = _findings.find_missing_spatial_indexes(
+            self._get_datasets_props(DATASET_TYPE_FC, [
+                utils.GDB_FC_PROPS['name'],
+                utils.GDB_FC_PROPS['hasSpatialIndex'],
+            ]))
+
+        datasets_indexes = {}
+        for dataset_name, dataset_type in self._get_datasets_names():
+            fields = self._get_dataset_fields_props(dataset_name,
+                                                    dataset_type)
+            findings.extend(
+                _findings.find_wide_datasets(dataset_name, fields))
+
+            metric_set = self._datasets_metrics.get((dataset_name,
+                                                     dataset_type))
+            profile = metric_set.get_metric(
+                _profiling.FieldsProfileMetric) if metric_set else None
+            profiles = profile.finalize() if profile else None
+            if profiles:
+                findings.extend(
+                    _findings.find_oversized_text_fields(
+                        dataset_name, fields, profiles))
+
+            if self.gdb.supports(OPERATION_INDEXES):
+                indexes = self._get_dataset_indexes_props(dataset_name,
+                                                          dataset_type)
+                datasets_indexes[dataset_name] = indexes
+                findings.extend(
+                    _findings.find_excessive_indexes(dataset_name, indexes))
+
+        if self.gdb.supports(OPERATION_INDEXES):
+            findings.extend(
+                _findings.find_unindexed_relationship_keys(
+                    self.session.get_section(
+                        'relclasses',
+                        self.gdb.iter_relationship_classes).records(),
+                    datasets_indexes))
+        else:
+            findings.append(
+                _findings.make_skipped_checks_finding(
+                    'Indexes checks',
+                    'Indexes are read only with arcpy; datasets with too '
+                    'many indexes and relationship class keys without '
+                    'index are not found'))
+
+        if os.path.isdir(self.gdb.path):
+            try:
+                findings.extend(
+                    _findings.find_fragmented_tables([
+                        table for table in
+                        _fgdb_storage.get_datasets_storage(self.gdb.path)
+                        if self._is_dataset_reported(
+                            table[utils.GDB_STORAGE_PROPS['name']])
+                    ]))
+            except (IOError, ValueError) as e:
+                print('Error. Could not read storage of tables. Reason: ', e)
+
+        findings.extend(
+            _findings.find_poor_spatial_indexes(self._get_spatial_indexes()))
+
+        if findings:
+            _build_html.add_div_to_html_page(
+                Section.from_records(_findings.sort_findings(findings)),
+                section_header_id='findings',
+                section_title='Performance findings',
+                report_path=self._staging_file_path,
+                insert_after_section_id='overview')
+        return
+
+    # ----------------------------------------------------------------------
+    def _get_feature_dataset_names(self, feature_dataset):
+        """Get names of the feature classes of the feature dataset."""
+        feature_datasets = self.session.gdb.get_feature_datasets()
+        if feature_datasets is None:
+            raise ValueError('Feature datasets cannot be read')
+        names = frozenset(
+            name for name, name_feature_dataset in feature_datasets.items()
+            if name_feature_dataset == feature_dataset)
+        if not names:
+            raise ValueError(
+                'Feature dataset not found: {0}'.format(feature_dataset))
+        return names
+
+    # ----------------------------------------------------------------------
+    def _is_dataset_reported(self, dataset_name):
+        """Check whether the dataset is reported by this reporter."""
+        return (self._datasets_filter is None
+                or dataset_name in self._datasets_filter)
+
+    # ----------------------------------------------------------------------
+    def _get_datasets_names(self):
+        """Get (dataset name, dataset type) tuples of datasets reported."""
+        return [(dataset_name, dataset_type)
+                for dataset_name, dataset_type in self.gdb.get_datasets_names()
+                if self._is_dataset_reported(dataset_name)]
+
+    # ----------------------------------------------------------------------
+    def _get_datasets_props(self, dataset_type, columns=None):
+        """Get properties of all datasets of a type reading them only once.
+
+        columns: list:
+            labels of the properties needed; all properties by default.
+            The properties planned for the other sections of the report
+            are read along with them, so the datasets are read again
+            only when properties not read before are needed
+        """
+        read_columns, props = self._datasets_props.get(
+            dataset_type, (frozenset(), None))
+        if props is not None and (read_columns is None or (
+                columns is not None and read_columns.issuperset(columns))):
+            return self._filter_datasets_props(props)
+
+        planned_columns = self._datasets_columns.get(dataset_type,
+                                                     frozenset())
+        if columns is None or planned_columns is None:
+            read_columns = None
+        else:
+            read_columns = planned_columns | frozenset(columns)
+        if dataset_type == DATASET_TYPE_FC:
+            props = self.gdb.get_feature_classes(read_columns)
+        else:
+            props = self.gdb.get_tables(read_columns)
+        self._datasets_props[dataset_type] = (read_columns, props)
+        return self._filter_datasets_props(props)
+
+    # ----------------------------------------------------------------------
+    def _filter_datasets_props(self, props):
+        """Keep properties of the datasets reported.
+
+        The properties of all datasets are read and shared with the
+        other reports of the session.
+        """
+        if self._datasets_filter is None:
+            return props
+        return [dataset_props for dataset_props in props
+                if dataset_props['Name'] in self._datasets_filter]
+
+    # ----------------------------------------------------------------------
+    def _get_dataset_info(self, datasets, columns=None):
+        """Get dataset information ready to write into report.
+
+        columns: list:
+            labels of the columns to report; all columns by default
+        """
         # sort dataset names case insensitive
-        df = df.iloc[df.Name.str.lower().argsort()]
-        return df
+        section = Section.from_records(datasets).sort(
+            'Name', key=lambda name: name.lower()).map_booleans()
+        if columns is None:
+            return section
+        return section.drop(
+            *[label for label in section.columns if label not in columns])
+
+    # ----------------------------------------------------------------------
+    def _get_dataset(self, dataset_name, dataset_type, gdb=None):
+        """Get data object for single dataset for the backend in use."""
+        return (gdb or self.gdb).get_dataset(dataset_name, dataset_type)
+
+    # ----------------------------------------------------------------------
+    def _get_dataset_fields_props(self, dataset_name, dataset_type):
+        """Get fields properties for single dataset reading them only once."""
+        key = (dataset_name, dataset_type)
+        if key not in self._datasets_fields:
+            self._datasets_fields[key] = self.gdb.get_fields(
+                dataset_name, dataset_type)
+        return self._datasets_fields[key]
+
+    # ----------------------------------------------------------------------
+    def _get_identical_fields_dataset(self, dataset_name, dataset_type):
+        """Get name of dataset reported before with the same fields.
+
+        Datasets are matched by the fingerprint of their fields; the
+        first dataset with a fingerprint is remembered and `None` is
+        returned for it.
+        """
+        fingerprint = _snapshot.get_fingerprint(
+            self._get_dataset_fields_props(dataset_name, dataset_type))
+        first_dataset_name = self._fields_fingerprints.setdefault(
+            fingerprint, dataset_name)
+        if first_dataset_name == dataset_name:
+            return None
+        return first_dataset_name
+
+    # ----------------------------------------------------------------------
+    def _get_domains_usage(self):
+        """Get reverse index of domains to the dataset fields using them.
+
+        The index is built in a single pass over the fields of all datasets.
+        The fields read are cached and reused when reporting tables and
+        feature classes, so the datasets are not read a second time.
+        Return dict of domain name and list of (dataset name, dataset type,
+        field name) tuples.
+        """
+        return _domains.get_domains_usage(
+            (dataset_name, dataset_type,
+             self._get_dataset_fields_props(dataset_name, dataset_type))
+            for dataset_name, dataset_type in self.gdb.get_datasets_names())
+
+    # ----------------------------------------------------------------------
+    def _get_domain_codes_usage(self, coded_values, fields):
+        """Get number of rows having each domain code in the fields.
+
+        The values of every field are counted by the data source with
+        a single `GROUP BY` query instead of reading the rows.
+        """
+        fields_values_counts = OrderedDict(
+            ('{0}.{1}'.format(dataset_name, field_name),
+             self._get_dataset(dataset_name,
+                               dataset_type).get_values_counts(field_name))
+            for dataset_name, dataset_type, field_name in fields)
+        return _domains.get_codes_usage(coded_values, fields_values_counts)
 
     # ----------------------------------------------------------------------
     def _get_dataset_fields(self, dataset_name, dataset_type):
         """Get fields information for single dataset."""
-        if self.arcpy_found:
-            if dataset_type == DATASET_TYPE_FC:
-                dataset = FeatureClass(
-                    os.path.join(self.gdb.path, dataset_name))
-            elif dataset_type == DATASET_TYPE_TABLE:
-                dataset = Table(os.path.join(self.gdb.path, dataset_name))
-        else:
-            if dataset_type == DATASET_TYPE_FC:
-                dataset = FeatureClassOgr(self.gdb, dataset_name)
-            elif dataset_type == DATASET_TYPE_TABLE:
-                dataset = TableOgr(self.gdb, dataset_name)
-
-        df_fields = self._map_boolean(
-            pd.DataFrame.from_dict(dataset.get_fields()))
+        fields = Section.from_records(
+            self._get_dataset_fields_props(dataset_name, dataset_type))
 
         # when there is a dataset with no fields
-        if not df_fields.empty:
-            df_fields['Default value'].fillna(value='', inplace=True)
-        else:
-            df_fields = None
-        return df_fields
+        if not fields:
+            return None
+        return fields.map_booleans().fillna('Default value', '')
 
     # ----------------------------------------------------------------------
     def _get_dataset_subtypes(self, dataset_name, dataset_type):
         """Get subtypes information for single dataset."""
-        if dataset_type == DATASET_TYPE_FC:
-            dataset = FeatureClass(os.path.join(self.gdb.path, dataset_name))
-        elif dataset_type == DATASET_TYPE_TABLE:
-            dataset = Table(os.path.join(self.gdb.path, dataset_name))
-        subtypes = dataset.get_subtypes()
+        subtypes = self.gdb.get_subtypes(dataset_name, dataset_type)
         if subtypes:
-            df_subtypes = self._map_boolean(pd.DataFrame.from_dict(subtypes))
-            return df_subtypes
+            return Section.from_records(subtypes).map_booleans()
+
+    # ----------------------------------------------------------------------
+    def _get_dataset_indexes_props(self, dataset_name, dataset_type):
+        """Get indexes of single dataset reading them only once."""
+        key = (dataset_name, dataset_type)
+        if key not in self._datasets_indexes:
+            self._datasets_indexes[key] = self.gdb.get_indexes(
+                dataset_name, dataset_type)
+        return self._datasets_indexes[key]
 
     # ----------------------------------------------------------------------
     def _get_dataset_indexes(self, dataset_name, dataset_type):
         """Get indexes information for single feature class."""
-        if dataset_type == DATASET_TYPE_FC:
-            dataset = FeatureClass(os.path.join(self.gdb.path, dataset_name))
-        elif dataset_type == DATASET_TYPE_TABLE:
-            dataset = Table(os.path.join(self.gdb.path, dataset_name))
-
-        indexes = dataset.get_indexes()
+        indexes = self._get_dataset_indexes_props(dataset_name, dataset_type)
         if indexes:
-            df_indexes = (pd.DataFrame.from_dict(indexes).sort_values(
-                by='Name'))
-            return df_indexes
+            return Section.from_records(indexes).sort('Name')
+
+    # ----------------------------------------------------------------------
+    def _get_metrics_classes(self,
+                             dataset_type,
+                             do_report_profile=False,
+                             profile_approximate=False,
+                             metrics=None):
+        """Get classes of metrics to compute for datasets of given type."""
+        metrics_classes = []
+        if do_report_profile:
+            if profile_approximate:
+                metrics_classes.append(
+                    _profiling.ApproximateFieldsProfileMetric)
+            else:
+                metrics_classes.append(_profiling.FieldsProfileMetric)
+        for metric in metrics or []:
+            metric_class = _metrics.get_metric_class(metric)
+            if dataset_type in metric_class.dataset_types:
+                metrics_classes.append(metric_class)
+        return metrics_classes
+
+    # ----------------------------------------------------------------------
+    def _get_dataset_metrics(self,
+                             dataset_name,
+                             dataset_type,
+                             metrics_classes,
+                             workers=1):
+        """Get metrics of single dataset computed in a single scan.
+
+        Return list of (metric title, section) pairs of metrics
+        with results.
+        """
+        key = (dataset_name, dataset_type, tuple(metrics_classes))
+        metric_set = self.session.datasets_metrics.get(key)
+        if metric_set is None:
+            metric_set = _metrics.compute_metrics(
+                self._get_dataset(dataset_name, dataset_type),
+                self._get_dataset_fields_props(dataset_name, dataset_type),
+                metrics_classes,
+                workers=workers)
+            self.session.datasets_metrics[key] = metric_set
+        self._datasets_metrics[(dataset_name, dataset_type)] = metric_set
+        results = metric_set.finalize()
+        return [(metric_title, Section.from_records(rows))
+                for metric_title, rows in results.items() if rows]
 
     # ----------------------------------------------------------------------
-    def _get_fcs_info(self, fcs):
+    def _get_fcs_info(self, fcs, columns=None):
         """Get feature classes information ready to write into report."""
-        return self._get_dataset_info(fcs)
+        return self._get_dataset_info(fcs, columns)
 
     # ---------------------------------------------------------------------
     def _get_fc_fields(self, fc_name):
@@ -594,9 +1587,9 @@ class Reporter(object):
             dataset_name=fc_name, dataset_type=DATASET_TYPE_FC)
 
     # ----------------------------------------------------------------------
-    def _get_tables_info(self, tables):
+    def _get_tables_info(self, tables, columns=None):
         """Get tables information ready to write into report."""
-        return self._get_dataset_info(tables)
+        return self._get_dataset_info(tables, columns)
 
     # ----------------------------------------------------------------------
     def _get_table_fields(self, table_name):
@@ -619,5 +1612,5 @@ class Reporter(object):
     # ----------------------------------------------------------------------
     def _write_license_text(self):
         """Add CC-BY license text in the end of the .html report."""
-        _build_html.add_license_footer(report_path=self.report_file_path)
+        _build_html.add_license_footer(report_path=self._staging_file_path)
         return
@@ -0,0 +1,233 @@
+# -*- coding: UTF-8 -*-
+"""Parallel scanning of all rows of geodatabase datasets.
+
+Rows of a dataset are split into ranges of object IDs and every range is
+read in a separate worker process which opens its own connection to the
+geodatabase. Each worker feeds the batches of rows it reads into its own
+accumulator and the partial accumulators are merged as they arrive.
+
+An accumulator is any object with `update(batch)` and `merge(other)`
+methods, created in the workers by a picklable factory (a module level
+class or a `functools.partial` of it).
+"""
+import functools
+import multiprocessing
+
+from registrant._lazy import arcpy
+from registrant._data_objects import (
+    TableOgr,
+    iter_ogr_layer_batches,
+    iter_arcpy_cursor_batches,
+)
+from registrant._ogr_drivers import open_data_source, gdal_config
+from registrant._config import (
+    GDAL_CONFIG_SCAN,
+    SCAN_BATCH_SIZE,
+    SCAN_CHUNKS_PER_WORKER,
+    SCAN_BACKEND_OGR,
+    SCAN_BACKEND_ARCPY,
+)
+
+
+# ----------------------------------------------------------------------
+def _scan_chunk(task):
+    """Read single range of rows and feed them into a new accumulator.
+
+    Run in a worker process or in the current process; the data source
+    is opened with the same OGR driver and the GDAL options tuned for
+    scanning set.
+    """
+    (backend, gdb_path, source, columns, where_clause, accumulator_factory,
+     batch_size, geometry_column, driver_name) = task
+    accumulator = accumulator_factory()
+    if backend == SCAN_BACKEND_OGR:
+        with gdal_config(GDAL_CONFIG_SCAN):
+            ds = open_data_source(gdb_path, driver_name)
+            for batch in iter_ogr_layer_batches(
+                    ds.GetLayerByName(source), columns, batch_size,
+                    where_clause):
+                accumulator.update(batch)
+    else:
+        for batch in iter_arcpy_cursor_batches(
+                source, columns, batch_size, where_clause, geometry_column):
+            accumulator.update(batch)
+    return accumulator
+
+
+# ----------------------------------------------------------------------
+def _merge(accumulator, other):
+    """Merge two partial accumulators."""
+    return accumulator.merge(other)
+
+
+########################################################################
+class DatasetScanner(object):
+    """Scanner reading all rows of a dataset in parallel ranges of object IDs.
+
+    Initialized from a `Table`/`TableOgr` (or feature class) data object.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, dataset, workers=None, batch_size=SCAN_BATCH_SIZE):
+        """Initialize `DatasetScanner` with the dataset to scan.
+
+        dataset: Table | TableOgr | FeatureClass | FeatureClassOgr:
+            data object of the dataset to scan
+
+        workers: int:
+            number of worker processes; all processors are used if not
+            specified; with a single worker the dataset is read in
+            the current process
+        """
+        self.dataset = dataset
+        self.workers = workers or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        if isinstance(dataset, TableOgr):
+            self.backend = SCAN_BACKEND_OGR
+            self.gdb_path = dataset.gdb.path
+            self.source = dataset.name
+            self.driver_name = dataset.gdb.driver_name
+        else:
+            self.backend = SCAN_BACKEND_ARCPY
+            self.gdb_path = dataset.wkspc
+            self.source = dataset.path
+            self.driver_name = None
+        self.OIDFieldName = dataset.OIDFieldName
+        self.shapeFieldName = getattr(dataset, 'shapeFieldName', None)
+
+    # ----------------------------------------------------------------------
+    def scan(self, accumulator_factory, columns):
+        """Read values of columns of all rows into an accumulator.
+
+        Return the accumulator with all partial results merged.
+        """
+        if self.workers == 1 or not self.OIDFieldName:
+            if self.backend == SCAN_BACKEND_OGR:
+                # the data source is opened again in the current process
+                # as the GDAL options of scanning are read on opening it
+                return _scan_chunk(
+                    self._get_task(columns, None, accumulator_factory))
+            accumulator = accumulator_factory()
+            for batch in self.dataset.iter_batches(columns, self.batch_size):
+                accumulator.update(batch)
+            return accumulator
+
+        tasks = [
+            self._get_task(columns, where_clause, accumulator_factory)
+            for where_clause in self.get_where_clauses()
+        ]
+        if not tasks:
+            return accumulator_factory()
+
+        pool = multiprocessing.Pool(min(self.workers, len(tasks)))
+        try:
+            return functools.reduce(_merge,
+                                    pool.imap_unordered(_scan_chunk, tasks))
+        finally:
+            pool.close()
+            pool.join()
+
+    # ----------------------------------------------------------------------
+    def _get_task(self, columns, where_clause, accumulator_factory):
+        """Get task of reading a range of rows for `_scan_chunk`."""
+        return (
+            self.backend,
+            self.gdb_path,
+            self.source,
+            columns,
+            where_clause,
+            accumulator_factory,
+            self.batch_size,
+            self.shapeFieldName,
+            self.driver_name,
+        )
+
+    # ----------------------------------------------------------------------
+    def get_where_clauses(self):
+        """Get where clauses selecting ranges of object IDs of the dataset.
+
+        Ranges are of equal width and their number is a few times greater
+        than the number of workers to balance the load when object IDs
+        are not distributed evenly; no range is narrower than a batch.
+        """
+        oid_range = self.get_oid_range()
+        if oid_range is None:
+            return []
+        oid_min, oid_max = oid_range
+        chunks_count = max(
+            min(self.workers * SCAN_CHUNKS_PER_WORKER,
+                (oid_max - oid_min + 1) // self.batch_size), 1)
+        step = -(-(oid_max - oid_min + 1) // chunks_count)
+        oid_field = self._get_oid_field_delimited()
+        return [
+            '{oid} >= {start} AND {oid} < {stop}'.format(
+                oid=oid_field, start=start, stop=start + step)
+            for start in range(oid_min, oid_max + 1, step)
+        ]
+
+    # ----------------------------------------------------------------------
+    def get_oid_range(self):
+        """Get minimum and maximum object ID of the dataset rows."""
+        if self.backend == SCAN_BACKEND_OGR:
+            return self._ogr_get_oid_range()
+        return self._arcpy_get_oid_range()
+
+    # ----------------------------------------------------------------------
+    def _get_oid_field_delimited(self):
+        """Get object ID field name to use in where clauses."""
+        if self.backend == SCAN_BACKEND_OGR:
+            # special field of OGR SQL referring to the feature id
+            return 'FID'
+        return arcpy.AddFieldDelimiters(self.source, self.OIDFieldName)
+
+    # ----------------------------------------------------------------------
+    def _ogr_get_oid_range(self):
+        """Get object IDs range with OGR SQL or by reading the IDs only."""
+        ds = self.dataset.gdb.ds
+        res = ds.ExecuteSQL('SELECT MIN(FID), MAX(FID) FROM "{0}"'.format(
+            self.source))
+        if res is not None:
+            try:
+                feature = res.GetNextFeature()
+                if feature is not None and feature.IsFieldSetAndNotNull(0):
+                    return (int(feature.GetField(0)),
+                            int(feature.GetField(1)))
+            finally:
+                ds.ReleaseResultSet(res)
+
+        layer = self.dataset.layer
+        layer_defn = layer.GetLayerDefn()
+        layer.SetIgnoredFields([
+            layer_defn.GetFieldDefn(i).GetName()
+            for i in range(0, layer_defn.GetFieldCount())
+        ] + ['OGR_GEOMETRY', 'OGR_STYLE'])
+        layer.ResetReading()
+        oid_min = oid_max = None
+        try:
+            for feature in iter(layer.GetNextFeature, None):
+                fid = feature.GetFID()
+                if oid_min is None or fid < oid_min:
+                    oid_min = fid
+                if oid_max is None or fid > oid_max:
+                    oid_max = fid
+        finally:
+            layer.SetIgnoredFields([])
+            layer.ResetReading()
+        if oid_min is None:
+            return None
+        return (oid_min, oid_max)
+
+    # ----------------------------------------------------------------------
+    def _arcpy_get_oid_range(self):
+        """Get object IDs range reading first row in both sort orders."""
+        oid_range = []
+        for order in ('ASC', 'DESC'):
+            with arcpy.da.SearchCursor(
+                    self.source, ['OID@'],
+                    sql_clause=(None, 'ORDER BY {0} {1}'.format(
+                        self.OIDFieldName, order))) as cursor:
+                row = next(cursor, None)
+                if row is None:
+                    return None
+                oid_range.append(row[0])
+        return tuple(oid_range)
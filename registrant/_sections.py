@@ -0,0 +1,228 @@
+# -*- coding: UTF-8 -*-
+"""Tables of the report sections stored by columns.
+
+A section is an ordered dict of column labels and lists of values with
+the few operations the reporter needs (sorting rows, filling missing
+values, mapping values) and its own export to an HTML table, so no data
+frame is built for the sections of a handful of rows. The HTML table
+has the same markup `pandas.DataFrame.to_html` would produce, including
+the format of columns of floats. `pandas` is needed only to get a
+section as a data frame.
+"""
+import math
+from collections import OrderedDict
+
+from registrant._util_mappings import BOOL_TO_YESNO_MAPPER
+
+_HTML_ESCAPE_CHARS = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'))
+# digits of floats shown as `pandas` shows them by default
+_FLOAT_PRECISION = 6
+
+
+# ----------------------------------------------------------------------
+def _format_value(value, escape=True):
+    """Format value of a cell of HTML table."""
+    text = u'{0}'.format(value)
+    if escape and ('&' in text or '<' in text or '>' in text):
+        for char, escaped_char in _HTML_ESCAPE_CHARS:
+            text = text.replace(char, escaped_char)
+    return text
+
+
+# ----------------------------------------------------------------------
+def _format_floats(column):
+    """Format values of column of floats the way `pandas` does.
+
+    All values are formatted with the same number of decimals, which is
+    the default precision with trailing zeros common to all values
+    trimmed; the scientific notation is used for columns having tiny or
+    huge values. Missing values are `NaN`. Return `None` if the column
+    has values other than floats.
+    """
+    if not any(isinstance(value, float) for value in column) or not all(
+            value is None or isinstance(value, float) for value in column):
+        return None
+    finite = [abs(value) for value in column
+              if value is not None and not math.isnan(value)
+              and not math.isinf(value)]
+    if not finite:
+        return [_format_float_special(value) for value in column]
+    if any(0 < value < 10**-_FLOAT_PRECISION for value in finite) or (
+            max(finite) > 1e6 and len('{0:.{1}f}'.format(
+                max(finite), _FLOAT_PRECISION)) > _FLOAT_PRECISION + 6):
+        return [
+            _format_float_special(value) if value is None or math.isnan(
+                value) or math.isinf(value) else
+            '{0:.{1}e}'.format(value, _FLOAT_PRECISION) for value in column
+        ]
+    texts = [
+        None if value is None or math.isnan(value) or math.isinf(value)
+        else '{0:.{1}f}'.format(value, _FLOAT_PRECISION) for value in column
+    ]
+    numbers = [text for text in texts if text is not None]
+    decimals = _FLOAT_PRECISION
+    while decimals > 1 and all(text.endswith('0') for text in numbers):
+        numbers = [text[:-1] for text in numbers]
+        decimals -= 1
+    trimmed = iter(numbers)
+    return [
+        _format_float_special(value) if text is None else next(trimmed)
+        for value, text in zip(column, texts)
+    ]
+
+
+# ----------------------------------------------------------------------
+def _format_float_special(value):
+    """Format missing or infinite float the way `pandas` does."""
+    if value is None or math.isnan(value):
+        return 'NaN'
+    return 'inf' if value > 0 else '-inf'
+
+
+########################################################################
+class Section(object):
+    """Table of a report section with lists of values keyed by column.
+
+    Operations return a new section and keep this one unchanged; the
+    lists of values of columns not affected are shared between them.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, columns=None):
+        """Initialize section with (column label, values) pairs."""
+        self.columns = OrderedDict(columns or [])
+        return
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def from_records(cls, records):
+        """Create section from mappings of column labels and values.
+
+        Columns are ordered as they are first seen; missing values
+        are `None`. Records may be yielded by a generator, such as
+        `Geodatabase.iter_tables`, and are not kept once read.
+        """
+        columns = OrderedDict()
+        for row_index, record in enumerate(records):
+            items = record.items()
+            for label, value in items:
+                if label not in columns:
+                    columns[label] = [None] * row_index
+                columns[label].append(value)
+            if len(items) < len(columns):
+                for values in columns.values():
+                    if len(values) == row_index:
+                        values.append(None)
+        return cls(columns)
+
+    # ----------------------------------------------------------------------
+    def __len__(self):
+        """Get number of rows."""
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+    # ----------------------------------------------------------------------
+    def __getitem__(self, label):
+        """Get values of column."""
+        return self.columns[label]
+
+    # ----------------------------------------------------------------------
+    def __setitem__(self, label, values):
+        """Add column or replace its values."""
+        values = list(values)
+        if self.columns and len(values) != len(self):
+            raise ValueError('Column {0} has {1} values instead of {2}'.format(
+                label, len(values), len(self)))
+        self.columns[label] = values
+        return
+
+    # ----------------------------------------------------------------------
+    def records(self):
+        """Get rows as ordered dicts of column labels and values."""
+        labels = list(self.columns.keys())
+        return [
+            OrderedDict(zip(labels, row))
+            for row in zip(*self.columns.values())
+        ]
+
+    # ----------------------------------------------------------------------
+    def sort(self, by, key=None, reverse=False):
+        """Get section with rows sorted by values of column.
+
+        key: callable:
+            function applied to the values to compare them, for instance,
+            to sort names case insensitive
+        """
+        values = self.columns[by]
+        if key is not None:
+            values = [key(value) for value in values]
+        order = sorted(
+            range(len(values)), key=values.__getitem__, reverse=reverse)
+        return Section((label, [column[index] for index in order])
+                       for label, column in self.columns.items())
+
+    # ----------------------------------------------------------------------
+    def fillna(self, label, value=''):
+        """Get section with missing values of column replaced."""
+        return self.map(
+            label, lambda cell: value if cell is None else cell)
+
+    # ----------------------------------------------------------------------
+    def map(self, label, function):
+        """Get section with function applied to values of column."""
+        return Section(
+            (column_label, [function(cell) for cell in column]
+             if column_label == label else column)
+            for column_label, column in self.columns.items())
+
+    # ----------------------------------------------------------------------
+    def map_booleans(self, mapper=BOOL_TO_YESNO_MAPPER):
+        """Get section with values of boolean columns mapped.
+
+        Used to get `Yes` from `True` and `No` from `False`; only the
+        columns with all values being booleans are mapped.
+        """
+        return Section(
+            (label, [mapper[cell] for cell in column] if column and all(
+                isinstance(cell, bool) for cell in column) else column)
+            for label, column in self.columns.items())
+
+    # ----------------------------------------------------------------------
+    def drop(self, *labels):
+        """Get section without the columns."""
+        return Section((label, column)
+                       for label, column in self.columns.items()
+                       if label not in labels)
+
+    # ----------------------------------------------------------------------
+    def to_html(self, classes='', border=0, escape=True):
+        """Get HTML table of the section."""
+        lines = [
+            u'<table border="{0}" class="{1}">'.format(
+                border, ' '.join(['dataframe', classes]).strip()),
+            u'  <thead>',
+            u'    <tr style="text-align: right;">',
+        ]
+        lines.extend(
+            u'      <th>{0}</th>'.format(_format_value(label, escape))
+            for label in self.columns)
+        lines.extend([u'    </tr>', u'  </thead>', u'  <tbody>'])
+        columns = [
+            _format_floats(column)
+            or [_format_value(cell, escape) for cell in column]
+            for column in self.columns.values()
+        ]
+        for row in zip(*columns):
+            lines.append(u'    <tr>')
+            lines.append(u'      <td>{0}</td>'.format(
+                u'</td>\n      <td>'.join(row)))
+            lines.append(u'    </tr>')
+        lines.extend([u'  </tbody>', u'</table>'])
+        return u'\n'.join(lines)
+
+    # ----------------------------------------------------------------------
+    def to_dataframe(self):
+        """Get section as `pandas` data frame; requires `pandas`."""
+        import pandas as pd
+        return pd.DataFrame.from_dict(self.columns)[list(self.columns)]
@@ -0,0 +1,92 @@
+# -*- coding: UTF-8 -*-
+"""Session of reports of a geodatabase sharing what is read from it.
+
+A session opens the geodatabase once and keeps the properties read for
+the reports: the overview, the workspace level sections (domains,
+versions, replicas, relationship classes), the properties and fields of
+datasets and the metrics computed. Reporters created from a session
+share them, so reporting the same geodatabase again (for instance, a full
+report and a domains only report, reports with different columns or
+reports of single feature datasets) costs only the reads of what was not
+reported before and rendering.
+
+A session is not shared between threads; reports run at once should
+each have their own session (every `Reporter` creates one by default).
+"""
+from registrant._lazy import is_module_found
+from registrant._geodatabase import Geodatabase
+from registrant._sections import Section
+from registrant._config import OGR_GDB_SUPPORT_MESSAGE
+
+
+########################################################################
+class ReportSession(object):
+    """Geodatabase opened once along with the properties read from it."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, gdb_path, backends=None, ogr_driver=None):
+        """Initialize `ReportSession` opening the geodatabase.
+
+        gdb_path: str:
+            path to the input geodatabase
+
+        backends: str, list or dict:
+            backends to read the geodatabase with as accepted by
+            `Reporter`; the fastest backends available by default
+
+        ogr_driver: str:
+            OGR driver to open file geodatabase with when it is read
+            with `ogr`; the first driver available by default
+        """
+        if not is_module_found('arcpy') and not gdb_path.endswith('.gdb'):
+            raise ValueError(OGR_GDB_SUPPORT_MESSAGE)
+        self.gdb_path = gdb_path
+        self.backends = backends
+        self.ogr_driver = ogr_driver
+        self.gdb = Geodatabase(gdb_path, backends, ogr_driver)
+
+        # fields and indexes of datasets keyed by (dataset name, dataset
+        # type), properties of datasets keyed by dataset type along with
+        # the labels of the properties read and metric sets keyed by
+        # (dataset name, dataset type, metrics classes)
+        self.datasets_fields = {}
+        self.datasets_indexes = {}
+        self.datasets_props = {}
+        self.datasets_metrics = {}
+        # sections of the workspace level objects keyed by name
+        self._sections = {}
+        return
+
+    # ----------------------------------------------------------------------
+    def get_section(self, name, records_factory):
+        """Get section built from the records once.
+
+        records_factory: callable:
+            function returning the records (or a generator of them)
+            of the section when it is built for the first time
+        """
+        if name not in self._sections:
+            self._sections[name] = Section.from_records(records_factory())
+        return self._sections[name]
+
+    # ----------------------------------------------------------------------
+    def create_reporter(self, out_report_folder_path, feature_dataset=None):
+        """Create `Reporter` of the geodatabase sharing this session.
+
+        out_report_folder_path: str:
+            path to the folder of the report; every report should have
+            its own folder as the report files are replaced
+
+        feature_dataset: str:
+            name of the feature dataset to report only the feature
+            classes of; all datasets are reported by default
+
+        The reporter should be closed (or used in a `with` block) when
+        the reports are written.
+        """
+        # imported here as the reporter creates a session when it is not
+        # given one
+        from registrant._reporter import Reporter
+        return Reporter(
+            self.gdb_path, out_report_folder_path, session=self,
+            feature_dataset=feature_dataset)
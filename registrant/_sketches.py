@@ -0,0 +1,312 @@
+# -*- coding: UTF-8 -*-
+"""Mergeable approximate sketches used for profiling huge tables.
+
+All sketches have bounded memory footprint regardless of number of values
+seen, are updated with whole batches of values (numpy arrays) and can be
+merged with sketches of the same kind built for other chunks of a table
+(for instance, read by other worker processes).
+
+* `HyperLogLog` estimates number of distinct values,
+* `KllSketch` estimates quantiles of numeric values,
+* `FrequentItems` finds most frequent values (Misra-Gries summary).
+"""
+from __future__ import division
+import math
+import random
+
+from registrant._lazy import numpy as np
+
+from registrant._config import (
+    SKETCH_HLL_PRECISION,
+    SKETCH_KLL_K,
+    SKETCH_TOP_K_CAPACITY,
+)
+
+# values which are not numbers are hashed in chunks of this many values
+# to bound the memory of their fixed width strings representation
+_HASH_CHUNK_SIZE = 8192
+# bits of floats which are not integers are mixed with this value so
+# that they do not hash the same as integers of the same bits
+_FLOAT_HASH_SEED = 0x5851F42D4C957F2D
+
+
+# ----------------------------------------------------------------------
+def _splitmix64(values):
+    """Scramble bits of uint64 values with the splitmix64 finalizer."""
+    with np.errstate(over='ignore'):
+        z = values + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+# ----------------------------------------------------------------------
+def hash_values(values):
+    """Get 64-bit hashes of array of values stable across processes.
+
+    Numbers are hashed by value (so that 1 and 1.0 hash the same) and dates
+    by their number of seconds. Any other values are hashed by the code
+    points of their `str` representation (or by the bytes of `bytes`
+    arrays). Hashing is vectorized for all kinds of values.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        values = values.astype('datetime64[s]').astype(np.int64)
+    if values.dtype.kind in 'biu':
+        # integers are hashed by their 64 bits so that large integers
+        # which are not represented exactly by floats do not collide
+        return _splitmix64(values.astype(np.int64).view(np.uint64))
+    if values.dtype.kind == 'f':
+        # adding 0.0 normalizes -0.0 to 0.0
+        values = values.astype(np.float64) + 0.0
+        integral = (np.floor(values) == values) & (np.abs(values) < 2.0**63)
+        bits = np.where(
+            integral,
+            np.where(integral, values, 0).astype(np.int64).view(np.uint64),
+            values.view(np.uint64) ^ np.uint64(_FLOAT_HASH_SEED))
+        return _splitmix64(bits)
+
+    hashes = np.empty(values.size, dtype=np.uint64)
+    values = values.ravel()
+    for start in range(0, values.size, _HASH_CHUNK_SIZE):
+        chunk = values[start:start + _HASH_CHUNK_SIZE]
+        if chunk.dtype.kind not in 'SU':
+            chunk = chunk.astype(np.str_)
+        hashes[start:start + _HASH_CHUNK_SIZE] = _hash_strings(chunk)
+    return hashes
+
+
+# ----------------------------------------------------------------------
+def _hash_strings(values):
+    """Get 64-bit hashes of fixed width strings or bytes array.
+
+    The bytes of all values are read as columns of 64-bit words which
+    are mixed into the hashes of the lengths of values one column at
+    a time; only the words of a value are mixed into its hash, so the
+    hash does not depend on the width of the array.
+    """
+    width = values.dtype.itemsize
+    words = np.zeros((values.size, -(-width // 8) * 8), dtype=np.uint8)
+    words[:, :width] = values.view(np.uint8).reshape(values.size, width)
+    # strings are stored as 4 bytes long code points
+    lengths = np.char.str_len(values) * (4 if values.dtype.kind == 'U'
+                                         else 1)
+    hashes = _splitmix64(lengths.astype(np.uint64))
+    for index, column in enumerate(words.view('<u8').T):
+        hashes = np.where(lengths > index * 8,
+                          _splitmix64(hashes ^ column), hashes)
+    return hashes
+
+
+# ----------------------------------------------------------------------
+def _to_bytes(value):
+    """Get bytes of a value used for hashing."""
+    if isinstance(value, bytes):
+        return value
+    return u'{0}'.format(value).encode('utf-8')
+
+
+# ----------------------------------------------------------------------
+def _bit_length(values):
+    """Get number of bits needed to represent each of uint64 values."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # uint32 values are represented by float64 exactly
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+########################################################################
+class HyperLogLog(object):
+    """HyperLogLog sketch estimating number of distinct values."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, precision=SKETCH_HLL_PRECISION):
+        """Initialize `HyperLogLog` with 2 ** precision registers."""
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    # ----------------------------------------------------------------------
+    @property
+    def relative_error(self):
+        """Get standard error of the estimate relative to true count."""
+        return 1.04 / math.sqrt(self.registers.size)
+
+    # ----------------------------------------------------------------------
+    def update(self, hashes):
+        """Update the sketch with array of uint64 hashes of values."""
+        if not hashes.size:
+            return
+        bits = np.uint64(64 - self.precision)
+        indexes = (hashes >> bits).astype(np.int64)
+        remainder = hashes & ((np.uint64(1) << bits) - np.uint64(1))
+        ranks = (int(bits) - _bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, indexes, ranks)
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge sketch built with other values into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    # ----------------------------------------------------------------------
+    def estimate(self):
+        """Get estimated number of distinct values."""
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(2.0**-self.registers.astype(np.float64))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # small range correction with linear counting
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+########################################################################
+class KllSketch(object):
+    """KLL sketch estimating quantiles of numeric values.
+
+    Values are kept in a hierarchy of compactors where an item at level
+    `h` represents `2 ** h` original values. Capacity of compactors shrinks
+    geometrically towards the lower levels so that the total number of
+    retained items stays close to `3 * k`.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, k=SKETCH_KLL_K, seed=None):
+        """Initialize `KllSketch` with accuracy parameter `k`."""
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._random = random.Random(seed)
+
+    # ----------------------------------------------------------------------
+    @property
+    def rank_error(self):
+        """Get normalized rank error of the quantiles (99% confidence)."""
+        return 2.296 / self.k**0.9723
+
+    # ----------------------------------------------------------------------
+    def update(self, values):
+        """Update the sketch with array of numeric values."""
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        self.count += values.size
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge sketch built with other values into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self._compress()
+        return self
+
+    # ----------------------------------------------------------------------
+    def quantiles(self, fractions):
+        """Get estimated values at the given fractions of ranks (0..1)."""
+        if not self.count:
+            return [None for _fraction in fractions]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items_level), 2**level, dtype=np.float64)
+            for level, items_level in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='mergesort')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(
+            cumulative, np.asarray(fractions) * cumulative[-1], side='left')
+        return [
+            float(items[min(position,
+                            len(items) - 1)]) for position in positions
+        ]
+
+    # ----------------------------------------------------------------------
+    def _capacity(self, level):
+        """Get capacity of compactor at the given level."""
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3)**depth)), 2)
+
+    # ----------------------------------------------------------------------
+    def _compress(self):
+        """Compact levels exceeding their capacity until all of them fit."""
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(0, len(self.levels)):
+                items = self.levels[level]
+                if len(items) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # an odd item stays at this level
+                leftover, items = items[:len(items) % 2], items[len(
+                    items) % 2:]
+                promoted = items[self._random.getrandbits(1)::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate(
+                    (self.levels[level + 1], promoted))
+                compacted = True
+
+
+########################################################################
+class FrequentItems(object):
+    """Misra-Gries summary finding the most frequent values.
+
+    Stored counts are lower bounds of true counts; true count of any value
+    exceeds its stored count by at most `max_error`.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, capacity=SKETCH_TOP_K_CAPACITY):
+        """Initialize `FrequentItems` keeping at most `capacity` counters."""
+        self.capacity = capacity
+        self.counters = {}
+        self.max_error = 0
+
+    # ----------------------------------------------------------------------
+    def update(self, values):
+        """Update the summary with array of values."""
+        if not len(values):
+            return
+        if np.asarray(values).dtype == object:
+            items, counts = np.unique(
+                np.array([_to_bytes(value) for value in values],
+                         dtype=object),
+                return_counts=True)
+        else:
+            items, counts = np.unique(values, return_counts=True)
+        self._add_counts(zip(items.tolist(), counts.tolist()))
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge summary built with other values into this one."""
+        self.max_error += other.max_error
+        self._add_counts(other.counters.items())
+        return self
+
+    # ----------------------------------------------------------------------
+    def top(self, k):
+        """Get up to `k` most frequent values as (value, count) pairs."""
+        return sorted(
+            self.counters.items(), key=lambda pair: (-pair[1], pair[0]))[:k]
+
+    # ----------------------------------------------------------------------
+    def _add_counts(self, pairs):
+        """Add counts and reduce counters to capacity if needed."""
+        for item, count in pairs:
+            self.counters[item] = self.counters.get(item, 0) + count
+        if len(self.counters) > self.capacity:
+            decrement = sorted(
+                self.counters.values(), reverse=True)[self.capacity]
+            self.max_error += decrement
+            self.counters = {
+                item: count - decrement
+                for item, count in self.counters.items()
+                if count > decrement
+            }
@@ -0,0 +1,500 @@
+# -*- coding: UTF-8 -*-
+"""Snapshots of the geodatabase schema and differences between them.
+
+A snapshot holds the records the reporter gathers about the datasets
+(properties, fields, indexes and subtypes), the domains and the
+relationship classes. Every record gets a fingerprint which is the SHA-1
+hash of its canonical JSON representation, so two snapshots are compared
+by looking up the fingerprints of the same objects and only the objects
+with different fingerprints are compared element by element. Snapshots
+of many geodatabases sharing a schema are compared by grouping identical
+fingerprints of every object, so that only the geodatabases deviating
+from the majority are compared with it.
+"""
+import json
+import math
+import hashlib
+import datetime
+from codecs import open
+from collections import OrderedDict, Counter
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from registrant._util_mappings import (
+    GDB_SCHEMA_CHANGE_PROPS,
+    GDB_SCHEMA_OUTLIER_PROPS,
+    GDB_SCHEMA_CLUSTER_PROPS,
+)
+from registrant._config import (
+    DATASET_TYPE_TABLE,
+    DATASET_TYPE_FC,
+    SNAPSHOT_FORMAT_VERSION,
+    SNAPSHOT_DATA_PROPS,
+)
+
+OBJECT_TYPES = {
+    DATASET_TYPE_TABLE: 'Table',
+    DATASET_TYPE_FC: 'Feature class',
+}
+OBJECT_TYPE_DOMAIN = 'Domain'
+OBJECT_TYPE_RELATIONSHIP_CLASS = 'Relationship class'
+
+CHANGE_ADDED = 'Added'
+CHANGE_REMOVED = 'Removed'
+CHANGE_MODIFIED = 'Modified'
+
+DEVIATION_MISSING = 'Missing'
+DEVIATION_EXTRA = 'Extra'
+DEVIATION_DIFFERENT = 'Different schema'
+
+# elements of dataset records compared one by one, with the property
+# identifying an element
+_DATASET_ELEMENTS = OrderedDict([
+    ('fields', ('Field', 'Name')),
+    ('indexes', ('Index', 'Name')),
+    ('subtypes', ('Subtype', 'Name')),
+])
+
+
+# ----------------------------------------------------------------------
+def _canonicalize(value):
+    """Get value made of JSON types only, with dict keys as strings."""
+    if isinstance(value, Mapping):
+        return {
+            u'{0}'.format(k): _canonicalize(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(item) for item in value]
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    try:
+        # numpy scalars
+        return _canonicalize(value.item())
+    except AttributeError:
+        return u'{0}'.format(value)
+
+
+# ----------------------------------------------------------------------
+def get_fingerprint(value):
+    """Get SHA-1 hash of the canonical JSON representation of value."""
+    canonical = json.dumps(
+        _canonicalize(value),
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=True)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def make_dataset_record(name,
+                        dataset_type,
+                        props,
+                        fields,
+                        indexes=None,
+                        subtypes=None):
+    """Get record of dataset schema with its fingerprints.
+
+    The fields have their own fingerprint to find datasets with the
+    same fields layout. Properties depending on the data (such as
+    row count) are left out.
+    """
+    record = OrderedDict([
+        ('name', name),
+        ('type', dataset_type),
+        ('props', _canonicalize(
+            OrderedDict((k, v) for k, v in (props or {}).items()
+                        if k not in SNAPSHOT_DATA_PROPS))),
+        ('fields', _canonicalize(fields or [])),
+        ('indexes', _canonicalize(indexes or [])),
+        ('subtypes', _canonicalize(subtypes or [])),
+    ])
+    record['fieldsFingerprint'] = get_fingerprint(record['fields'])
+    record['fingerprint'] = get_fingerprint(
+        [record[k] for k in ('props', 'fields', 'indexes', 'subtypes')])
+    return record
+
+
+# ----------------------------------------------------------------------
+def _make_object_record(props):
+    """Get record of domain or relationship class with its fingerprint."""
+    props = _canonicalize(props)
+    return OrderedDict([
+        ('name', props.get('Name', '')),
+        ('props', props),
+        ('fingerprint', get_fingerprint(props)),
+    ])
+
+
+# ----------------------------------------------------------------------
+def make_snapshot(gdb_name, datasets, domains, relationship_classes):
+    """Get snapshot of the geodatabase schema as ordered dict.
+
+    datasets: list:
+        records as returned by `make_dataset_record`
+
+    domains: list:
+        domains as returned by `get_domains`
+
+    relationship_classes: list:
+        relationship classes as returned by `get_relationship_classes`
+    """
+    snapshot = OrderedDict([
+        ('version', SNAPSHOT_FORMAT_VERSION),
+        ('geodatabase', gdb_name),
+        ('created', datetime.datetime.now().isoformat()),
+        ('datasets', sorted(
+            datasets, key=lambda record: (record['type'],
+                                          record['name'].lower()))),
+        ('domains', sorted(
+            (_make_object_record(domain) for domain in domains),
+            key=lambda record: record['name'].lower())),
+        ('relationshipClasses', sorted(
+            (_make_object_record(rel_class)
+             for rel_class in relationship_classes),
+            key=lambda record: record['name'].lower())),
+    ])
+    snapshot['fingerprint'] = get_fingerprint([
+        [record['fingerprint'] for record in snapshot[k]]
+        for k in ('datasets', 'domains', 'relationshipClasses')
+    ])
+    return snapshot
+
+
+# ----------------------------------------------------------------------
+def save_snapshot(snapshot, path):
+    """Save snapshot to a JSON file."""
+    with open(path, 'w', encoding='utf-8') as snapshot_file:
+        snapshot_file.write(
+            json.dumps(snapshot, indent=1, ensure_ascii=False))
+    return
+
+
+# ----------------------------------------------------------------------
+def load_snapshot(path):
+    """Load snapshot from a JSON file keeping the order of properties."""
+    with open(path, 'r', encoding='utf-8') as snapshot_file:
+        snapshot = json.loads(snapshot_file.read(),
+                              object_pairs_hook=OrderedDict)
+    if snapshot.get('version') != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError('Version {0} of snapshot is not supported'.format(
+            snapshot.get('version')))
+    return snapshot
+
+
+# ----------------------------------------------------------------------
+def make_change(object_type, name, change, details='', element=''):
+    """Get change as ordered dict ready to write into report."""
+    values = {
+        'objectType': object_type,
+        'name': name,
+        'element': element,
+        'change': change,
+        'details': details,
+    }
+    return OrderedDict(
+        (v, values[k]) for k, v in GDB_SCHEMA_CHANGE_PROPS.items())
+
+
+# ----------------------------------------------------------------------
+def _format_value(value):
+    """Format property value for the change details."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return u'{0}'.format(value)
+
+
+# ----------------------------------------------------------------------
+def _diff_props(old_props, new_props):
+    """Get description of the properties changed as `name: old -> new`."""
+    names = list(old_props.keys()) + [
+        name for name in new_props.keys() if name not in old_props
+    ]
+    return '; '.join(
+        u'{0}: {1} -> {2}'.format(name,
+                                  _format_value(old_props.get(name, '')),
+                                  _format_value(new_props.get(name, '')))
+        for name in names if old_props.get(name) != new_props.get(name))
+
+
+# ----------------------------------------------------------------------
+def _diff_elements(old_elements, new_elements, key):
+    """Get (element name, change, details) of elements changed."""
+    old_by_key = OrderedDict(
+        (u'{0}'.format(element.get(key)).lower(), element)
+        for element in old_elements)
+    new_by_key = OrderedDict(
+        (u'{0}'.format(element.get(key)).lower(), element)
+        for element in new_elements)
+
+    changes = []
+    for element_key, old_element in old_by_key.items():
+        new_element = new_by_key.get(element_key)
+        if new_element is None:
+            changes.append((old_element.get(key), CHANGE_REMOVED, ''))
+        elif new_element != old_element:
+            changes.append((new_element.get(key), CHANGE_MODIFIED,
+                            _diff_props(old_element, new_element)))
+    for element_key, new_element in new_by_key.items():
+        if element_key not in old_by_key:
+            changes.append((new_element.get(key), CHANGE_ADDED, ''))
+    return changes
+
+
+# ----------------------------------------------------------------------
+def _diff_datasets(old_record, new_record):
+    """Get changes of a dataset which fingerprint has changed."""
+    object_type = OBJECT_TYPES.get(new_record['type'], new_record['type'])
+    changes = []
+    if old_record['props'] != new_record['props']:
+        changes.append(
+            make_change(object_type, new_record['name'], CHANGE_MODIFIED,
+                        _diff_props(old_record['props'],
+                                    new_record['props'])))
+
+    for elements, (element_type, key) in _DATASET_ELEMENTS.items():
+        if (elements == 'fields' and old_record['fieldsFingerprint']
+                == new_record['fieldsFingerprint']):
+            continue
+        for element_name, change, details in _diff_elements(
+                old_record[elements], new_record[elements], key):
+            changes.append(
+                make_change(
+                    object_type,
+                    new_record['name'],
+                    change,
+                    details,
+                    element=u'{0} {1}'.format(element_type, element_name)))
+    return changes
+
+
+# ----------------------------------------------------------------------
+def _diff_records(old_records, new_records, get_key, diff_changed):
+    """Get changes between two lists of records matched by key.
+
+    Records are looked up by key so the lists are compared in linear
+    time; `diff_changed` is called only for records with different
+    fingerprints and records added or removed are reported as a whole.
+    """
+    old_by_key = OrderedDict(
+        (get_key(record), record) for record in old_records)
+    new_by_key = OrderedDict(
+        (get_key(record), record) for record in new_records)
+
+    changes = []
+    for key, old_record in old_by_key.items():
+        new_record = new_by_key.get(key)
+        if new_record is None:
+            changes.extend(diff_changed(old_record, None))
+        elif new_record['fingerprint'] != old_record['fingerprint']:
+            changes.extend(diff_changed(old_record, new_record))
+    for key, new_record in new_by_key.items():
+        if key not in old_by_key:
+            changes.extend(diff_changed(None, new_record))
+    return changes
+
+
+# ----------------------------------------------------------------------
+def diff_snapshots(old_snapshot, new_snapshot):
+    """Get changes of the schema between two snapshots.
+
+    Return list of ordered dicts ready to write into report; nothing is
+    compared when the fingerprints of the snapshots are the same.
+    """
+    if old_snapshot['fingerprint'] == new_snapshot['fingerprint']:
+        return []
+
+    def diff_datasets(old_record, new_record):
+        """Get changes of dataset, added or removed as a whole."""
+        record = new_record or old_record
+        if old_record is None or new_record is None:
+            return [
+                make_change(
+                    OBJECT_TYPES.get(record['type'], record['type']),
+                    record['name'],
+                    CHANGE_ADDED if old_record is None else CHANGE_REMOVED)
+            ]
+        return _diff_datasets(old_record, new_record)
+
+    def diff_objects(object_type):
+        """Get function getting changes of domain or relationship class."""
+
+        def diff_object(old_record, new_record):
+            """Get changes of domain or relationship class."""
+            if old_record is None:
+                return [
+                    make_change(object_type, new_record['name'], CHANGE_ADDED)
+                ]
+            if new_record is None:
+                return [
+                    make_change(object_type, old_record['name'],
+                                CHANGE_REMOVED)
+                ]
+            return [
+                make_change(object_type, new_record['name'], CHANGE_MODIFIED,
+                            _diff_props(old_record['props'],
+                                        new_record['props']))
+            ]
+
+        return diff_object
+
+    def get_name_key(record):
+        """Get key matching records by name case insensitive."""
+        return record['name'].lower()
+
+    changes = _diff_records(
+        old_snapshot['domains'], new_snapshot['domains'], get_name_key,
+        diff_objects(OBJECT_TYPE_DOMAIN))
+    changes.extend(
+        _diff_records(old_snapshot['relationshipClasses'],
+                      new_snapshot['relationshipClasses'], get_name_key,
+                      diff_objects(OBJECT_TYPE_RELATIONSHIP_CLASS)))
+    changes.extend(
+        _diff_records(
+            old_snapshot['datasets'], new_snapshot['datasets'],
+            lambda record: (record['type'], record['name'].lower()),
+            diff_datasets))
+    return changes
+
+
+# ----------------------------------------------------------------------
+def _get_object_key(category, record):
+    """Get key matching the same object in different snapshots."""
+    if category == 'datasets':
+        return record['type'], record['name'].lower()
+    return record['name'].lower()
+
+
+# ----------------------------------------------------------------------
+def _get_object_type(category, record):
+    """Get type of object of a snapshot record for the report."""
+    if category == 'datasets':
+        return OBJECT_TYPES.get(record['type'], record['type'])
+    if category == 'domains':
+        return OBJECT_TYPE_DOMAIN
+    return OBJECT_TYPE_RELATIONSHIP_CLASS
+
+
+# ----------------------------------------------------------------------
+def _describe_difference(category, record, other_record):
+    """Get description of how a record differs from other one."""
+    if category != 'datasets':
+        return _diff_props(record['props'], other_record['props'])
+    return '; '.join(
+        u'{0} {1}{2}'.format(
+            change[GDB_SCHEMA_CHANGE_PROPS['element']] or 'Properties',
+            change[GDB_SCHEMA_CHANGE_PROPS['change']].lower(),
+            u' ({0})'.format(change[GDB_SCHEMA_CHANGE_PROPS['details']])
+            if change[GDB_SCHEMA_CHANGE_PROPS['details']] else '')
+        for change in _diff_datasets(record, other_record))
+
+
+# ----------------------------------------------------------------------
+def make_outlier(geodatabase,
+                 object_type,
+                 name,
+                 deviation,
+                 shared_by='',
+                 details=''):
+    """Get outlier as ordered dict ready to write into report."""
+    values = {
+        'geodatabase': geodatabase,
+        'objectType': object_type,
+        'name': name,
+        'deviation': deviation,
+        'sharedBy': shared_by,
+        'details': details,
+    }
+    return OrderedDict(
+        (v, values[k]) for k, v in GDB_SCHEMA_OUTLIER_PROPS.items())
+
+
+# ----------------------------------------------------------------------
+def cluster_snapshots(snapshots):
+    """Find the geodatabases deviating from the schema of the majority.
+
+    snapshots: OrderedDict:
+        geodatabase label and its snapshot
+
+    The records of every object are grouped by fingerprint across all
+    the snapshots in a single pass; an object is reported only for the
+    geodatabases which fingerprint (or absence of the object) differs
+    from the most common one. Only outliers are compared with a record
+    of the majority. When the counts are equal, the geodatabase listed
+    first wins.
+
+    Return tuple of list of geodatabases with their schema fingerprints
+    and list of outliers, both as ordered dicts ready to write into
+    report.
+    """
+    labels = list(snapshots.keys())
+    outliers = []
+    for category in ('domains', 'relationshipClasses', 'datasets'):
+        records_by_key = OrderedDict()
+        for label, snapshot in snapshots.items():
+            for record in snapshot[category]:
+                records_by_key.setdefault(
+                    _get_object_key(category, record),
+                    OrderedDict())[label] = record
+
+        for records in records_by_key.values():
+            fingerprints = [
+                records[label]['fingerprint'] if label in records else None
+                for label in labels
+            ]
+            counts = Counter(fingerprints)
+            if len(counts) == 1:
+                continue
+            majority = max(
+                counts,
+                key=lambda fingerprint: (counts[fingerprint],
+                                         -fingerprints.index(fingerprint)))
+            majority_record = next(
+                (record for record in records.values()
+                 if record['fingerprint'] == majority), None)
+
+            for label, fingerprint in zip(labels, fingerprints):
+                if fingerprint == majority:
+                    continue
+                record = records.get(label)
+                if majority_record is None:
+                    deviation, details = DEVIATION_EXTRA, ''
+                elif record is None:
+                    deviation, details = DEVIATION_MISSING, ''
+                else:
+                    deviation = DEVIATION_DIFFERENT
+                    details = _describe_difference(category,
+                                                   majority_record, record)
+                record = record or majority_record
+                outliers.append(
+                    make_outlier(
+                        label, _get_object_type(category, record),
+                        record['name'], deviation, '{0} of {1}'.format(
+                            counts[fingerprint], len(labels)), details))
+
+    outliers_counts = Counter(
+        outlier[GDB_SCHEMA_OUTLIER_PROPS['geodatabase']]
+        for outlier in outliers)
+    schemas_counts = Counter(
+        snapshot['fingerprint'] for snapshot in snapshots.values())
+    clusters = []
+    for label, snapshot in snapshots.items():
+        values = {
+            'geodatabase': label,
+            'fingerprint': snapshot['fingerprint'],
+            'sharedBy': '{0} of {1}'.format(
+                schemas_counts[snapshot['fingerprint']], len(labels)),
+            'outliersCount': outliers_counts[label],
+        }
+        clusters.append(
+            OrderedDict(
+                (v, values[k]) for k, v in GDB_SCHEMA_CLUSTER_PROPS.items()))
+    return clusters, outliers
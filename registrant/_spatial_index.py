@@ -0,0 +1,113 @@
+# -*- coding: UTF-8 -*-
+"""Health of the spatial indexes of the feature classes.
+
+A file geodatabase spatial index is a grid of cells; a feature is
+indexed in every cell its envelope intersects. Cells much smaller than
+the features make every feature indexed in many cells while cells much
+larger than the features make every cell hold too many features, and
+both make spatial queries slower. The grid sizes are compared with the
+extent of the feature class and the average size of features envelopes.
+"""
+from __future__ import division
+import math
+from collections import OrderedDict
+
+from registrant._util_mappings import GDB_SPATIAL_INDEX_PROPS
+from registrant._config import (
+    FINDING_SEVERITIES,
+    SPATIAL_INDEX_MIN_GRID_RATIO,
+    SPATIAL_INDEX_MAX_GRID_RATIO,
+)
+
+SEVERITY_HIGH, SEVERITY_MEDIUM, SEVERITY_LOW = FINDING_SEVERITIES
+
+
+# ----------------------------------------------------------------------
+def _get_extent_size(extent):
+    """Get (width, height) of extent or `None` when the extent is unknown."""
+    if not extent or any(math.isnan(value) for value in extent):
+        return None
+    return extent[2] - extent[0], extent[3] - extent[1]
+
+
+# ----------------------------------------------------------------------
+def _format_size(size):
+    """Format (width, height) pair for the report."""
+    if size is None:
+        return ''
+    return ' x '.join('{0:.6g}'.format(value) for value in size)
+
+
+# ----------------------------------------------------------------------
+def assess_spatial_index(name,
+                         has_spatial_index,
+                         grid_sizes=None,
+                         extent=None,
+                         average_envelope=None,
+                         index_size=''):
+    """Assess the spatial index configuration of a feature class.
+
+    grid_sizes: list:
+        sizes of the spatial index grids, the first one is the smallest
+
+    extent: tuple:
+        xmin, ymin, xmax, ymax of the feature class
+
+    average_envelope: tuple:
+        average width and height of the features envelopes; known only
+        when the geometries were read
+
+    Return ordered dict ready to write into report; issues found have
+    the severity of the most severe one.
+    """
+    grid_sizes = grid_sizes or []
+    extent_size = _get_extent_size(extent)
+    feature_size = max(average_envelope) if average_envelope else None
+    grid_size = grid_sizes[0] if grid_sizes else None
+
+    issues = []
+    grid_ratio = grid_cells = ''
+    if not has_spatial_index:
+        issues.append((SEVERITY_HIGH, 'No spatial index'))
+    elif grid_size is None:
+        if extent_size is not None:
+            issues.append((SEVERITY_MEDIUM,
+                           'Grid size is not set; recalculate the index'))
+    else:
+        if extent_size is not None:
+            grid_cells = int(
+                max(math.ceil(extent_size[0] / grid_size), 1)
+                * max(math.ceil(extent_size[1] / grid_size), 1))
+            if grid_size >= max(extent_size) and max(extent_size) > 0:
+                issues.append((SEVERITY_MEDIUM,
+                               'Single grid cell covers the whole extent'))
+        # points have empty envelopes so their size cannot be compared
+        if feature_size:
+            grid_ratio = round(grid_size / feature_size, 2)
+            if grid_ratio < SPATIAL_INDEX_MIN_GRID_RATIO:
+                issues.append((
+                    SEVERITY_MEDIUM,
+                    'Grid is smaller than features; every feature is '
+                    'indexed in many cells'))
+            elif grid_ratio > SPATIAL_INDEX_MAX_GRID_RATIO:
+                issues.append((
+                    SEVERITY_LOW,
+                    'Grid is much larger than features; every cell '
+                    'holds too many features'))
+
+    values = {
+        'name': name,
+        'hasSpatialIndex': bool(has_spatial_index),
+        'gridSizes': ', '.join('{0:g}'.format(size) for size in grid_sizes),
+        'extentSize': _format_size(extent_size),
+        'averageEnvelope': _format_size(average_envelope),
+        'gridRatio': grid_ratio,
+        'gridCells': grid_cells,
+        'indexSize': index_size,
+        'severity': min(
+            (severity for severity, _issue in issues),
+            key=FINDING_SEVERITIES.index) if issues else '',
+        'issues': '; '.join(issue for _severity, issue in issues),
+    }
+    return OrderedDict(
+        (v, values[k]) for k, v in GDB_SPATIAL_INDEX_PROPS.items())
@@ -92,6 +92,12 @@ OGR_GDB_DOMAIN_PROPS = OrderedDict([
     ('FieldType', 'Data type'),
 ])
 
+GDB_DOMAIN_CODE_USAGE_PROPS = OrderedDict([
+    ('code', 'Code'),
+    ('value', 'Value'),
+    ('isValidCode', 'Is valid code'),
+])
+
 # http://resources.esri.com/help/9.3/arcgisengine/arcobjects/
 # esriGeodatabase/esriFieldType.htm
 OGR_DOMAIN_PROPS_MAPPINGS = {
@@ -186,6 +192,142 @@ GDB_FC_PROPS = OrderedDict([
     ('lengthFieldName', 'Length field'),
 ])
 
+GDB_FIELD_PROFILE_PROPS = OrderedDict([
+    ('name', 'Name'),
+    ('type', 'Type'),
+    ('rowCount', 'Row count'),
+    ('nullCount', 'Null count'),
+    ('minValue', 'Min'),
+    ('maxValue', 'Max'),
+    ('meanValue', 'Mean'),
+    ('length', 'Length'),
+    ('maxLengthUsed', 'Max length used'),
+    ('lengthUsedRatio', 'Length used, %'),
+])
+
+GDB_FIELD_SKETCH_PROPS = OrderedDict([
+    ('distinctCount', 'Distinct values (approx.)'),
+    ('quartiles', 'Quartiles (approx.)'),
+    ('topValues', 'Most frequent values (approx.)'),
+])
+
+GDB_FC_GEOMETRY_STATS_PROPS = OrderedDict([
+    ('featureCount', 'Features'),
+    ('emptyCount', 'Empty or null geometries'),
+    ('unsupportedCount', 'Geometries of unknown types'),
+    ('extent', 'Extent'),
+    ('avgVertices', 'Average vertices'),
+    ('verticesQuantiles', 'Vertices p50 / p90 / p99'),
+    ('maxVertices', 'Max vertices'),
+    ('avgParts', 'Average parts'),
+    ('maxParts', 'Max parts'),
+    ('avgBytes', 'Average size, bytes'),
+    ('maxBytes', 'Max size, bytes'),
+    ('avgEnvelope', 'Average envelope (width x height)'),
+])
+
+GDB_ATTACHMENTS_PROPS = OrderedDict([
+    ('parentName', 'Dataset'),
+    ('name', 'Attachment table'),
+    ('count', 'Attachments count'),
+    ('totalSize', 'Total size, bytes'),
+    ('avgSize', 'Average size, bytes'),
+    ('maxSize', 'Max size, bytes'),
+    ('largest', 'Largest attachments'),
+])
+
+GDB_STORAGE_PROPS = OrderedDict([
+    ('name', 'Name'),
+    ('fileName', 'File name'),
+    ('rowCount', 'Row count'),
+    ('deletedRowCount', 'Deleted rows'),
+    ('deletedRatio', 'Deleted rows, %'),
+    ('tableSize', 'Table size, bytes'),
+    ('indexesSize', 'Indexes size, bytes'),
+    ('spatialIndexSize', 'Spatial index size, bytes'),
+    ('freeListSize', 'Free list size, bytes'),
+    ('totalSize', 'Total size, bytes'),
+    ('bytesPerRow', 'Bytes per row'),
+    ('isCompressed', 'Is compressed'),
+])
+
+GDB_FINDING_PROPS = OrderedDict([
+    ('priority', 'Priority'),
+    ('severity', 'Severity'),
+    ('dataset', 'Dataset'),
+    ('field', 'Field'),
+    ('finding', 'Finding'),
+    ('details', 'Details'),
+])
+
+GDB_SPATIAL_INDEX_PROPS = OrderedDict([
+    ('name', 'Name'),
+    ('hasSpatialIndex', 'Has spatial index'),
+    ('gridSizes', 'Grid sizes'),
+    ('extentSize', 'Extent (width x height)'),
+    ('averageEnvelope', 'Average envelope (width x height)'),
+    ('gridRatio', 'Grid size to feature size'),
+    ('gridCells', 'Grid cells in extent'),
+    ('indexSize', 'Index size, bytes'),
+    ('severity', 'Severity'),
+    ('issues', 'Issues'),
+])
+
+GDB_SCHEMA_CHANGE_PROPS = OrderedDict([
+    ('objectType', 'Object type'),
+    ('name', 'Name'),
+    ('element', 'Element'),
+    ('change', 'Change'),
+    ('details', 'Details'),
+])
+
+GDB_SCHEMA_OUTLIER_PROPS = OrderedDict([
+    ('geodatabase', 'Geodatabase'),
+    ('objectType', 'Object type'),
+    ('name', 'Name'),
+    ('deviation', 'Deviation'),
+    ('sharedBy', 'Same schema in'),
+    ('details', 'Details'),
+])
+
+GDB_SCHEMA_CLUSTER_PROPS = OrderedDict([
+    ('geodatabase', 'Geodatabase'),
+    ('fingerprint', 'Schema fingerprint'),
+    ('sharedBy', 'Same schema in'),
+    ('outliersCount', 'Deviating objects'),
+])
+
+GDB_GROWTH_PROPS = OrderedDict([
+    ('name', 'Name'),
+    ('runsCount', 'Runs'),
+    ('firstRun', 'First run'),
+    ('rowCount', 'Row count'),
+    ('rowsPerDay', 'Rows per day'),
+    ('rowsHistory', 'Rows over time'),
+    ('rowsThresholdDate', 'Row count threshold reached'),
+    ('size', 'Size, bytes'),
+    ('bytesPerDay', 'Bytes per day'),
+    ('sizeHistory', 'Bytes over time'),
+    ('sizeThresholdDate', 'Size threshold reached'),
+    ('fieldCount', 'Field count'),
+])
+
+# field types (as reported by `arcpy` and `OGR`) that can be profiled
+PROFILE_FIELD_KINDS = {
+    'SmallInteger': 'numeric',
+    'Integer': 'numeric',
+    'Integer64': 'numeric',
+    'Single': 'numeric',
+    'Double': 'numeric',
+    'Real': 'numeric',
+    'String': 'string',
+    'Date': 'date',
+    'DateTime': 'date',
+}
+# numeric field types profiled as integers so that the values not
+# represented exactly by floats are kept
+PROFILE_INTEGER_FIELD_TYPES = ('SmallInteger', 'Integer', 'Integer64')
+
 STRING_TO_BOOLEAN = {
     'false': False,
     'true': True,
@@ -35,9 +35,12 @@ setup(
     ],
     include_package_data=True,
     install_requires=[
-        'pandas>=0.20.1',
+        'numpy>=1.13.0',
         'beautifulsoup4>=4.6.0',
     ],
+    extras_require={
+        'pandas': ['pandas>=0.20.1'],
+    },
     package_data={
         'registrant/html-template': [
             'template.html',
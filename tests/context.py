@@ -18,8 +18,8 @@ except BaseException:
     import registrant  # noqa: F401
 
 temp_dir = tempfile.gettempdir()
-for gdb_zip in [r'data\Adv_ogr_gdb.zip', r'data\Basic_ogr_gdb.zip']:
-    zip_ref = zipfile.ZipFile(gdb_zip, 'r')
+for gdb_zip in ['Adv_ogr_gdb.zip', 'Basic_ogr_gdb.zip']:
+    zip_ref = zipfile.ZipFile(os.path.join('data', gdb_zip), 'r')
     zip_ref.extractall(temp_dir)
     zip_ref.close()
 
@@ -31,28 +31,28 @@ Running tests with Python installation with no arcpy available"""
 TEST_CONFIG = {
     'Basic': {
         'name': 'Basic',
-        'json_results': r'data\Basic.json',
-        'xml_schema': r'data\XmlBasicSchema.xml',
+        'json_results': os.path.join('data', 'Basic.json'),
+        'xml_schema': os.path.join('data', 'XmlBasicSchema.xml'),
     },
     'Advanced': {
         'name': 'Adv',
-        'json_results': r'data\Adv.json',
-        'xml_schema': r'data\XmlAdvSchema.xml',
+        'json_results': os.path.join('data', 'Adv.json'),
+        'xml_schema': os.path.join('data', 'XmlAdvSchema.xml'),
     },
     'Basic_ogr': {
         'name': 'Basic_ogr',
-        'json_results': r'data\Basic_ogr.json',
+        'json_results': os.path.join('data', 'Basic_ogr.json'),
         'ogr_geodatabase': os.path.join(temp_dir, 'Basic_ogr.gdb'),
     },
     'Advanced_ogr': {
         'name': 'Adv_ogr',
-        'json_results': r'data\Adv_ogr.json',
+        'json_results': os.path.join('data', 'Adv_ogr.json'),
         'ogr_geodatabase': os.path.join(temp_dir, 'Adv_ogr.gdb'),
     },
     'Complete': {
         'name': 'Complete',
-        'json_results': r'data\Compl.json',
-        'xml_schema': r'data\XmlComplSchema.xml',
+        'json_results': os.path.join('data', 'Compl.json'),
+        'xml_schema': os.path.join('data', 'XmlComplSchema.xml'),
     },
 }
 
@@ -180,3 +180,22 @@ def parse_fcs_from_html(html_file, json_file):
             shape_type == fcs_table.findChildren(['td'])[4].string,
         ])
     return (headers_match, row_values_match)
+
+
+# ----------------------------------------------------------------------
+def parse_fields_references_from_html(html_file):
+    """Parse html file and check the references to identical fields.
+
+    Return whether every reference links to a dataset which fields
+    table is reported; a report with no references passes as well.
+    """
+    with open(html_file, 'r') as fh:
+        page = BeautifulSoup(fh, HTML_PARSER)
+
+    for reference in page.findAll(name='div', attrs={'class':
+                                                     'section-reference'}):
+        target = page.find(id=reference.a['href'][1:])
+        if target is None or target.find_next(
+                ['h2', 'h3', 'table']).name != 'table':
+            return False
+    return True
@@ -0,0 +1,64 @@
+# -*- coding: UTF-8 -*-
+"""Tests for accounting of the attachments sizes.
+
+These tests do not need a geodatabase and can be run with any
+Python installation that has numpy installed.
+"""
+from __future__ import print_function
+import unittest
+
+import numpy as np
+
+from context import registrant  # noqa: F401
+from registrant._attachments import AttachmentsSizes
+
+
+########################################################################
+class AttachmentsSizesTest(unittest.TestCase):
+    """Test case for attachments sizes merged over batches."""
+
+    # ----------------------------------------------------------------------
+    def test_sizes(self):
+        """Test count, sizes and largest attachments of two chunks."""
+        sizes = AttachmentsSizes('DATA_SIZE', 'ATT_NAME', 'REL_OBJECTID')
+        sizes.update({
+            'DATA_SIZE': np.array([10, None, 300, 21], dtype=object),
+            'ATT_NAME': np.array(['a.txt', 'b.txt', 'c.jpg', None],
+                                 dtype=object),
+            'REL_OBJECTID': np.array([1, 1, 2, 3], dtype=object),
+        })
+        other = AttachmentsSizes('DATA_SIZE', 'ATT_NAME', 'REL_OBJECTID')
+        other.update({
+            'DATA_SIZE':
+            np.ma.masked_array(np.arange(100, 108), mask=[False] * 8),
+            'ATT_NAME':
+            np.ma.masked_array([b'd%d.pdf' % i for i in range(0, 8)],
+                               mask=[False] * 8),
+            'REL_OBJECTID':
+            np.ma.masked_array(np.arange(0, 8), mask=[False] * 8),
+        })
+        result = sizes.merge(other).finalize('Parcels', 'Parcels__ATTACH')
+        self.assertEqual(
+            list(result.values())[:6],
+            ['Parcels', 'Parcels__ATTACH', 12, 1159, 97, 300])
+        self.assertEqual(
+            result['Largest attachments'],
+            'c.jpg (REL_OBJECTID 2): 300, d7.pdf (REL_OBJECTID 7): 107, '
+            'd6.pdf (REL_OBJECTID 6): 106, d5.pdf (REL_OBJECTID 5): 105, '
+            'd4.pdf (REL_OBJECTID 4): 104')
+        return
+
+    # ----------------------------------------------------------------------
+    def test_no_size_column(self):
+        """Test that sizes are not reported without the size column."""
+        sizes = AttachmentsSizes(None)
+        sizes.count = 3
+        result = sizes.finalize('Parcels', 'Parcels__ATTACH')
+        self.assertEqual(
+            list(result.values()),
+            ['Parcels', 'Parcels__ATTACH', 3, '', '', '', ''])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+"""Tests for backends reading geodatabase objects.
+
+These tests read the test file geodatabases files directly and do not
+need either arcpy or GDAL installed.
+"""
+from __future__ import print_function
+import unittest
+
+from context import registrant, TEST_CONFIG  # noqa: F401
+from registrant._backends import FileGeodatabaseBackend, get_backends
+from registrant._config import DATASET_TYPE_FC, DATASET_TYPE_TABLE
+
+
+########################################################################
+class BackendsTest(unittest.TestCase):
+    """Test case for backends."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        """Set up the test with the advanced test geodatabase path."""
+        self.in_gdb = TEST_CONFIG['Advanced_ogr']['ogr_geodatabase']
+
+    # ----------------------------------------------------------------------
+    def test_fgdb_row_counts(self):
+        """Test reading row counts from the tables headers."""
+        self.assertTrue(FileGeodatabaseBackend.is_available(self.in_gdb))
+        backend = FileGeodatabaseBackend(self.in_gdb)
+        self.assertEqual(backend.get_row_count('Fc1', DATASET_TYPE_FC), 0)
+        self.assertIsNone(
+            backend.get_row_count('NotExisting', DATASET_TYPE_TABLE))
+        return
+
+    # ----------------------------------------------------------------------
+    def test_fgdb_not_available(self):
+        """Test that the backend is not used for other workspaces."""
+        self.assertFalse(
+            FileGeodatabaseBackend.is_available(self.in_gdb + '.sde'))
+        return
+
+    # ----------------------------------------------------------------------
+    def test_required_operations(self):
+        """Test that backends must read the catalog and properties."""
+        with self.assertRaises(ValueError):
+            get_backends(self.in_gdb, 'fgdb')
+        with self.assertRaises(ValueError):
+            get_backends(self.in_gdb, ['fgdb'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_unknown_backend(self):
+        """Test that unknown backend names are listed with valid ones."""
+        for backends in ('gdal', ['fgdb', 'gdal'], {'counts': 'gdal'}):
+            with self.assertRaises(ValueError) as context:
+                get_backends(self.in_gdb, backends)
+            self.assertIn("'gdal'", str(context.exception))
+            self.assertIn('fgdb, ogr, arcpy', str(context.exception))
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
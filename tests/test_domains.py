@@ -0,0 +1,101 @@
+# -*- coding: UTF-8 -*-
+"""Tests for matching of the fields values against domain codes.
+
+These tests do not need a geodatabase and can be run with any
+Python installation that has numpy installed.
+"""
+from __future__ import print_function
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+
+from context import registrant  # noqa: F401
+from registrant._domains import (
+    get_codes_usage,
+    get_domains_usage,
+    add_usage_columns,
+)
+from registrant._sections import Section
+from registrant._data_objects import count_batches_values
+
+
+########################################################################
+class DomainCodesUsageTest(unittest.TestCase):
+    """Test case for counting domain codes used in fields."""
+
+    # ----------------------------------------------------------------------
+    def test_count_batches_values(self):
+        """Test counting values of batches with null values."""
+        batches = [
+            {'Type': np.array([1, 2, None, 2], dtype=object)},
+            {'Type': np.ma.masked_array([2, 5], mask=[False, True])},
+        ]
+        self.assertEqual(
+            sorted(count_batches_values(batches, 'Type'),
+                   key=lambda pair: (pair[0] is not None, pair[0])),
+            [(None, 2), (1, 1), (2, 3)])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_codes_usage(self):
+        """Test unused codes and invalid values of fields."""
+        coded_values = OrderedDict([('1', 'Main'), ('2', 'Local'),
+                                    ('3', 'Private')])
+        fields_values_counts = OrderedDict([
+            ('Roads.Type', [(1, 10), (2.0, 5), (7, 1), (None, 4)]),
+            ('Paths.Type', [(2, 3)]),
+        ])
+        rows = get_codes_usage(coded_values, fields_values_counts)
+        self.assertEqual(
+            [list(row.values()) for row in rows],
+            [
+                ['1', 'Main', True, 10, 0],
+                ['2', 'Local', True, 5, 3],
+                ['3', 'Private', True, 0, 0],
+                ['7', '', False, 1, 0],
+            ],
+        )
+        self.assertEqual(
+            list(rows[0].keys()),
+            ['Code', 'Value', 'Is valid code', 'Roads.Type', 'Paths.Type'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_codes_usage_numeric_codes(self):
+        """Test invalid values listed with the type of numeric codes."""
+        coded_values = OrderedDict([(1, 'Main'), (2, 'Local')])
+        fields_values_counts = OrderedDict([
+            ('Roads.Type', [(1, 10), (7.0, 2), (2.5, 1)]),
+        ])
+        rows = get_codes_usage(coded_values, fields_values_counts)
+        self.assertEqual(
+            [(row['Code'], type(row['Code'])) for row in rows],
+            [(1, int), (2, int), (7, int), (2.5, float)])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_domains_usage(self):
+        """Test fields using domains listed for used and unused domains."""
+        datasets_fields = [
+            ('Roads', 'fc', [
+                OrderedDict([('Name', 'Type'), ('Domain', 'RoadTypes')]),
+                OrderedDict([('Name', 'Label'), ('Domain', '')]),
+            ]),
+            ('Paths', 'table', [
+                OrderedDict([('Name', 'Kind'), ('Domain', 'RoadTypes')]),
+            ]),
+        ]
+        section = add_usage_columns(
+            Section([('Name', ['RoadTypes', 'Surfaces'])]),
+            get_domains_usage(datasets_fields))
+        self.assertEqual(
+            [(row['Name'], row['Used by'], row['Is used'])
+             for row in section.records()],
+            [('RoadTypes', 'Roads.Type, Paths.Kind', True),
+             ('Surfaces', '', False)])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: UTF-8 -*-
+"""Tests for reading storage of file geodatabase tables from the headers.
+
+These tests read the test file geodatabases files directly and do not
+need either arcpy or GDAL installed.
+"""
+from __future__ import print_function
+import math
+import unittest
+
+from context import registrant, TEST_CONFIG  # noqa: F401
+from registrant._fgdb_storage import (
+    read_system_catalog,
+    read_geometry_field,
+    get_datasets_storage,
+)
+
+
+########################################################################
+class FileGeodatabaseStorageTest(unittest.TestCase):
+    """Test case for storage of file geodatabase tables."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        """Set up the test with the advanced test geodatabase path."""
+        self.in_gdb = TEST_CONFIG['Advanced_ogr']['ogr_geodatabase']
+
+    # ----------------------------------------------------------------------
+    def test_system_catalog(self):
+        """Test mapping of table names to their files."""
+        tables = dict(read_system_catalog(self.in_gdb))
+        self.assertEqual(tables[1], 'GDB_SystemCatalog')
+        self.assertEqual(tables[4], 'GDB_Items')
+        self.assertEqual(
+            [tables[object_id] for object_id in range(9, 14)],
+            ['Table1', 'Table2', 'Fc1', 'Fc2', 'FcInFd'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_datasets_storage(self):
+        """Test storage of user tables without system tables."""
+        storage = {
+            item['Name']: item
+            for item in get_datasets_storage(self.in_gdb)
+        }
+        self.assertEqual(
+            sorted(storage.keys()),
+            ['Fc1', 'Fc2', 'FcInFd', 'Table1', 'Table2'])
+        fc = storage['Fc1']
+        self.assertEqual(fc['File name'], 'a0000000b')
+        self.assertEqual(fc['Row count'], 0)
+        self.assertEqual(fc['Deleted rows'], 0)
+        self.assertEqual(fc['Spatial index size, bytes'], 4118)
+        self.assertEqual(fc['Total size, bytes'], 5429)
+        self.assertFalse(fc['Is compressed'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_geometry_field(self):
+        """Test reading geometry field description of feature classes."""
+        self.assertIsNone(read_geometry_field(self.in_gdb, 9))
+        geometry = read_geometry_field(self.in_gdb, 11)
+        # extent of an empty feature class is not set
+        self.assertTrue(math.isnan(geometry['xmin']))
+        self.assertEqual(geometry['gridSizes'], [])
+        self.assertTrue(geometry['isNullable'])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+"""Tests for performance findings derived from the geodatabase schema.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import unittest
+from collections import OrderedDict
+
+from context import registrant  # noqa: F401
+from registrant import _findings
+
+
+# ----------------------------------------------------------------------
+def make_rel_class(name, origin, destination, origin_keys, attributed=False):
+    """Make relationship class properties as read by `Geodatabase`."""
+    return OrderedDict([
+        ('Name', name),
+        ('Origin class names', origin),
+        ('Destination class names', destination),
+        ('Forward path label', ''),
+        ('Backward path label', ''),
+        ('Cardinality', 'OneToMany'),
+        ('Key type', 'Single'),
+        ('Class key', ''),
+        ('Origin class keys', origin_keys),
+        ('Destination class keys', ''),
+        ('Is attachment relationship', False),
+        ('Is attributed', attributed),
+        ('Is composite', False),
+        ('Is reflexive', False),
+        ('Notification', 'None'),
+        ('Relationship rules', ''),
+    ])
+
+
+########################################################################
+class FindingsTest(unittest.TestCase):
+    """Test case for performance findings."""
+
+    # ----------------------------------------------------------------------
+    def test_relationship_keys(self):
+        """Test that only key fields without index are found."""
+        rel_classes = [
+            make_rel_class('ParcelOwners', 'Parcels', 'Owners', [
+                ('GlobalID', 'OriginPrimary', ''),
+                ('ParcelGUID', 'OriginForeign', ''),
+            ])
+        ]
+        datasets_indexes = {
+            'Parcels': [{
+                'Name': 'GDB_1_GlobalID',
+                'Fields': 'GlobalID',
+                'Is ascending': True,
+                'Is unique': True,
+            }],
+            'Owners': [{
+                'Name': 'FDO_OBJECTID',
+                'Fields': 'OBJECTID',
+                'Is ascending': True,
+                'Is unique': True,
+            }],
+        }
+        findings = _findings.find_unindexed_relationship_keys(
+            rel_classes, datasets_indexes)
+        self.assertEqual(
+            [(f['Dataset'], f['Field'], f['Severity']) for f in findings],
+            [('Owners', 'ParcelGUID', 'High')])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_sorted_by_severity(self):
+        """Test findings of all kinds sorted with the most severe first."""
+        fields = [
+            OrderedDict([('Name', 'F{0}'.format(i)), ('Type', 'String'),
+                         ('Length', 255)]) for i in range(0, 120)
+        ]
+        profiles = [
+            OrderedDict([('Name', 'F1'), ('Max length used', 10)]),
+            OrderedDict([('Name', 'F2'), ('Max length used', 200)]),
+        ]
+        findings = _findings.sort_findings(
+            _findings.find_oversized_text_fields('Roads', fields, profiles)
+            + _findings.find_wide_datasets('Roads', fields)
+            + _findings.find_missing_spatial_indexes([
+                {'Name': 'Roads', 'Has spatial index': 'No'},
+                {'Name': 'Rivers', 'Has spatial index': True},
+            ]))
+        self.assertEqual(
+            [(f['Priority'], f['Dataset'], f['Field']) for f in findings],
+            [(1, 'Roads', ''), (2, 'Roads', ''), (3, 'Roads', 'F1')])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_skipped_checks(self):
+        """Test that skipped checks are reported after the issues found."""
+        findings = _findings.sort_findings([
+            _findings.make_skipped_checks_finding(
+                'Indexes checks', 'Indexes are read only with arcpy'),
+            _findings.find_missing_spatial_indexes([
+                {'Name': 'Roads', 'Has spatial index': False}])[0],
+        ])
+        self.assertEqual(
+            [(f['Severity'], f['Dataset'], f['Finding']) for f in findings],
+            [('High', 'Roads', 'Feature class has no spatial index'),
+             ('Low', '', 'Indexes checks skipped')])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
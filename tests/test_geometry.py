@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+"""Tests for geometry statistics computed from batches of WKB geometries.
+
+These tests do not need a geodatabase and can be run with any
+Python installation that has numpy installed.
+"""
+from __future__ import print_function
+import struct
+import unittest
+
+import numpy as np
+
+from context import registrant  # noqa: F401
+from registrant._geometry import decode_wkb_batch, GeometryStatsMetric
+
+POINT = struct.pack('<BIdd', 1, 1, 1.0, 2.0)
+LINE = struct.pack('<BII', 1, 2, 3) + struct.pack('<6d', 0, 0, 1, 1, 2, 5)
+POLYGON = (struct.pack('<BII', 1, 3, 2) + struct.pack('<I', 4)
+           + struct.pack('<8d', 0, 0, 4, 0, 4, 4, 0, 0) + struct.pack('<I', 4)
+           + struct.pack('<8d', 1, 1, 2, 1, 2, 2, 1, 1))
+MULTIPOLYGON = struct.pack('<BII', 1, 6, 1) + POLYGON
+EMPTY_POINT = struct.pack('<BIdd', 1, 1, float('nan'), float('nan'))
+LINE_Z_BIG_ENDIAN = (struct.pack('>BII', 0, 1002, 2)
+                     + struct.pack('>6d', 0, 0, 0, 3, 3, 3))
+TRIANGLE = (struct.pack('<BII', 1, 17, 1) + struct.pack('<I', 4)
+            + struct.pack('<8d', 0, 0, 1, 0, 0, 1, 0, 0))
+TIN = struct.pack('<BII', 1, 16, 2) + TRIANGLE + TRIANGLE
+UNKNOWN_TYPE = struct.pack('<BIdd', 1, 99, 1.0, 2.0)
+UNKNOWN_DIMENSIONS = struct.pack('<BIdd', 1, 4001, 1.0, 2.0)
+
+
+########################################################################
+class GeometryStatsTest(unittest.TestCase):
+    """Test case for decoding WKB and geometry statistics."""
+
+    # ----------------------------------------------------------------------
+    def test_decode(self):
+        """Test parts and vertices counts and coordinates of geometries."""
+        sizes, parts, vertices, xy, unsupported = decode_wkb_batch(
+            [POINT, LINE, None, MULTIPOLYGON, EMPTY_POINT])
+        self.assertEqual(sizes.tolist(), [21, 57, 0, 154, 21])
+        self.assertEqual(parts.tolist(), [1, 1, 0, 2, 0])
+        self.assertEqual(vertices.tolist(), [1, 3, 0, 8, 0])
+        self.assertEqual(xy.shape, (12, 2))
+        self.assertFalse(unsupported.any())
+        return
+
+    # ----------------------------------------------------------------------
+    def test_decode_triangles(self):
+        """Test that triangles are read as polygons and TINs as parts."""
+        _sizes, parts, vertices, _xy, _unsupported = decode_wkb_batch(
+            [TRIANGLE, TIN])
+        self.assertEqual(parts.tolist(), [1, 2])
+        self.assertEqual(vertices.tolist(), [4, 8])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_decode_unknown_types(self):
+        """Test that geometries of unknown types are flagged, not read."""
+        _sizes, parts, vertices, xy, unsupported = decode_wkb_batch(
+            [UNKNOWN_TYPE, POINT, UNKNOWN_DIMENSIONS])
+        self.assertEqual(unsupported.tolist(), [True, False, True])
+        self.assertEqual(vertices.tolist(), [0, 1, 0])
+        self.assertEqual(parts.tolist(), [0, 1, 0])
+        self.assertEqual(xy.tolist(), [[1, 2]])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_decode_z_big_endian(self):
+        """Test that Z values are skipped in big endian ISO WKB."""
+        _sizes, _parts, vertices, xy, _unsupported = decode_wkb_batch(
+            [LINE_Z_BIG_ENDIAN])
+        self.assertEqual(vertices.tolist(), [2])
+        self.assertEqual(xy.tolist(), [[0, 0], [3, 3]])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_decode_mixed_dimensions(self):
+        """Test vertices of geometries with and without Z kept in order."""
+        _sizes, _parts, vertices, xy, unsupported = decode_wkb_batch(
+            [LINE, LINE_Z_BIG_ENDIAN, EMPTY_POINT, POINT])
+        self.assertEqual(vertices.tolist(), [3, 2, 0, 1])
+        self.assertEqual(xy.tolist(), [[0, 0], [1, 1], [2, 5], [0, 0],
+                                       [3, 3], [1, 2]])
+        self.assertFalse(unsupported.any())
+        return
+
+    # ----------------------------------------------------------------------
+    def test_metric(self):
+        """Test statistics merged over batches of geometries."""
+        props = {'shapeFieldName': 'SHAPE'}
+        metric = GeometryStatsMetric([], props)
+        metric.update({
+            'SHAPE':
+            np.array([POINT, LINE, None, MULTIPOLYGON, EMPTY_POINT,
+                      UNKNOWN_TYPE], dtype=object)
+        })
+        other = GeometryStatsMetric([], props)
+        other.update({'SHAPE': np.array([LINE], dtype=object)})
+        result = metric.merge(other).finalize()[0]
+        self.assertEqual(result['Features'], 7)
+        self.assertEqual(result['Empty or null geometries'], 2)
+        self.assertEqual(result['Geometries of unknown types'], 1)
+        self.assertEqual(result['Extent'], '0, 0, 4, 5')
+        self.assertEqual(result['Max vertices'], 8)
+        self.assertEqual(result['Max parts'], 2)
+        self.assertEqual(metric.get_average_envelope(), (2.0, 3.5))
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
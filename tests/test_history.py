@@ -0,0 +1,100 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the history of datasets sizes and their growth.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from context import registrant  # noqa: F401
+from registrant._history import (
+    GrowthHistory,
+    get_growth,
+    get_growth_rate,
+    project_threshold_date,
+)
+
+
+########################################################################
+class GrowthHistoryTest(unittest.TestCase):
+    """Test case for history of datasets sizes."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        """Set up the test with a new history file."""
+        self.out_folder = tempfile.mkdtemp()
+        self.history = GrowthHistory(
+            os.path.join(self.out_folder, 'history.sqlite'))
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        """Remove the history file."""
+        self.history.close()
+        shutil.rmtree(self.out_folder)
+
+    # ----------------------------------------------------------------------
+    def test_growth_rate(self):
+        """Test linear growth rate and projected date."""
+        dates = [datetime(2020, 1, 1), datetime(2020, 1, 11),
+                 datetime(2020, 1, 21)]
+        self.assertEqual(get_growth_rate(dates, [100, 200, 300]),
+                         (10.0, 100.0))
+        self.assertIsNone(get_growth_rate(dates[:1], [100]))
+        self.assertEqual(
+            project_threshold_date(dates, [100, 200, 300], 1000),
+            '2020-03-31')
+        self.assertEqual(
+            project_threshold_date(dates, [100, 200, 300], 300), 'Reached')
+        self.assertEqual(
+            project_threshold_date(dates, [300, 200, 100], 1000), '')
+        # the projection starts from the first date having a value
+        self.assertEqual(
+            project_threshold_date([datetime(2019, 12, 1)] + dates,
+                                   [None, 100, 200, 300], 1000),
+            '2020-03-31')
+        return
+
+    # ----------------------------------------------------------------------
+    def test_runs(self):
+        """Test growth of datasets read from the history file."""
+        for day, row_count in ((1, 100), (11, 200), (21, 300)):
+            self.history.add_run(
+                'Production.gdb',
+                [('Parcels', 'fc', row_count, row_count * 10, 5),
+                 ('Owners', 'table', 10, None, 3)],
+                created=datetime(2020, 1, day))
+        self.history.add_run(
+            'Staging.gdb', [('Parcels', 'fc', 1, 1, 5)],
+            created=datetime(2020, 1, 30))
+
+        growth = {
+            item['Name']: item
+            for item in get_growth(
+                self.history.get_history('Production.gdb'),
+                row_count_threshold=1000,
+                size_threshold=10000)
+        }
+        parcels = growth['Parcels']
+        self.assertEqual(parcels['Runs'], 3)
+        self.assertEqual(parcels['Row count'], 300)
+        self.assertEqual(parcels['Rows per day'], 10)
+        self.assertEqual(parcels['Row count threshold reached'], '2020-03-31')
+        self.assertEqual(parcels['Size threshold reached'], '2020-03-31')
+        self.assertEqual(
+            parcels['Rows over time'],
+            '2020-01-01: 100, 2020-01-11: 200, 2020-01-21: 300')
+
+        owners = growth['Owners']
+        self.assertEqual(owners['Rows per day'], 0)
+        self.assertEqual(owners['Row count threshold reached'], '')
+        self.assertEqual(owners['Size, bytes'], '')
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# -*- coding: UTF-8 -*-
+"""Tests for modules imported only when they are used.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+from context import registrant  # noqa: F401
+from registrant._lazy import LazyModule, is_module_found
+
+
+########################################################################
+class LazyModulesTest(unittest.TestCase):
+    """Test case for lazy modules."""
+
+    # ----------------------------------------------------------------------
+    def test_lazy_module(self):
+        """Test that module is imported on the first access."""
+        module = LazyModule('colorsys')
+        self.assertIn('not imported', repr(module))
+        self.assertEqual(module.rgb_to_hsv(0, 0, 0), (0, 0, 0))
+        self.assertNotIn('not imported', repr(module))
+        self.assertTrue(is_module_found('colorsys'))
+        self.assertFalse(is_module_found('registrant_missing_module'))
+        return
+
+    # ----------------------------------------------------------------------
+    def test_import_registrant(self):
+        """Test that heavy modules are not imported with registrant."""
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), '..'))
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, json, registrant; print(json.dumps(['
+            'name for name in ("arcpy", "ogr", "gdal", "numpy", "bs4", '
+            '"pandas") if name in sys.modules]))'
+        ], env=env)
+        self.assertEqual(json.loads(output.decode().strip()), [])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: UTF-8 -*-
+"""Tests for computing multiple metrics in a single scan of a dataset.
+
+These tests do not need a geodatabase and can be run with any
+Python installation that has numpy installed.
+"""
+from __future__ import print_function
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+
+from context import registrant
+from registrant._metrics import scan_dataset, get_metric_class
+from registrant._profiling import FieldsProfileMetric
+
+
+########################################################################
+@registrant.register_metric
+class NegativeValuesMetric(registrant.Metric):
+    """Custom metric counting negative values of the `Value` field."""
+
+    name = 'negative_values'
+    title = 'Negative values'
+
+    # ----------------------------------------------------------------------
+    def __init__(self, fields, dataset_props):
+        """Initialize the metric."""
+        registrant.Metric.__init__(self, fields, dataset_props)
+        self.count = 0
+
+    # ----------------------------------------------------------------------
+    def get_columns(self):
+        """Get names of the columns which values are needed."""
+        return ['Value']
+
+    # ----------------------------------------------------------------------
+    def update(self, batch):
+        """Count negative values in a batch of rows."""
+        self.count += int(np.count_nonzero(batch['Value'] < 0))
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge counts."""
+        self.count += other.count
+        return self
+
+    # ----------------------------------------------------------------------
+    def finalize(self):
+        """Get the count as a single row."""
+        return [OrderedDict([('Count', self.count)])]
+
+
+########################################################################
+class FakeDataset(object):
+    """Dataset data object reading batches of rows from memory."""
+
+    name = 'Measurements'
+    OIDFieldName = 'OBJECTID'
+    path = wkspc = ''
+
+    # ----------------------------------------------------------------------
+    def __init__(self):
+        """Initialize the dataset with two batches of rows."""
+        self.columns_read = []
+
+    # ----------------------------------------------------------------------
+    def iter_batches(self, columns, batch_size):
+        """Yield batches of rows of the requested columns."""
+        self.columns_read.append(columns)
+        for values in ([-1.0, 2.0], [3.0, -4.0]):
+            yield {
+                'Value': np.array(values),
+                'Name': np.array(['a', 'bb'], dtype=object),
+            }
+
+
+########################################################################
+class MetricsTest(unittest.TestCase):
+    """Test case for the fused single pass metrics scan."""
+
+    # ----------------------------------------------------------------------
+    def test_single_scan(self):
+        """Test that all metrics are computed reading the dataset once."""
+        fields = [
+            OrderedDict([('Name', 'Value'), ('Type', 'Double'),
+                         ('Length', 8)]),
+            OrderedDict([('Name', 'Name'), ('Type', 'String'),
+                         ('Length', 50)]),
+        ]
+        dataset = FakeDataset()
+        results = scan_dataset(
+            dataset, fields,
+            [FieldsProfileMetric,
+             get_metric_class('negative_values')])
+        self.assertEqual(dataset.columns_read, [['Value', 'Name']])
+        self.assertEqual(results['Negative values'][0]['Count'], 2)
+        self.assertEqual(results['Profile'][1]['Max length used'], 2)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_unknown_metric(self):
+        """Test that requesting not registered metric fails."""
+        with self.assertRaises(ValueError):
+            get_metric_class('no_such_metric')
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
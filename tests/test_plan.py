@@ -0,0 +1,79 @@
+# -*- coding: UTF-8 -*-
+"""Tests for plans of the reads of geodatabase a report needs.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import unittest
+
+from context import registrant  # noqa: F401
+from registrant._plan import make_plan, needs_describe
+from registrant._config import DATASET_TYPE_TABLE, DATASET_TYPE_FC
+
+
+########################################################################
+class ReportPlanTest(unittest.TestCase):
+    """Test case for report plans."""
+
+    # ----------------------------------------------------------------------
+    def test_coded_values_only(self):
+        """Test that coded values of domains do not read datasets."""
+        plan = make_plan(do_report_domains_coded_values=True)
+        self.assertEqual(plan.sections, ['overview', 'domains'])
+        self.assertEqual(plan.datasets_columns, {})
+        return
+
+    # ----------------------------------------------------------------------
+    def test_domains_usage_counts(self):
+        """Test that codes usage counts are reported in domains section."""
+        plan = make_plan(do_report_domains_usage_counts=True)
+        self.assertEqual(plan.sections, ['overview', 'domains'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_fields_only(self):
+        """Test that datasets are neither described nor counted."""
+        plan = make_plan(do_report_tables_fields=True,
+                         do_report_fcs_fields=True)
+        self.assertEqual(plan.sections, ['overview', 'tables', 'fcs'])
+        self.assertEqual(plan.datasets_columns[DATASET_TYPE_TABLE],
+                         frozenset(['Name']))
+        self.assertFalse(
+            needs_describe(plan.datasets_columns[DATASET_TYPE_FC]))
+        return
+
+    # ----------------------------------------------------------------------
+    def test_columns(self):
+        """Test that columns selected and needed by sections are read."""
+        plan = make_plan(do_report_tables=True,
+                         do_report_fcs=True,
+                         do_report_findings=True,
+                         columns=['Row count'])
+        self.assertEqual(plan.columns, ['Name', 'Row count'])
+        self.assertFalse(
+            needs_describe(plan.datasets_columns[DATASET_TYPE_TABLE]))
+        self.assertEqual(plan.datasets_columns[DATASET_TYPE_FC],
+                         frozenset(['Name', 'Row count',
+                                    'Has spatial index']))
+        self.assertTrue(
+            needs_describe(plan.datasets_columns[DATASET_TYPE_FC]))
+        self.assertEqual(plan.sections,
+                         ['overview', 'tables', 'fcs', 'findings'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_all_columns(self):
+        """Test that listed datasets are read with all properties."""
+        plan = make_plan(do_report_tables=True,
+                         do_report_growth=True,
+                         tables_metrics=['profile'])
+        self.assertIsNone(plan.datasets_columns[DATASET_TYPE_TABLE])
+        self.assertEqual(plan.datasets_columns[DATASET_TYPE_FC],
+                         frozenset(['Name', 'Row count']))
+        self.assertEqual(plan.sections, ['overview', 'tables', 'growth'])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# -*- coding: UTF-8 -*-
+"""Tests for profiling values of fields read in batches of rows.
+
+These tests do not need a geodatabase and can be run with any
+Python installation that has numpy installed.
+"""
+from __future__ import print_function
+import datetime
+import unittest
+
+import numpy as np
+
+from context import registrant  # noqa: F401
+from registrant._profiling import FieldProfile
+
+
+########################################################################
+class FieldProfileTest(unittest.TestCase):
+    """Test case for statistics of a single field."""
+
+    # ----------------------------------------------------------------------
+    def test_numeric(self):
+        """Test nulls, range and mean of numeric values merged over batches."""
+        profile = FieldProfile('Value', 'Double')
+        profile.update(np.ma.array([1.0, 2.0, 3.0], mask=[0, 0, 1]))
+        other = FieldProfile('Value', 'Double')
+        other.update(np.array([None, 5], dtype=object))
+        result = profile.merge(other).finalize()
+        self.assertEqual(result['Row count'], 5)
+        self.assertEqual(result['Null count'], 2)
+        self.assertEqual((result['Min'], result['Max']), (1, 5))
+        self.assertEqual(result['Mean'], 2.6667)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_string(self):
+        """Test maximum string length used compared with declared length."""
+        profile = FieldProfile('Name', 'String', 50)
+        profile.update(
+            np.array([b'abc', None, u'é'.encode('utf-8')], dtype=object))
+        result = profile.finalize()
+        self.assertEqual(result['Max length used'], 3)
+        self.assertEqual(result['Length used, %'], 6.0)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_date(self):
+        """Test date range of values read from both backends."""
+        profile = FieldProfile('Created', 'Date')
+        profile.update(
+            np.array([datetime.datetime(2020, 1, 1), None], dtype=object))
+        profile.update(
+            np.array(['2019-01-01', 'NaT'], dtype='datetime64[ms]'))
+        result = profile.finalize()
+        self.assertEqual(result['Null count'], 2)
+        self.assertEqual(result['Min'], '2019-01-01 00:00:00')
+        self.assertEqual(result['Max'], '2020-01-01 00:00:00')
+        return
+
+    # ----------------------------------------------------------------------
+    def test_large_integers(self):
+        """Test integers not represented exactly by floats kept exact."""
+        values = [2**53 + index for index in range(6)]
+        profile = FieldProfile('Id', 'Integer64', approximate=True)
+        profile.update(np.array(values[:3] + [None], dtype=object))
+        other = FieldProfile('Id', 'Integer64', approximate=True)
+        other.update(np.array(values[3:] + values[5:], dtype=np.int64))
+        result = profile.merge(other).finalize()
+        self.assertEqual((result['Min'], result['Max']),
+                         (values[0], values[-1]))
+        self.assertTrue(
+            result['Distinct values (approx.)'].startswith('6 '))
+        self.assertTrue(result['Most frequent values (approx.)'].startswith(
+            '{0}: 2'.format(values[-1])))
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: UTF-8 -*-
+"""Tests for compact records of geodatabase objects properties.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import pickle
+import unittest
+from collections import OrderedDict
+
+from context import registrant  # noqa: F401
+from registrant._records import FieldRecord, FeatureClassRecord
+
+
+########################################################################
+class RecordsTest(unittest.TestCase):
+    """Test case for records."""
+
+    # ----------------------------------------------------------------------
+    def test_mapping(self):
+        """Test that records are used as ordered dicts keyed by labels."""
+        field = FieldRecord()
+        field['UI order'] = 1
+        field['Name'] = 'OWNER'
+        field['Type'] = 'String'
+        self.assertEqual(list(field.keys()), ['UI order', 'Name', 'Type'])
+        self.assertEqual(
+            field,
+            OrderedDict([('UI order', 1), ('Name', 'OWNER'),
+                         ('Type', 'String')]))
+        self.assertEqual(field.name, 'OWNER')
+        self.assertEqual(field.get('Length', ''), '')
+        with self.assertRaises(KeyError):
+            field['Length']
+        with self.assertRaises(KeyError):
+            field['Unknown property'] = 1
+        with self.assertRaises(AttributeError):
+            field.unknownProperty = 1
+        return
+
+    # ----------------------------------------------------------------------
+    def test_order_and_pickle(self):
+        """Test order of labels and pickling of records."""
+        fc = FeatureClassRecord(rowCount=10, name='Parcels')
+        fc['Feature dataset'] = 'Cadastre'
+        self.assertEqual(
+            list(fc.keys()), ['Name', 'Feature dataset', 'Row count'])
+        restored = pickle.loads(pickle.dumps(fc, 2))
+        self.assertEqual(restored, fc)
+        self.assertIsInstance(restored, FeatureClassRecord)
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# -*- coding: UTF-8 -*-
+"""Tests for exporting and parsing replica schemas.
+
+The geoprocessing tool is replaced with a stub writing the schema files
+in the current process (a single worker), so these tests do not need
+arcpy and can be run with any Python installation.
+"""
+from __future__ import print_function
+import io
+import unittest
+
+from context import registrant  # noqa: F401
+from registrant import _replicas
+
+SCHEMA_XML = u"""<esri:Workspace xmlns:esri="http://www.esri.com/schemas">
+<WorkspaceDefinition><GPReplica><Name>{0}</Name>
+<CreationDate>2018-04-01T10:30:00</CreationDate>
+<GPReplicaDescription><GPReplicaDatasets>
+<GPReplicaDataset><DatasetName>roads</DatasetName>
+<TargetName>roads_{0}</TargetName></GPReplicaDataset>
+<GPReplicaDataset><DatasetName>Buildings</DatasetName>
+<TargetName>buildings_{0}</TargetName></GPReplicaDataset>
+</GPReplicaDatasets></GPReplicaDescription></GPReplica>
+</WorkspaceDefinition></esri:Workspace>"""
+
+
+########################################################################
+class StubArcpy(object):
+    """Stub of arcpy exporting replica schemas."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self):
+        """Initialize `StubArcpy` with no exports run."""
+        self.exported = []
+        self.failing = None
+
+    # ----------------------------------------------------------------------
+    def ExportReplicaSchema_management(self, in_geodatabase,  # noqa: N802
+                                       output_replica_schema_file,
+                                       in_replica):
+        """Write schema of the replica to the file."""
+        self.exported.append(in_replica)
+        if in_replica == self.failing:
+            raise RuntimeError('ERROR 000582: Error occurred')
+        with io.open(output_replica_schema_file, 'w') as fh:
+            fh.write(SCHEMA_XML.format(in_replica))
+
+
+########################################################################
+class ReplicaSchemaTest(unittest.TestCase):
+    """Test case for replica schemas."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        """Replace arcpy with the stub and clear the cached schemas."""
+        self.arcpy = StubArcpy()
+        self._arcpy = _replicas.arcpy
+        _replicas.arcpy = self.arcpy
+        _replicas._SCHEMAS.clear()
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        """Restore arcpy."""
+        _replicas.arcpy = self._arcpy
+        _replicas._SCHEMAS.clear()
+
+    # ----------------------------------------------------------------------
+    def test_parse(self):
+        """Test reading creation date and sorted datasets."""
+        schema = _replicas.parse_replica_schema(
+            io.BytesIO(SCHEMA_XML.format('r1').encode('utf-8')))
+        self.assertEqual(schema.creation_date, '2018-04-01 10:30:00')
+        self.assertEqual(schema.datasets, [('Buildings', 'buildings_r1'),
+                                           ('roads', 'roads_r1')])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_export(self):
+        """Test that schemas are exported in the order of replicas."""
+        names = ['r{0}'.format(index) for index in range(3)]
+        schemas = list(_replicas.iter_replica_schemas(
+            'gdb', [(name, None) for name in names], workers=1))
+        self.assertEqual(
+            [schema.datasets[0][1] for schema in schemas],
+            ['buildings_{0}'.format(name) for name in names])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_export_failed(self):
+        """Test that replica whose schema is not exported is kept."""
+        self.arcpy.failing = 'r2'
+        schemas = list(_replicas.iter_replica_schemas(
+            'gdb', [('r1', (1, 1)), ('r2', (1, 1)), ('r3', None)],
+            workers=1))
+        self.assertIsNone(schemas[1])
+        self.assertEqual(schemas[2].creation_date, '2018-04-01 10:30:00')
+        self.assertNotIn(('gdb', 'r2', (1, 1)), _replicas._SCHEMAS)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_cache(self):
+        """Test that schemas are exported again only for new generations."""
+        list(_replicas.iter_replica_schemas(
+            'gdb', [('r1', (1, 1)), ('r2', (1, 1)), ('r3', None)],
+            workers=1))
+        schemas = list(_replicas.iter_replica_schemas(
+            'gdb', [('r1', (1, 1)), ('r2', (2, 1)), ('r3', None)],
+            workers=1))
+        self.assertEqual(sorted(self.arcpy.exported),
+                         ['r1', 'r2', 'r2', 'r3', 'r3'])
+        self.assertEqual(len(schemas), 3)
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
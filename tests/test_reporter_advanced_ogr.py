@@ -9,6 +9,7 @@ from __future__ import print_function
 
 import os
 import unittest
+import threading
 import pkgutil
 
 from context import (
@@ -18,6 +19,7 @@ from context import (
     NO_OGR_ENV_MESSAGE,
 )
 import html_parsers
+from registrant import _reporter
 
 
 ########################################################################
@@ -59,6 +61,76 @@ class SimpleGeodatabase(unittest.TestCase):
                 json_file=self.json_results,
             ), (True, True))
 
+    # ---------------------------------------------------------------------
+    def test_session(self):
+        """Test reports of a geodatabase sharing a session."""
+        test_name = self.id().split('.')[-1]
+        session = registrant.ReportSession(self.in_gdb)
+        reporters = [
+            session.create_reporter(
+                os.path.join(self.out_report_folder,
+                             test_name + str(index) + PYTHON_VERSION))
+            for index in range(2)
+        ]
+        reporters[0].gdb2html()
+        reporters[1].domains2html()
+        self.assertIs(reporters[0].gdb, reporters[1].gdb)
+        for reporter in reporters:
+            self.assertEqual(
+                html_parsers.parse_domains_from_html(
+                    html_file=reporter.report_file_path,
+                    json_file=self.json_results,
+                ), (True, True))
+
+    # ---------------------------------------------------------------------
+    def test_session_other_gdb(self):
+        """Test that session of another geodatabase is not accepted."""
+        session = registrant.ReportSession(self.in_gdb)
+        with self.assertRaises(ValueError):
+            registrant.Reporter(
+                os.path.join(os.path.dirname(self.in_gdb), 'Other.gdb'),
+                self.out_report_folder, session=session)
+
+    # ---------------------------------------------------------------------
+    def test_feature_dataset_not_found(self):
+        """Test that reporter of unknown feature dataset is not created."""
+        session = registrant.ReportSession(self.in_gdb)
+        with self.assertRaises(ValueError):
+            session.create_reporter(self.out_report_folder,
+                                    feature_dataset='Missing')
+
+    # ---------------------------------------------------------------------
+    def test_concurrent_reports(self):
+        """Test reports of a geodatabase written at once to one folder."""
+        test_name = self.id().split('.')[-1]
+        out_report_folder = os.path.join(self.out_report_folder,
+                                         test_name + PYTHON_VERSION)
+        reporters = [
+            registrant.Reporter(self.in_gdb, out_report_folder)
+            for _ in range(4)
+        ]
+        threads = [
+            threading.Thread(target=reporter.domains2html)
+            for reporter in reporters
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+            html_parsers.parse_domains_from_html(
+                html_file=reporters[0].report_file_path,
+                json_file=self.json_results,
+            ), (True, True))
+        staging_roots = [reporter._staging_root for reporter in reporters]
+        for reporter in reporters:
+            reporter.close()
+        gdb_report_folder = os.path.dirname(
+            os.path.dirname(reporters[0].report_file_path))
+        self.assertEqual(os.listdir(gdb_report_folder), ['app'])
+        # nothing is left to remove at exit for reporters closed
+        self.assertFalse(_reporter._STAGING_ROOTS.intersection(staging_roots))
+
     # ---------------------------------------------------------------------
     def test_tables(self):
         """Test geodatabase report for tables."""
@@ -93,6 +165,27 @@ class SimpleGeodatabase(unittest.TestCase):
                 json_file=self.json_results,
             ), (True, True))
 
+    # ---------------------------------------------------------------------
+    def test_tables_dedup_fields(self):
+        """Test that identical fields link to the fields reported first."""
+        test_name = self.id().split('.')[-1]
+        self.reporter = registrant.Reporter(
+            gdb_path=self.in_gdb,
+            out_report_folder_path=os.path.join(self.out_report_folder,
+                                                test_name + PYTHON_VERSION),
+        )
+        self.reporter.gdb2html(
+            do_report_versions=False,
+            do_report_replicas=False,
+            do_report_domains=False,
+            do_report_domains_coded_values=False,
+            do_report_relclasses=False,
+            dedup_fields=True,
+        )
+        self.assertEqual(
+            html_parsers.parse_fields_references_from_html(
+                html_file=self.reporter.report_file_path), True)
+
 
 if __name__ == '__main__':
     unittest.main()
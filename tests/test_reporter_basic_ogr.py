@@ -52,6 +52,22 @@ class SimpleGeodatabase(unittest.TestCase):
             )
         return
 
+    # ----------------------------------------------------------------------
+    def test_unknown_ogr_driver(self):
+        """Test that opening geodatabase with missing driver fails."""
+        test_name = self.id().split('.')[-1]
+        with self.assertRaises(ValueError):
+            registrant.Reporter(
+                gdb_path=self.in_gdb,
+                out_report_folder_path=os.path.join(
+                    self.out_report_folder,
+                    test_name + PYTHON_VERSION,
+                ),
+                backends='ogr',
+                ogr_driver='NotExistingDriver',
+            )
+        return
+
     # ----------------------------------------------------------------------
     def test_domain(self):
         """Test geodatabase report for domains."""
@@ -0,0 +1,198 @@
+# -*- coding: UTF-8 -*-
+"""Tests for scanning rows of datasets in ranges of object IDs.
+
+Datasets are read with a stub of arcpy serving rows from memory, so
+these tests do not need a geodatabase and can be run with any Python
+installation that has numpy installed.
+"""
+from __future__ import print_function
+import re
+import sys
+import unittest
+import multiprocessing
+
+from context import registrant  # noqa: F401
+from registrant import _scanner
+from registrant import _data_objects
+
+
+########################################################################
+class StubSearchCursor(object):
+    """Stub of `arcpy.da.SearchCursor` reading rows from memory."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, rows, field_names, where_clause=None,
+                 sql_clause=(None, None)):
+        """Select the rows matching the object IDs range and order."""
+        rows = sorted(rows, key=lambda row: row['OBJECTID'])
+        if where_clause:
+            start, stop = [
+                int(value) for value in re.findall(r'\d+', where_clause)]
+            rows = [row for row in rows if start <= row['OBJECTID'] < stop]
+        if sql_clause[1] and sql_clause[1].endswith('DESC'):
+            rows.reverse()
+        self.rows = iter([
+            tuple(row['OBJECTID' if field == 'OID@' else field]
+                  for field in field_names)
+            for row in rows
+        ])
+
+    # ----------------------------------------------------------------------
+    def __enter__(self):
+        """Get the cursor used as a context manager."""
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Release the cursor."""
+        return
+
+    # ----------------------------------------------------------------------
+    def __iter__(self):
+        """Iterate over the rows."""
+        return self
+
+    # ----------------------------------------------------------------------
+    def __next__(self):
+        """Get the next row."""
+        return next(self.rows)
+
+    next = __next__
+
+
+########################################################################
+class StubArcpy(object):
+    """Stub of arcpy reading a single table from memory."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self, rows):
+        """Initialize `StubArcpy` with the rows of the table."""
+        self.rows = rows
+        self.da = self
+
+    # ----------------------------------------------------------------------
+    def AddFieldDelimiters(self, datasource, field):  # noqa: N802
+        """Get the field name as it is; file geodatabases need no quotes."""
+        return field
+
+    # ----------------------------------------------------------------------
+    def SearchCursor(self, in_table, field_names,  # noqa: N802
+                     where_clause=None, sql_clause=(None, None)):
+        """Get cursor reading the rows."""
+        return StubSearchCursor(self.rows, field_names, where_clause,
+                                sql_clause)
+
+
+########################################################################
+class StubTable(object):
+    """Table data object read with arcpy."""
+
+    wkspc = 'Test.gdb'
+    path = 'Test.gdb/Measurements'
+    OIDFieldName = 'OBJECTID'
+
+    # ----------------------------------------------------------------------
+    def iter_batches(self, columns, batch_size, where_clause=None):
+        """Read values of columns in batches of rows."""
+        return _data_objects.iter_arcpy_cursor_batches(
+            self.path, columns, batch_size, where_clause)
+
+
+########################################################################
+class SumAccumulator(object):
+    """Accumulator of number of rows and sum of values of a column."""
+
+    # ----------------------------------------------------------------------
+    def __init__(self):
+        """Initialize `SumAccumulator` with no rows read."""
+        self.count = 0
+        self.total = 0
+        self.batches = 0
+
+    # ----------------------------------------------------------------------
+    def update(self, batch):
+        """Add the values of a batch of rows."""
+        self.count += batch['Value'].size
+        self.total += int(batch['Value'].sum())
+        self.batches += 1
+
+    # ----------------------------------------------------------------------
+    def merge(self, other):
+        """Merge the counts of other rows."""
+        self.count += other.count
+        self.total += other.total
+        self.batches += other.batches
+        return self
+
+
+########################################################################
+class ScannerTest(unittest.TestCase):
+    """Test case for scanning datasets in ranges of object IDs."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        """Replace arcpy with the stub serving 10 rows."""
+        self.arcpy = StubArcpy([
+            {'OBJECTID': oid, 'Value': oid * 10} for oid in range(3, 13)])
+        self._arcpy = _scanner.arcpy, _data_objects.arcpy
+        _scanner.arcpy = _data_objects.arcpy = self.arcpy
+
+    # ----------------------------------------------------------------------
+    def tearDown(self):
+        """Restore arcpy."""
+        _scanner.arcpy, _data_objects.arcpy = self._arcpy
+
+    # ----------------------------------------------------------------------
+    def test_where_clauses(self):
+        """Test that the object IDs range is split for the workers."""
+        scanner = _scanner.DatasetScanner(StubTable(), workers=2,
+                                          batch_size=2)
+        self.assertEqual(scanner.get_oid_range(), (3, 12))
+        self.assertEqual(scanner.get_where_clauses(), [
+            'OBJECTID >= 3 AND OBJECTID < 5',
+            'OBJECTID >= 5 AND OBJECTID < 7',
+            'OBJECTID >= 7 AND OBJECTID < 9',
+            'OBJECTID >= 9 AND OBJECTID < 11',
+            'OBJECTID >= 11 AND OBJECTID < 13',
+        ])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_where_clauses_empty(self):
+        """Test that a table with no rows is not split."""
+        self.arcpy.rows = []
+        scanner = _scanner.DatasetScanner(StubTable(), workers=2)
+        self.assertIsNone(scanner.get_oid_range())
+        self.assertEqual(scanner.get_where_clauses(), [])
+        self.assertEqual(scanner.scan(SumAccumulator, ['Value']).count, 0)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_scan_single_worker(self):
+        """Test that all rows are read in batches in the current process."""
+        result = _scanner.DatasetScanner(
+            StubTable(), workers=1, batch_size=4).scan(
+                SumAccumulator, ['Value'])
+        self.assertEqual((result.count, result.total, result.batches),
+                         (10, 750, 3))
+        return
+
+    # ----------------------------------------------------------------------
+    def test_scan_workers(self):
+        """Test that partial results of the ranges are merged."""
+        # the stub of arcpy is not installed in spawned processes (Python 2
+        # forks them everywhere but on Windows)
+        get_start_method = getattr(multiprocessing, 'get_start_method',
+                                   lambda: 'fork')
+        if sys.platform == 'win32' or get_start_method() != 'fork':
+            self.skipTest('Worker processes are not forked')
+        result = _scanner.DatasetScanner(
+            StubTable(), workers=2, batch_size=2).scan(
+                SumAccumulator, ['Value'])
+        self.assertEqual((result.count, result.total, result.batches),
+                         (10, 750, 5))
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: UTF-8 -*-
+"""Tests for tables of the report sections.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import unittest
+from collections import OrderedDict
+
+from bs4 import BeautifulSoup
+
+from context import registrant  # noqa: F401
+from registrant._config import HTML_PARSER
+from registrant._sections import Section
+
+
+########################################################################
+class SectionsTest(unittest.TestCase):
+    """Test case for sections."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        """Create section of domains."""
+        self.section = Section.from_records([
+            OrderedDict([('Name', 'owners'), ('Range', None),
+                         ('Editable', True)]),
+            OrderedDict([('Name', 'Heights'), ('Range', '0 - 100'),
+                         ('Editable', False), ('Owner', 'admin')]),
+        ])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_from_records(self):
+        """Test that columns are ordered and missing values are None."""
+        self.assertEqual(
+            list(self.section.columns), ['Name', 'Range', 'Editable', 'Owner'])
+        self.assertEqual(len(self.section), 2)
+        self.assertEqual(self.section['Owner'], [None, 'admin'])
+        self.assertEqual(len(Section.from_records([])), 0)
+        streamed = Section.from_records(
+            OrderedDict([('Name', name)]) for name in ('a', 'b'))
+        self.assertEqual(streamed['Name'], ['a', 'b'])
+        self.assertEqual(len(Section.from_records(iter([]))), 0)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_operations(self):
+        """Test sorting and mapping values keeping the section unchanged."""
+        section = self.section.sort(
+            'Name', key=lambda name: name.lower()).fillna(
+                'Range', '').map_booleans()
+        self.assertEqual(section['Name'], ['Heights', 'owners'])
+        self.assertEqual(section['Range'], ['0 - 100', ''])
+        self.assertEqual(section['Editable'], ['No', 'Yes'])
+        self.assertEqual(self.section['Name'], ['owners', 'Heights'])
+        self.assertEqual(
+            self.section.sort('Name')['Name'], ['Heights', 'owners'])
+        self.assertEqual(list(section.drop('Owner').columns),
+                         ['Name', 'Range', 'Editable'])
+        # columns with values other than booleans are not mapped
+        self.assertEqual(section.map_booleans()['Owner'], ['admin', None])
+
+        section['Is used'] = [False, True]
+        self.assertEqual(section.records()[1]['Is used'], True)
+        with self.assertRaises(ValueError):
+            section['Is used'] = [True]
+        return
+
+    # ----------------------------------------------------------------------
+    def test_to_html(self):
+        """Test that section is exported into HTML table."""
+        section = Section([('Name', ['<b>owners</b>']), ('Count', [3])])
+        table = BeautifulSoup(
+            section.to_html(classes='table'), HTML_PARSER).table
+        self.assertEqual(table['class'], ['dataframe', 'table'])
+        self.assertEqual([th.text for th in table.find_all('th')],
+                         ['Name', 'Count'])
+        self.assertEqual([td.text for td in table.find_all('td')],
+                         ['<b>owners</b>', '3'])
+        self.assertIsNone(table.find('b'))
+
+        table = BeautifulSoup(
+            section.to_html(escape=False), HTML_PARSER).table
+        self.assertEqual(table.find('b').text, 'owners')
+        return
+
+    # ----------------------------------------------------------------------
+    def test_to_html_floats(self):
+        """Test that floats are formatted as `pandas` formats them."""
+        section = Section([('Ratio', [1 / 3.0, 1.5, None]),
+                           ('Mean', [2.0, 10.0, 0.25]),
+                           ('Size', [1.0, 2.0, 3.0]),
+                           ('Tiny', [1e-9, 1.0, 2.0])])
+        table = BeautifulSoup(section.to_html(), HTML_PARSER).table
+        self.assertEqual(
+            [[td.text for td in tr.find_all('td')]
+             for tr in table.find_all('tr')[1:]],
+            [['0.333333', '2.00', '1.0', '1.000000e-09'],
+             ['1.500000', '10.00', '2.0', '1.000000e+00'],
+             ['NaN', '0.25', '3.0', '2.000000e+00']])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
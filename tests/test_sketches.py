@@ -0,0 +1,116 @@
+# -*- coding: UTF-8 -*-
+"""Tests for approximate mergeable sketches used for profiling.
+
+These tests do not need a geodatabase and can be run with any
+Python installation that has numpy installed.
+"""
+from __future__ import print_function
+import unittest
+
+import numpy as np
+
+from context import registrant  # noqa: F401
+from registrant._sketches import (
+    HyperLogLog,
+    KllSketch,
+    FrequentItems,
+    hash_values,
+)
+from registrant._profiling import FieldProfile
+
+
+########################################################################
+class SketchesTest(unittest.TestCase):
+    """Test case for sketches built for chunks of values and merged."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self):
+        """Set up the test generating values split into two chunks."""
+        self.values = np.random.RandomState(0).randint(0, 50000, 200000)
+        self.chunks = np.array_split(self.values, 2)
+
+    # ----------------------------------------------------------------------
+    def test_distinct_count(self):
+        """Test merged distinct count estimate is within error bound."""
+        sketches = [HyperLogLog() for _chunk in self.chunks]
+        for sketch, chunk in zip(sketches, self.chunks):
+            sketch.update(hash_values(chunk))
+        estimate = sketches[0].merge(sketches[1]).estimate()
+        exact = np.unique(self.values).size
+        self.assertLess(
+            abs(estimate - exact) / exact, 3 * sketches[0].relative_error)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_hash_numbers_by_value(self):
+        """Test integers and floats of the same value hash the same."""
+        self.assertEqual(
+            hash_values(np.array([1, 2]))[1],
+            hash_values(np.array([1.0, 2.0]))[1])
+        # integers not represented exactly by floats do not collide
+        big = 2 ** 53
+        self.assertEqual(
+            np.unique(hash_values(np.array([big, big + 1, big + 2]))).size,
+            3)
+        self.assertNotEqual(hash_values(np.array([0.5]))[0],
+                            hash_values(np.array([0]))[0])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_hash_strings(self):
+        """Test strings hash the same only when they are the same."""
+        words = np.array([u'road', u'river', u'road', u'', u'r\xf6ad',
+                          u'x' * 40], dtype=object)
+        hashes = hash_values(words)
+        self.assertEqual(hashes[0], hashes[2])
+        self.assertEqual(np.unique(hashes).size, 5)
+        # hashes do not depend on the other values of the batch
+        self.assertEqual(hash_values(np.array([u'road']))[0], hashes[0])
+        self.assertEqual(
+            hash_values(np.array([u'road'] * 3000, dtype=object))[-1],
+            hashes[0])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_quantiles(self):
+        """Test merged quantiles are within the rank error bound."""
+        sketches = [KllSketch(seed=0) for _chunk in self.chunks]
+        for sketch, chunk in zip(sketches, self.chunks):
+            sketch.update(chunk)
+        sketch = sketches[0].merge(sketches[1])
+        median = sketch.quantiles([0.5])[0]
+        rank = np.count_nonzero(self.values <= median) / self.values.size
+        self.assertLess(abs(rank - 0.5), sketch.rank_error)
+        self.assertLess(sum(len(items) for items in sketch.levels),
+                        3 * sketch.k)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_frequent_items(self):
+        """Test most frequent value is found and counts are bounded."""
+        values = np.concatenate((np.full(5000, 7), self.values))
+        sketch = FrequentItems(capacity=8)
+        for chunk in np.array_split(values, 4):
+            sketch.update(chunk)
+        value, count = sketch.top(1)[0]
+        exact = np.count_nonzero(values == 7)
+        self.assertEqual(value, 7)
+        self.assertTrue(count <= exact <= count + sketch.max_error)
+        self.assertLessEqual(len(sketch.counters), 8)
+        return
+
+    # ----------------------------------------------------------------------
+    def test_profile_approximate(self):
+        """Test approximate profile of a field reports error bounds."""
+        profile = FieldProfile('Code', 'String', 10, approximate=True)
+        profile.update(np.array([b'A', b'B', b'A', None], dtype=object))
+        result = profile.finalize()
+        self.assertTrue(
+            result['Distinct values (approx.)'].startswith(u'2 (±'))
+        self.assertEqual(result['Most frequent values (approx.)'],
+                         'A: 2, B: 1')
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
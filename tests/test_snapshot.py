@@ -0,0 +1,224 @@
+# -*- coding: UTF-8 -*-
+"""Tests for schema snapshots and differences between them.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+
+from context import registrant  # noqa: F401
+from registrant._reporter import Reporter
+from registrant._snapshot import (
+    make_dataset_record,
+    make_snapshot,
+    save_snapshot,
+    load_snapshot,
+    diff_snapshots,
+    cluster_snapshots,
+)
+
+
+# ----------------------------------------------------------------------
+def make_field(name, field_type='String', length=50):
+    """Make field properties as read by `get_fields`."""
+    return OrderedDict([
+        ('UI order', 1),
+        ('Name', name),
+        ('Type', field_type),
+        ('Length', length),
+        ('Is nullable', True),
+    ])
+
+
+# ----------------------------------------------------------------------
+def make_test_snapshot(parcels_fields, roads_row_count=10, domains=None):
+    """Make snapshot of a geodatabase with a table and a feature class."""
+    datasets = [
+        make_dataset_record(
+            'Parcels', 'table', OrderedDict([('Name', 'Parcels'),
+                                             ('Row count', 5)]),
+            parcels_fields),
+        make_dataset_record(
+            'Roads', 'fc',
+            OrderedDict([('Name', 'Roads'), ('Row count', roads_row_count),
+                         ('Shape type', 'Polyline')]),
+            [make_field('OBJECTID', 'OID', 4),
+             make_field('Name')]),
+    ]
+    return make_snapshot('Test.gdb', datasets, domains or [], [])
+
+
+########################################################################
+class StubGeodatabase(object):
+    """Stub of `Geodatabase` with no indexes, subtypes and domains."""
+
+    path = 'Test.gdb'
+
+    # ----------------------------------------------------------------------
+    def supports(self, operation):
+        """Check whether operation can be run; only the catalog is read."""
+        return False
+
+    # ----------------------------------------------------------------------
+    def get_domains(self):
+        """Get geodatabase domains."""
+        return []
+
+    # ----------------------------------------------------------------------
+    def get_relationship_classes(self):
+        """Get geodatabase relationship classes."""
+        return []
+
+
+########################################################################
+class SnapshotTest(unittest.TestCase):
+    """Test case for schema snapshots."""
+
+    # ----------------------------------------------------------------------
+    def test_fingerprints(self):
+        """Test that fingerprints do not depend on the data."""
+        fields = [make_field('OBJECTID', 'OID', 4), make_field('Owner')]
+        old = make_test_snapshot(fields, roads_row_count=10)
+        new = make_test_snapshot(fields, roads_row_count=20)
+        self.assertEqual(old['fingerprint'], new['fingerprint'])
+        self.assertEqual(diff_snapshots(old, new), [])
+
+        # datasets with the same fields have the same fields fingerprint
+        same_fields = make_test_snapshot(
+            [make_field('OBJECTID', 'OID', 4), make_field('Name')])
+        roads, parcels = same_fields['datasets']
+        self.assertEqual(roads['fieldsFingerprint'],
+                         parcels['fieldsFingerprint'])
+        self.assertNotEqual(roads['fingerprint'], parcels['fingerprint'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_identical_fields(self):
+        """Test that datasets with identical fields refer to the first one."""
+        datasets_fields = {
+            'Roads': [make_field('OBJECTID', 'OID', 4), make_field('Name')],
+            'Rivers': [make_field('OBJECTID', 'OID', 4), make_field('Name')],
+            'Parcels': [make_field('OBJECTID', 'OID', 4),
+                        make_field('Owner')],
+        }
+        # only the fields of datasets are read to find identical ones
+        reporter = Reporter.__new__(Reporter)
+        reporter._fields_fingerprints = {}
+        reporter._get_dataset_fields_props = (
+            lambda dataset_name, dataset_type: datasets_fields[dataset_name])
+        self.assertEqual(
+            [reporter._get_identical_fields_dataset(name, 'table')
+             for name in ('Roads', 'Parcels', 'Rivers')],
+            [None, None, 'Roads'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_reporter_snapshot(self):
+        """Test that datasets are matched with their properties by name."""
+        datasets_props = {
+            'table': [OrderedDict([('Name', 'Parcels'),
+                                   ('Alias', 'Land parcels')])],
+            # described under a qualified name unlike in the catalog
+            'fc': [OrderedDict([('Name', 'gis.Roads'), ('Alias', '')])],
+        }
+        # only the catalog and the properties read for the report are used
+        reporter = Reporter.__new__(Reporter)
+        reporter.gdb = StubGeodatabase()
+        reporter._get_datasets_names = lambda: [('Roads', 'fc'),
+                                                ('Parcels', 'table')]
+        reporter._get_datasets_props = datasets_props.get
+        reporter._get_dataset_fields_props = (
+            lambda dataset_name, dataset_type: [make_field('Name')])
+        snapshot = reporter.get_schema_snapshot()
+        self.assertEqual(
+            [(record['type'], record['name'], record['props'])
+             for record in snapshot['datasets']],
+            [('fc', 'Roads', {}),
+             ('table', 'Parcels', {'Alias': 'Land parcels',
+                                   'Name': 'Parcels'})])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_diff(self):
+        """Test changes of fields, datasets and domains."""
+        old = make_test_snapshot(
+            [make_field('OBJECTID', 'OID', 4),
+             make_field('Owner'),
+             make_field('Zone')],
+            domains=[OrderedDict([('Name', 'Zones'),
+                                  ('Coded values', {1: 'A'})])])
+        new = make_test_snapshot(
+            [make_field('OBJECTID', 'OID', 4),
+             make_field('Owner', length=100),
+             make_field('Area', 'Double', 8)],
+            domains=[OrderedDict([('Name', 'Zones'),
+                                  ('Coded values', {1: 'A', 2: 'B'})])])
+        changes = [(change['Object type'], change['Name'], change['Element'],
+                    change['Change']) for change in diff_snapshots(old, new)]
+        self.assertEqual(changes, [
+            ('Domain', 'Zones', '', 'Modified'),
+            ('Table', 'Parcels', 'Field Owner', 'Modified'),
+            ('Table', 'Parcels', 'Field Zone', 'Removed'),
+            ('Table', 'Parcels', 'Field Area', 'Added'),
+        ])
+        self.assertEqual(
+            diff_snapshots(old, new)[1]['Details'], 'Length: 50 -> 100')
+        return
+
+    # ----------------------------------------------------------------------
+    def test_save_load(self):
+        """Test that saved snapshot is compared the same way."""
+        snapshot = make_test_snapshot([make_field('OBJECTID', 'OID', 4)])
+        out_folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(out_folder, 'snapshot.json')
+            save_snapshot(snapshot, path)
+            loaded = load_snapshot(path)
+        finally:
+            shutil.rmtree(out_folder)
+        self.assertEqual(loaded['fingerprint'], snapshot['fingerprint'])
+        self.assertEqual(diff_snapshots(loaded, snapshot), [])
+
+        removed = make_snapshot('Test.gdb', loaded['datasets'][1:], [], [])
+        self.assertEqual(
+            [(change['Name'], change['Change'])
+             for change in diff_snapshots(loaded, removed)],
+            [('Roads', 'Removed')])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_cluster(self):
+        """Test that only replicas deviating from the majority are found."""
+        fields = [make_field('OBJECTID', 'OID', 4), make_field('Owner')]
+        snapshots = OrderedDict(
+            ('Replica{0}.gdb'.format(index), make_test_snapshot(fields))
+            for index in range(0, 5))
+        snapshots['Replica3.gdb'] = make_test_snapshot(
+            [make_field('OBJECTID', 'OID', 4),
+             make_field('Owner', length=10)])
+        snapshots['Replica4.gdb'] = make_snapshot(
+            'Replica4.gdb', snapshots['Replica0.gdb']['datasets'][:1], [],
+            [])
+
+        clusters, outliers = cluster_snapshots(snapshots)
+        self.assertEqual(
+            [(cluster['Same schema in'], cluster['Deviating objects'])
+             for cluster in clusters],
+            [('3 of 5', 0)] * 3 + [('1 of 5', 1)] * 2)
+        self.assertEqual(
+            [(outlier['Geodatabase'], outlier['Name'], outlier['Deviation'])
+             for outlier in outliers],
+            [('Replica3.gdb', 'Parcels', 'Different schema'),
+             ('Replica4.gdb', 'Parcels', 'Missing')])
+        self.assertEqual(outliers[0]['Details'],
+                         'Field Owner modified (Length: 50 -> 10)')
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
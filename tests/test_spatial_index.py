@@ -0,0 +1,68 @@
+# -*- coding: UTF-8 -*-
+"""Tests for assessment of spatial indexes grid sizes.
+
+These tests do not need a geodatabase and can be run with any
+Python installation.
+"""
+from __future__ import print_function
+import unittest
+
+from context import registrant  # noqa: F401
+from registrant._spatial_index import assess_spatial_index
+from registrant._findings import find_poor_spatial_indexes
+
+
+########################################################################
+class SpatialIndexTest(unittest.TestCase):
+    """Test case for spatial indexes health."""
+
+    # ----------------------------------------------------------------------
+    def test_fitting_grid(self):
+        """Test that grid of a few features sizes has no issues."""
+        spatial_index = assess_spatial_index(
+            'Parcels', True, [500.0], (0, 0, 10000, 5000), (100.0, 50.0),
+            2048)
+        self.assertEqual(spatial_index['Grid sizes'], '500')
+        self.assertEqual(spatial_index['Extent (width x height)'],
+                         '10000 x 5000')
+        self.assertEqual(spatial_index['Grid size to feature size'], 5)
+        self.assertEqual(spatial_index['Grid cells in extent'], 200)
+        self.assertEqual(spatial_index['Severity'], '')
+        self.assertEqual(find_poor_spatial_indexes([spatial_index]), [])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_poor_grids(self):
+        """Test grids too small and too large for the features."""
+        small_grid = assess_spatial_index(
+            'Roads', True, [10.0], (0, 0, 10000, 5000), (100.0, 50.0))
+        self.assertEqual(small_grid['Severity'], 'Medium')
+        self.assertIn('smaller than features', small_grid['Issues'])
+
+        large_grid = assess_spatial_index(
+            'Buildings', True, [20000.0], (0, 0, 10000, 5000), (10.0, 5.0))
+        self.assertEqual(large_grid['Severity'], 'Medium')
+        self.assertIn('whole extent', large_grid['Issues'])
+        self.assertIn('much larger than features', large_grid['Issues'])
+
+        findings = find_poor_spatial_indexes([small_grid, large_grid])
+        self.assertEqual([finding['Dataset'] for finding in findings],
+                         ['Roads', 'Buildings'])
+        return
+
+    # ----------------------------------------------------------------------
+    def test_missing_index(self):
+        """Test that missing index is reported only once."""
+        spatial_index = assess_spatial_index('Points', False)
+        self.assertEqual(spatial_index['Severity'], 'High')
+        self.assertEqual(find_poor_spatial_indexes([spatial_index]), [])
+
+        # grid of empty feature class is not computed yet
+        spatial_index = assess_spatial_index(
+            'Empty', True, [], (float('nan'), ) * 4)
+        self.assertEqual(spatial_index['Severity'], '')
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()